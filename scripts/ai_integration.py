@@ -2,15 +2,17 @@
 """Optional OpenAI query and curation workflow for AI Journal."""
 
 import argparse
+import http.client
 import json
 import os
 import sys
-import urllib.error
-import urllib.request
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from entry_saver import create_entry
+import answer_cache
+from answer_cache import AnswerCache, cache_at
+from entry_saver import create_entries, create_entry
+from http_pool import ConnectionPool
 
 # ---------------------------------------------------------------------------
 # Offline "Starter Guide" brain.
@@ -230,31 +232,68 @@ HTTP_USER_AGENT = (
 )
 
 
-def _http_post_json(url: str, body: dict, headers: dict, timeout: int) -> dict:
+def _status_error(status: int, detail: bytes) -> RuntimeError:
+    """A beginner-friendly RuntimeError for an HTTP error from a provider."""
+    text = detail.decode("utf-8", "replace")[:160]
+    if status == 401:
+        return RuntimeError("That API key was rejected. Check it and try again.")
+    if status == 403:
+        return RuntimeError(f"Access blocked (403). {text}".strip())
+    return RuntimeError(f"AI provider error ({status}). {text}".strip())
+
+
+def _encode(body: dict, headers: dict) -> Tuple[bytes, dict]:
     headers = dict(headers)
     headers.setdefault("User-Agent", HTTP_USER_AGENT)
-    req = urllib.request.Request(
-        url, data=json.dumps(body).encode("utf-8"), headers=headers, method="POST"
-    )
+    return json.dumps(body).encode("utf-8"), headers
+
+
+# Keep-alive connections shared by every call in this process, so consecutive
+# questions skip the DNS + TCP + TLS setup (see http_pool).
+_CONNECTIONS = ConnectionPool()
+
+
+def connection_stats() -> dict:
+    """Provider connections opened, reused and retried (for /api/metrics)."""
+    return _CONNECTIONS.stats()
+
+
+def _http_post_json(url: str, body: dict, headers: dict, timeout: int) -> dict:
     try:
         # url is always a fixed HTTPS provider endpoint from PROVIDERS.
-        with urllib.request.urlopen(req, timeout=timeout) as resp:  # nosec B310
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as exc:
-        detail = ""
-        try:
-            detail = exc.read().decode("utf-8")[:160]
-        except Exception:
-            pass
-        if exc.code == 401:
-            raise RuntimeError("That API key was rejected. Check it and try again.")
-        if exc.code == 403:
-            raise RuntimeError(f"Access blocked (403). {detail}".strip())
-        raise RuntimeError(f"AI provider error ({exc.code}). {detail}".strip())
-    except urllib.error.URLError:
+        with _CONNECTIONS.post(url, *_encode(body, headers), timeout) as resp:
+            raw = resp.read()
+        if resp.status >= 400:
+            raise _status_error(resp.status, raw)
+        return json.loads(raw.decode("utf-8"))
+    except (ValueError, TimeoutError, http.client.HTTPException):
+        raise RuntimeError("The AI provider sent an unreadable response.")
+    except OSError:
         raise RuntimeError("Could not reach the AI provider. Check your internet.")
-    except (ValueError, TimeoutError):
+
+
+def _http_post_events(url: str, body: dict, headers: dict, timeout: int) -> Iterator[dict]:
+    """POST and yield the JSON ``data:`` payload of each server-sent event.
+
+    All three provider styles stream this way. OpenAI's closing
+    ``data: [DONE]`` ends the stream.
+    """
+    try:
+        with _CONNECTIONS.post(url, *_encode(body, headers), timeout) as resp:
+            if resp.status >= 400:
+                raise _status_error(resp.status, resp.read())
+            for raw in resp:
+                line = raw.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue  # blank separators, "event:" names, comments
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                yield json.loads(data)
+    except (ValueError, TimeoutError, http.client.HTTPException):
         raise RuntimeError("The AI provider sent an unreadable response.")
+    except OSError:
+        raise RuntimeError("Could not reach the AI provider. Check your internet.")
 
 
 def _build_user_content(question: str, context: str = "") -> str:
@@ -274,27 +313,10 @@ def _build_user_content(question: str, context: str = "") -> str:
     )
 
 
-def live_answer(
-    question: str,
-    provider: str,
-    api_key: str,
-    model: Optional[str] = None,
-    timeout: int = 30,
-    context: str = "",
-) -> str:
-    """Ask a live AI provider over HTTPS and return the answer text.
-
-    Optionally pass `context` (excerpts from the learner's own journal) so the
-    answer builds on what they've already learned.
-
-    Raises RuntimeError with a beginner-friendly message on any failure.
-    """
-    if provider not in PROVIDERS:
-        raise RuntimeError(f"Unknown AI provider: {provider}")
-    meta = PROVIDERS[provider]
-    model = model or meta["model"]
-    user_content = _build_user_content(question, context)
-
+def _provider_request(
+    meta: dict, api_key: str, model: str, user_content: str, stream: bool = False
+) -> Tuple[str, dict, dict]:
+    """(url, body, headers) for one question in the provider's style."""
     if meta["style"] == "openai":
         body = {
             "model": model,
@@ -305,15 +327,13 @@ def live_answer(
             "max_tokens": 800,
             "temperature": 0.7,
         }
+        if stream:
+            body["stream"] = True
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        data = _http_post_json(meta["url"], body, headers, timeout)
-        try:
-            return data["choices"][0]["message"]["content"].strip()
-        except (KeyError, IndexError, AttributeError):
-            raise RuntimeError("The AI provider sent an unexpected response.")
+        return meta["url"], body, headers
 
     if meta["style"] == "anthropic":
         body = {
@@ -322,30 +342,168 @@ def live_answer(
             "system": SYSTEM_PROMPT,
             "messages": [{"role": "user", "content": user_content}],
         }
+        if stream:
+            body["stream"] = True
         headers = {
             "x-api-key": api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json",
         }
-        data = _http_post_json(meta["url"], body, headers, timeout)
-        try:
-            return data["content"][0]["text"].strip()
-        except (KeyError, IndexError, AttributeError):
-            raise RuntimeError("The AI provider sent an unexpected response.")
-
-    # gemini style
-    url = meta["url"].format(model=model) + f"?key={api_key}"
+        return meta["url"], body, headers
+
+    # gemini style: streaming is a different method on the same model URL.
+    url = meta["url"].format(model=model)
+    if stream:
+        url = url.replace(":generateContent", ":streamGenerateContent") + "?alt=sse&"
+    else:
+        url += "?"
     body = {
         "contents": [{"parts": [{"text": user_content}]}],
         "systemInstruction": {"parts": [{"text": SYSTEM_PROMPT}]},
     }
-    data = _http_post_json(url, body, {"Content-Type": "application/json"}, timeout)
+    return url + f"key={api_key}", body, {"Content-Type": "application/json"}
+
+
+def _answer_text(style: str, data: dict) -> str:
+    """The answer in a complete (non-streamed) response."""
+    if style == "openai":
+        return data["choices"][0]["message"]["content"]
+    if style == "anthropic":
+        return data["content"][0]["text"]
+    return data["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def _delta_text(style: str, event: dict) -> str:
+    """The new text in one streamed event ("" for bookkeeping events)."""
+    if style == "openai":
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+    if style == "anthropic":
+        if event.get("type") == "error":
+            message = (event.get("error") or {}).get("message", "")
+            raise RuntimeError(f"AI provider error. {message}".strip())
+        if event.get("type") != "content_block_delta":
+            return ""  # message_start, ping, content_block_stop, ...
+        return event["delta"].get("text") or ""
+    # gemini: each event is a partial GenerateContentResponse.
+    candidates = event.get("candidates") or [{}]
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts)
+
+
+def stream_answer(
+    question: str,
+    provider: str,
+    api_key: str,
+    model: Optional[str] = None,
+    timeout: int = 30,
+    context: str = "",
+) -> Iterator[str]:
+    """Like ``live_answer``, but yield the answer in pieces as they are generated.
+
+    Raises RuntimeError with a beginner-friendly message on any failure,
+    possibly after some pieces have been yielded.
+    """
+    if provider not in PROVIDERS:
+        raise RuntimeError(f"Unknown AI provider: {provider}")
+    meta = PROVIDERS[provider]
+    url, body, headers = _provider_request(
+        meta, api_key, model or meta["model"], _build_user_content(question, context), True
+    )
+    for event in _http_post_events(url, body, headers, timeout):
+        try:
+            text = _delta_text(meta["style"], event)
+        except (KeyError, IndexError, AttributeError):
+            raise RuntimeError("The AI provider sent an unexpected response.")
+        if text:
+            yield text
+
+
+def _fetch_answer(
+    question: str,
+    provider: str,
+    api_key: str,
+    model: str,
+    timeout: int,
+    context: str,
+    on_chunk: Optional[Callable[[str], None]],
+) -> str:
+    """One provider call for ``live_answer`` (streamed when ``on_chunk`` is set)."""
+    if on_chunk is not None:
+        pieces = []
+        for piece in stream_answer(question, provider, api_key, model, timeout, context):
+            pieces.append(piece)
+            on_chunk(piece)
+        answer = "".join(pieces).strip()
+        if not answer:
+            raise RuntimeError("The AI provider sent an unexpected response.")
+        return answer
+
+    meta = PROVIDERS[provider]
+    url, body, headers = _provider_request(
+        meta, api_key, model, _build_user_content(question, context)
+    )
+    data = _http_post_json(url, body, headers, timeout)
     try:
-        return data["candidates"][0]["content"]["parts"][0]["text"].strip()
-    except (KeyError, IndexError, AttributeError):
+        return _answer_text(meta["style"], data).strip()
+    except (KeyError, IndexError, AttributeError, TypeError):
         raise RuntimeError("The AI provider sent an unexpected response.")
 
 
+def _answer_cache() -> AnswerCache:
+    """The answer cache kept beside the AI config file."""
+    return cache_at(config_path().with_name(".ai-journal-answers.sqlite3"))
+
+
+def answer_cache_stats() -> dict:
+    """Answer cache mode, hits, misses and size (for /api/metrics)."""
+    return _answer_cache().stats()
+
+
+def live_answer(
+    question: str,
+    provider: str,
+    api_key: str,
+    model: Optional[str] = None,
+    timeout: int = 30,
+    context: str = "",
+    on_chunk: Optional[Callable[[str], None]] = None,
+    use_cache: bool = True,
+) -> str:
+    """Ask a live AI provider over HTTPS and return the answer text.
+
+    Optionally pass `context` (excerpts from the learner's own journal) so the
+    answer builds on what they've already learned. With `on_chunk`, the answer
+    is streamed and each piece is passed to it as soon as it arrives.
+
+    Answers are cached on disk (see answer_cache): a repeated question is
+    answered from the cache without calling the provider. Pass
+    ``use_cache=False`` for calls that must reach the provider, such as
+    checking a key.
+
+    Raises RuntimeError with a beginner-friendly message on any failure.
+    """
+    if provider not in PROVIDERS:
+        raise RuntimeError(f"Unknown AI provider: {provider}")
+    model = model or PROVIDERS[provider]["model"]
+    cache_mode = answer_cache.mode() if use_cache else "off"
+    if cache_mode != "off":
+        cache = _answer_cache()
+        key = answer_cache.cache_key(provider, model, SYSTEM_PROMPT, question, context)
+        answer = cache.get(key)
+        if answer is not None:
+            if on_chunk is not None:
+                on_chunk(answer)
+            return answer
+        if cache_mode == "only":
+            raise RuntimeError("No saved answer for this question yet (offline mode).")
+
+    answer = _fetch_answer(question, provider, api_key, model, timeout, context, on_chunk)
+    if cache_mode != "off":
+        cache.put(key, answer)
+    return answer
+
+
 def save_live_answer(question: str, answer: str, provider: str) -> str:
     """Save a live AI answer to the journal; return the provider's display label."""
     label = PROVIDERS.get(provider, {}).get("label", provider.title())
@@ -809,7 +967,9 @@ def answer_offline(question: str):
                 " section 'Turn on AI answers'. -->",
             ]
         )
-        entry_path = create_entry(question, content, ["question", "starter-guide"])
+        (entry_path,) = create_entries(
+            [{"topic": question, "content": content, "tags": ["question", "starter-guide"]}]
+        )
         return answer, True, entry_path
 
     # No canned answer: do not dead-end. Save the question so the learner can
@@ -822,7 +982,9 @@ def answer_offline(question: str):
             " See the README section 'Turn on AI answers'. -->",
         ]
     )
-    entry_path = create_entry(question, content, ["question", "unanswered"])
+    (entry_path,) = create_entries(
+        [{"topic": question, "content": content, "tags": ["question", "unanswered"]}]
+    )
     return None, False, entry_path
 
 
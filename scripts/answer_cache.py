@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""On-disk cache of live AI answers, so repeated questions cost nothing.
+
+A cohort asks the same beginner questions ("what is git", "what is an API
+key") again and again, and each one used to be a paid, multi-second provider
+call. Answers are now kept in a small SQLite file beside the AI config, keyed
+on everything that shapes the answer:
+
+    (provider, model, hash of the system prompt, normalized question,
+     hash of the journal context)
+
+so changing the prompt, the model or the learner's notes asks afresh.
+
+  - Entries expire after ``TTL_SECONDS``; beyond ``MAX_ENTRIES`` the least
+    recently used are dropped.
+  - ``AI_JOURNAL_ANSWER_CACHE`` sets the mode: ``on`` (default), ``off``, or
+    ``only`` - answer from the cache and never call a provider, for offline
+    workshops.
+  - Hits and misses are counted per process (``stats``, /api/metrics).
+
+A broken or unwritable cache file only costs the provider call it would
+have saved; it never stops a question being answered.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+MAX_ENTRIES = 500
+TTL_SECONDS = 30 * 24 * 3600
+MODES = ("on", "off", "only")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS answers ("
+    " key TEXT PRIMARY KEY, answer TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL"
+    ") WITHOUT ROWID;"
+    "CREATE INDEX IF NOT EXISTS answers_used ON answers(used);"
+)
+
+
+def mode() -> str:
+    """The cache mode from ``AI_JOURNAL_ANSWER_CACHE`` ("on" unless set)."""
+    value = (os.getenv("AI_JOURNAL_ANSWER_CACHE") or "on").strip().lower()
+    return value if value in MODES else "on"
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, single spaces, no trailing punctuation: "What is Git?" == "what is git"."""
+    return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cache_key(provider: str, model: str, system_prompt: str, question: str, context: str) -> str:
+    raw = json.dumps(
+        [provider, model, _digest(system_prompt), normalize_question(question), _digest(context)]
+    )
+    return _digest(raw)
+
+
+class AnswerCache:
+    """Answers by ``cache_key`` in one SQLite file, LRU-bounded with a TTL."""
+
+    def __init__(
+        self, path: Path, max_entries: int = MAX_ENTRIES, ttl_seconds: float = TTL_SECONDS
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def get(self, key: str) -> str | None:
+        """The cached answer, or None (expired entries are removed)."""
+        now = time.time()
+        answer = None
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT answer, created FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                elif row is not None:
+                    conn.execute("UPDATE answers SET used = ? WHERE key = ?", (now, key))
+                    answer = row[0]
+        except sqlite3.Error:
+            pass
+        with self.lock:
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return answer
+
+    def put(self, key: str, answer: str) -> None:
+        """Remember ``answer``, then drop expired and least recently used entries."""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO answers (key, answer, created, used)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, answer, now, now),
+                )
+                conn.execute(
+                    "DELETE FROM answers WHERE created < ?", (now - self.ttl_seconds,)
+                )
+                conn.execute(
+                    "DELETE FROM answers WHERE key IN"
+                    " (SELECT key FROM answers ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            pass
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM answers")
+
+    def stats(self) -> dict:
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        looked_up = hits + misses
+        return {
+            "mode": mode(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / looked_up, 3) if looked_up else 0.0,
+            "entries": len(self),
+        }
+
+
+_caches: dict[str, AnswerCache] = {}
+_caches_lock = threading.Lock()
+
+
+def cache_at(path: Path) -> AnswerCache:
+    """The shared ``AnswerCache`` for ``path`` (its counters live per process)."""
+    with _caches_lock:
+        cache = _caches.get(str(path))
+        if cache is None:
+            cache = _caches[str(path)] = AnswerCache(path)
+        return cache
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Background jobs for Ask the Guide questions.
+
+Answering a question can take many seconds (journal context, a live provider
+call, saving the answer). The web server used to do all of that while the
+browser's request waited, so a reload or a timeout threw the work away.
+Now ``AskQueue.submit`` records a job and returns at once; the job runs on a
+small ``WorkerPool`` and its result stays available for ``JOB_TTL_SECONDS``
+(``GET /api/ask/<id>``), whether or not anyone is still waiting for it.
+
+Asking the same question again while the first is still queued or running
+joins the existing job instead of paying for a second provider call.
+
+A live answer arrives in pieces. ``answer`` is given a callback that appends
+each piece to ``AskJob.text``; ``AskQueue.wait`` blocks until there is more
+text (or the job ends), which is how the web server relays the answer to the
+browser as it is being written.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable
+
+from worker_pool import WorkerPool
+
+JOB_TTL_SECONDS = 600  # finished jobs are kept this long for polling
+MAX_JOBS = 200
+
+
+def question_key(payload: dict) -> tuple:
+    """What makes two asks the same: the question's words and journal use."""
+    words = re.sub(r"\s+", " ", (payload.get("question") or "").strip().lower())
+    return (words, bool(payload.get("use_journal", True)))
+
+
+@dataclass
+class AskJob:
+    id: str
+    key: tuple
+    status: str = "queued"  # queued -> running -> done | error
+    text: str = ""  # the answer so far, while it streams in
+    result: dict | None = None
+    error: str | None = None
+    created: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_json(self) -> dict:
+        body = {"id": self.id, "status": self.status}
+        if self.active and self.text:
+            body["text"] = self.text
+        if self.result is not None:
+            body["result"] = self.result
+        if self.error is not None:
+            body["error"] = self.error
+        return body
+
+
+Answer = Callable[[dict, Callable[[str], None]], dict]
+
+
+class AskQueue:
+    """Runs ``answer(payload, on_chunk)`` for each distinct in-flight question."""
+
+    def __init__(self, answer: Answer, pool: WorkerPool):
+        self.answer = answer
+        self.pool = pool
+        self.jobs: dict[str, AskJob] = {}
+        self.active: dict[tuple, AskJob] = {}
+        self.deduped = 0
+        self.lock = threading.Condition()
+
+    def submit(self, payload: dict) -> AskJob | None:
+        """The job answering this question; None when the pool is full."""
+        key = question_key(payload)
+        with self.lock:
+            self._prune()
+            job = self.active.get(key)
+            if job is not None:
+                self.deduped += 1
+                return job
+            job = AskJob(uuid.uuid4().hex[:12], key)
+            if not self.pool.submit(lambda: self._run(job, payload)):
+                return None
+            self.jobs[job.id] = job
+            self.active[key] = job
+            return job
+
+    def get(self, job_id: str) -> AskJob | None:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def wait(self, job: AskJob, offset: int, timeout: float) -> tuple[str, bool]:
+        """Block up to ``timeout`` seconds for text past ``offset``.
+
+        Returns (the new text, whether the job has finished).
+        """
+        with self.lock:
+            self.lock.wait_for(lambda: len(job.text) > offset or not job.active, timeout)
+            return job.text[offset:], not job.active
+
+    def _chunk(self, job: AskJob, piece: str) -> None:
+        with self.lock:
+            job.text += piece
+            self.lock.notify_all()
+
+    def _run(self, job: AskJob, payload: dict) -> None:
+        with self.lock:
+            job.status = "running"
+        try:
+            result, error = self.answer(payload, lambda piece: self._chunk(job, piece)), None
+        except ValueError as exc:
+            result, error = None, str(exc)
+        except Exception as exc:
+            result, error = None, f"Something went wrong: {exc}"
+        with self.lock:
+            job.result, job.error = result, error
+            job.status = "done" if error is None else "error"
+            job.finished = time.monotonic()
+            if self.active.get(job.key) is job:
+                del self.active[job.key]
+            self.lock.notify_all()
+
+    def _prune(self) -> None:
+        """Forget finished jobs past their TTL, and the oldest beyond MAX_JOBS."""
+        now = time.monotonic()
+        finished = [j for j in self.jobs.values() if not j.active]
+        expired = {j.id for j in finished if now - j.finished > JOB_TTL_SECONDS}
+        excess = len(self.jobs) - len(expired) - MAX_JOBS
+        if excess > 0:
+            oldest = sorted((j for j in finished if j.id not in expired), key=lambda j: j.finished)
+            expired.update(j.id for j in oldest[:excess])
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def stats(self) -> dict:
+        with self.lock:
+            active = len(self.active)
+            deduped = self.deduped
+        return {"in_flight": active, "deduped": deduped, **self.pool.stats()}
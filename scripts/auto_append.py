@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 """Append content to existing AI Journal entries."""
 
-import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import journal_index
+
 
 def get_journal_dir():
     """Get the AI Journal directory path."""
@@ -22,25 +23,34 @@ def status(label, value=None):
 
 
 def load_index():
-    """Load the journal index."""
-    index_path = get_journal_dir() / "index.json"
+    """Load the journal index from the shared cache (treat it as read-only)."""
     try:
-        with open(index_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return journal_index.load_index(get_journal_dir())
     except FileNotFoundError:
         status("No journal index found. Create your first entry with 'ai-journal new'")
         sys.exit(1)
 
 
-def save_index(index_data):
-    """Save the journal index."""
-    index_path = get_journal_dir() / "index.json"
-    index_data["stats"]["last_modified"] = datetime.now().isoformat() + "Z"
-    tmp_path = index_path.with_suffix(".json.tmp")
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(index_data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    tmp_path.replace(index_path)
+def _log_word_count(entry, content):
+    """Record an entry's new word count in the index change log.
+
+    The entry's cached list preview is refreshed from the same text, so the
+    next listing does not have to re-read the file.
+    """
+    journal_index.append_op(
+        get_journal_dir(),
+        {
+            "op": "update",
+            "id": entry["id"],
+            "fields": {"word_count": len(content.split())},
+        },
+    )
+    try:
+        from entry_previews import refresh
+
+        refresh(get_journal_dir(), [(entry, content)])
+    except Exception:
+        pass  # only a cache: the next listing reads the file instead
 
 
 def _parse_date_term(term):
@@ -63,52 +73,47 @@ def _parse_date_term(term):
     return None
 
 
+def _entry_lookup():
+    """Id/slug/topic/date lookup tables for the current index."""
+    load_index()  # friendly exit when the journal has no index yet
+    return journal_index.entry_lookup(get_journal_dir())
+
+
 def find_entry_for_day(day):
     """Most recent entry created on the given YYYY-MM-DD day, or None."""
-    entries = [
-        entry
-        for entry in load_index()["entries"]
-        if (entry.get("created") or "")[:10] == day
-    ]
-    if not entries:
-        return None
-    return max(entries, key=lambda e: e["created"])
+    return _entry_lookup().latest_on(day)
+
+
+def find_entry_by_id(entry_id):
+    """Entry with the given numeric id, or None."""
+    return _entry_lookup().by_id.get(entry_id)
 
 
 def find_entry(search_term):
     """Find entry by ID, day ("today", a date), topic, or slug."""
-    index_data = load_index()
+    lookup = _entry_lookup()
 
     # Try to find by ID first
     try:
-        entry_id = int(search_term)
-        for entry in index_data["entries"]:
-            if entry["id"] == entry_id:
-                return entry
+        entry = lookup.by_id.get(int(search_term))
+        if entry is not None:
+            return entry
     except ValueError:
         pass
 
     # Day words and dates: "today", "yesterday", "2026-07-23", "20260723"
     day = _parse_date_term(search_term)
     if day is not None:
-        return find_entry_for_day(day)
-
-    # Try to find by exact topic match
-    for entry in index_data["entries"]:
-        if entry["topic"].lower() == search_term.lower():
-            return entry
+        return lookup.latest_on(day)
 
-    # Try to find by slug match
-    for entry in index_data["entries"]:
-        if entry["slug"] == search_term.lower():
-            return entry
+    # Try to find by exact topic match, then by slug
+    search_lower = search_term.lower()
+    entry = lookup.by_topic.get(search_lower) or lookup.by_slug.get(search_lower)
+    if entry is not None:
+        return entry
 
     # Try partial topic match
-    search_lower = search_term.lower()
-    matches = []
-    for entry in index_data["entries"]:
-        if search_lower in entry["topic"].lower():
-            matches.append(entry)
+    matches = lookup.topics_containing(search_lower)
 
     if len(matches) == 1:
         return matches[0]
@@ -124,13 +129,7 @@ def find_entry(search_term):
 
 def get_latest_entry():
     """Get the most recently created entry."""
-    index_data = load_index()
-    if not index_data["entries"]:
-        return None
-
-    # Sort by creation date and return the latest
-    latest = max(index_data["entries"], key=lambda x: x["created"])
-    return latest
+    return _entry_lookup().latest()
 
 
 # Map friendly section names to the actual Markdown headers in an entry.
@@ -203,13 +202,7 @@ def append_to_entry(entry, content, section="Reflection"):
         f.write(updated_content)
 
     # Update word count in index
-    index_data = load_index()
-    for i, indexed_entry in enumerate(index_data["entries"]):
-        if indexed_entry["id"] == entry["id"]:
-            index_data["entries"][i]["word_count"] = len(updated_content.split())
-            break
-
-    save_index(index_data)
+    _log_word_count(entry, updated_content)
 
     status("Added your note to", entry["topic"])
     status("Section", header.lstrip("# ").strip())
@@ -232,12 +225,7 @@ def update_entry_content(entry, new_content):
         f.write(new_content)
 
     # Keep the index in step (word count + freshness for search rebuild).
-    index_data = load_index()
-    for i, indexed_entry in enumerate(index_data["entries"]):
-        if indexed_entry["id"] == entry["id"]:
-            index_data["entries"][i]["word_count"] = len(new_content.split())
-            break
-    save_index(index_data)
+    _log_word_count(entry, new_content)
 
 
 def main():
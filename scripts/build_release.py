@@ -78,6 +78,14 @@ REQUIRED_FILES = [
     "web/index.html",
     "scripts/web_server.py",
     "scripts/entry_delete.py",
+    "scripts/journal_index.py",
+    "scripts/journal_search.py",
+    "scripts/entry_previews.py",
+    "scripts/journal_events.py",
+    "scripts/worker_pool.py",
+    "scripts/ask_jobs.py",
+    "scripts/http_pool.py",
+    "scripts/answer_cache.py",
 ]
 
 
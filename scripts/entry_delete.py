@@ -10,8 +10,9 @@ Design:
   - Purge: the file is permanently removed. Used for the explicit
     ``ai-journal delete --purge`` path only, always behind a confirmation.
 
-After either operation the JSON index and (via mtime detection plus an
-explicit row removal) the optional SQLite search index stay consistent.
+After either operation the JSON index and (via an explicit row removal,
+backed up by the manifest sync before each search) the optional SQLite
+search index stay consistent.
 """
 
 import json
@@ -19,7 +20,8 @@ import os
 from datetime import datetime
 from pathlib import Path
 
-from auto_append import load_index, save_index
+import journal_index
+from auto_append import load_index
 
 
 def get_journal_dir():
@@ -53,22 +55,11 @@ def _save_trash_log(log):
 
 
 def _remove_from_index(entry):
-    """Remove one entry record from index.json and fix the derived counters."""
+    """Remove one entry record from the index; derived counters follow on replay."""
     index_data = load_index()
-    kept = [e for e in index_data["entries"] if e.get("id") != entry.get("id")]
-    if len(kept) == len(index_data["entries"]):
+    if not any(e.get("id") == entry.get("id") for e in index_data["entries"]):
         return False  # nothing removed (already gone)
-    index_data["entries"] = kept
-    index_data["stats"]["total_entries"] = len(kept)
-
-    # Keep tag counts in step with the entries that remain.
-    for tag in entry.get("tags", []) or []:
-        if tag in index_data.get("tags", {}):
-            index_data["tags"][tag] -= 1
-            if index_data["tags"][tag] <= 0:
-                del index_data["tags"][tag]
-
-    save_index(index_data)
+    journal_index.append_op(get_journal_dir(), {"op": "delete", "id": entry["id"]})
     return True
 
 
@@ -81,8 +72,8 @@ def _remove_from_search_db(entry):
         if database_path(journal).exists():
             remove_entry(journal, int(entry["id"]))
     except Exception:
-        # The search DB is rebuildable; a failed row-delete only means the
-        # next search triggers an automatic rebuild.
+        # The search DB is rebuildable; a failed row-delete is picked up by
+        # the next search's sync, which drops entries gone from the index.
         pass
 
 
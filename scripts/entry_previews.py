@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Cached previews, excerpts, word counts and section offsets for entries.
+
+The entry list shows a one-line preview per entry and Ask AI quotes short
+excerpts; both used to open and scan the Markdown file every time. Here they
+are computed once per version of a file and remembered, keyed on the file's
+(mtime_ns, size):
+
+  - in memory, per journal folder, for the life of the process;
+  - in the ``previews`` table of the SQLite search database (when it exists),
+    so a restarted server does not re-read the journal either. Rebuilds and
+    syncs fill the table as they index each file.
+
+``previews`` only stats each file: a listing of unchanged entries opens no
+Markdown at all. The write paths (create, append, edit) call ``refresh``
+with the text they just wrote, so the next listing does not re-read it.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+PREVIEW_CHARS = 140
+EXCERPT_CHARS = 300
+
+
+@dataclass(frozen=True)
+class EntryPreview:
+    mtime_ns: int
+    size: int
+    preview: str
+    excerpt: str
+    word_count: int
+    sections: tuple[tuple[str, int], ...]  # ("## Heading", character offset)
+
+
+EMPTY = EntryPreview(-1, -1, "", "", 0, ())
+
+# journal folder -> filename -> preview of the file version it was built from.
+_memo: dict[str, dict[str, EntryPreview]] = {}
+_lock = threading.Lock()
+
+
+def _content(line: str) -> str:
+    """A stripped line without its leading bullet ("" for blank lines)."""
+    line = line.strip()
+    return line[2:].strip() if line.startswith(("- ", "* ")) else line
+
+
+def _is_meta(core: str) -> bool:
+    """Headings, metadata, rules, comment hints and bracket placeholders."""
+    if core.startswith(("#", "<!--", "---", "**", ">")):
+        return True
+    return core.startswith("[") and core.endswith("]")
+
+
+def preview_line(lines: Iterable[str]) -> str:
+    """First line of real content, or "" for an untouched template entry."""
+    for raw in lines:
+        core = _content(raw)
+        if not core or _is_meta(core):
+            continue
+        # Task hints like "[ ] Your next step".
+        if core.startswith(("[ ]", "[]")):
+            continue
+        return core if len(core) <= PREVIEW_CHARS else core[: PREVIEW_CHARS - 3] + "..."
+    return ""
+
+
+def excerpt(text: str, limit: int = EXCERPT_CHARS) -> str:
+    """A short plain-text excerpt of an entry's real content (no metadata)."""
+    parts: list[str] = []
+    total = 0
+    for raw in text.splitlines():
+        core = _content(raw)
+        if not core or _is_meta(core):
+            continue
+        parts.append(core)
+        total += len(core)
+        if total >= limit:
+            break
+    out = " ".join(parts)
+    return out if len(out) <= limit else out[:limit].rstrip() + "…"
+
+
+def sections(text: str) -> tuple[tuple[str, int], ...]:
+    """Each "## " section header with the offset where its line starts."""
+    found = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if line.startswith("## "):
+            found.append((line.strip(), offset))
+        offset += len(line)
+    return tuple(found)
+
+
+def summarize(text: str, mtime_ns: int, size: int) -> EntryPreview:
+    """Everything the list views need from one version of an entry file."""
+    return EntryPreview(
+        mtime_ns,
+        size,
+        preview_line(text.splitlines()),
+        excerpt(text),
+        len(text.split()),
+        sections(text),
+    )
+
+
+def _file_state(path: str) -> tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return -1, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _database(journal_dir: Path):
+    """The sqlite_index module when this journal has a search database."""
+    try:
+        import sqlite_index
+    except ImportError:
+        return None
+    return sqlite_index if sqlite_index.database_path(journal_dir).exists() else None
+
+
+def previews(journal_dir: Path, entries: Iterable[dict]) -> dict[str, EntryPreview]:
+    """Previews for the given index entries, keyed by filename.
+
+    Files are only stat-ed; one is read only when neither the memo nor the
+    database holds a preview for its current (mtime_ns, size). Missing files
+    get ``EMPTY``.
+    """
+    root = str(journal_dir)
+    with _lock:
+        memo = _memo.setdefault(root, {})
+    found: dict[str, EntryPreview] = {}
+    stale: dict[str, tuple[int, int]] = {}
+    for entry in entries:
+        filename = entry.get("filename")
+        if not filename or filename in found or filename in stale:
+            continue
+        state = _file_state(os.path.join(root, filename))
+        cached = memo.get(filename)
+        if state == (-1, -1):
+            found[filename] = EMPTY
+        elif cached is not None and (cached.mtime_ns, cached.size) == state:
+            found[filename] = cached
+        else:
+            stale[filename] = state
+    if not stale:
+        return found
+
+    fresh: dict[str, EntryPreview] = {}
+    db = _database(journal_dir)
+    if db is not None:
+        try:
+            for filename, stored in db.load_previews(journal_dir, list(stale)).items():
+                if (stored.mtime_ns, stored.size) == stale[filename]:
+                    fresh[filename] = stored
+        except Exception:
+            db = None  # a broken search DB only costs us the file reads
+    computed: dict[str, EntryPreview] = {}
+    for filename, (mtime_ns, size) in stale.items():
+        if filename in fresh:
+            continue
+        try:
+            text = _read_text(os.path.join(root, filename))
+        except OSError:
+            fresh[filename] = EMPTY
+            continue
+        computed[filename] = summarize(text, mtime_ns, size)
+    if computed and db is not None:
+        try:
+            db.store_previews(journal_dir, computed)
+        except Exception:
+            pass
+    fresh.update(computed)
+    with _lock:
+        memo.update((name, p) for name, p in fresh.items() if p is not EMPTY)
+    found.update(fresh)
+    return found
+
+
+def refresh(journal_dir: Path, written: Iterable[tuple[dict, str]]) -> None:
+    """Record previews of text just written to entry files, as (entry, text)."""
+    fresh = {
+        entry["filename"]: summarize(text, *_file_state(str(journal_dir / entry["filename"])))
+        for entry, text in written
+    }
+    with _lock:
+        _memo.setdefault(str(journal_dir), {}).update(fresh)
+    db = _database(journal_dir)
+    if db is not None and fresh:
+        db.store_previews(journal_dir, fresh)
+
+
+def clear_cache() -> None:
+    """Forget the in-memory previews (tests; the database copy remains)."""
+    with _lock:
+        _memo.clear()
@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 """Create AI Journal entries and maintain the searchable index."""
 
-import json
 import os
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import journal_index
+
 
 def get_journal_dir():
     """Get the AI Journal directory path."""
@@ -23,11 +24,9 @@ def status(label, value=None):
 
 
 def load_index():
-    """Load the journal index."""
-    index_path = get_journal_dir() / "index.json"
+    """Load the journal index from the shared cache (treat it as read-only)."""
     try:
-        with open(index_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return journal_index.load_index(get_journal_dir())
     except FileNotFoundError:
         # Create default index if it doesn't exist
         default_index = {
@@ -50,15 +49,8 @@ def load_index():
 
 
 def save_index(index_data):
-    """Save the journal index."""
-    index_path = get_journal_dir() / "index.json"
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-    index_data["stats"]["last_modified"] = datetime.now().isoformat() + "Z"
-    tmp_path = index_path.with_suffix(".json.tmp")
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(index_data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    tmp_path.replace(index_path)
+    """Save the whole journal index (folds away any pending change log)."""
+    journal_index.write_snapshot(get_journal_dir(), index_data)
 
 
 def create_slug(topic):
@@ -69,16 +61,16 @@ def create_slug(topic):
     return slug.strip("-")
 
 
-def create_entry(topic, content=None, tags=None, ai_metadata=None):
-    """Create a new journal entry with optional AI metadata."""
-    if tags is None:
-        tags = []
+def _write_entry_file(topic, content, tags, ai_metadata, now, made_dirs=None, quiet=False):
+    """Render and write one entry's Markdown file.
 
+    Returns (topic, slug, entry_path, entry_content); the topic and slug
+    gain a " (2)"-style suffix when the name is already taken that day.
+    ``made_dirs`` lets a batch skip repeat mkdir calls for the same month.
+    """
     # Never create nameless files: an empty or symbol-only topic still gets a
     # readable title and a usable slug.
     topic = (topic or "").strip() or "Untitled entry"
-
-    now = datetime.now()
     slug = create_slug(topic) or "entry"
 
     # Create entry filename with date and slug
@@ -86,7 +78,10 @@ def create_entry(topic, content=None, tags=None, ai_metadata=None):
 
     # Create year/month directory structure
     entry_dir = get_journal_dir() / "entries" / now.strftime("%Y") / now.strftime("%m")
-    entry_dir.mkdir(parents=True, exist_ok=True)
+    if made_dirs is None or entry_dir not in made_dirs:
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        if made_dirs is not None:
+            made_dirs.add(entry_dir)
 
     entry_path = entry_dir / entry_filename
 
@@ -99,10 +94,11 @@ def create_entry(topic, content=None, tags=None, ai_metadata=None):
             candidate_slug = f"{slug}-{n}"
             candidate_path = entry_dir / f"{now.strftime('%Y%m%d')}-{candidate_slug}.md"
             if not candidate_path.exists():
-                status(
-                    "You already have an entry with this name today - saving as",
-                    candidate_topic,
-                )
+                if not quiet:
+                    status(
+                        "You already have an entry with this name today - saving as",
+                        candidate_topic,
+                    )
                 topic, slug, entry_path = candidate_topic, candidate_slug, candidate_path
                 break
         else:  # pragma: no cover - 999 same-name entries in one day
@@ -187,16 +183,22 @@ def create_entry(topic, content=None, tags=None, ai_metadata=None):
     with open(entry_path, "w", encoding="utf-8") as f:
         f.write(entry_content)
 
-    # Update index with enhanced metadata
-    index_data = load_index()
+    return topic, slug, entry_path, entry_content
 
+
+def _next_entry_id(index_data):
+    """The id the next new entry should get (ids are never reused)."""
     next_id = index_data.get("next_id")
     if next_id is None:
         existing_ids = [entry.get("id", 0) for entry in index_data["entries"]]
         next_id = max(existing_ids, default=0) + 1
+    return next_id
+
 
+def _create_op(entry_id, topic, slug, entry_path, entry_content, now, tags, ai_metadata):
+    """Build the index change-log record for a newly written entry."""
     entry_record = {
-        "id": next_id,
+        "id": entry_id,
         "topic": topic,
         "slug": slug,
         "filename": str(entry_path.relative_to(get_journal_dir())),
@@ -204,7 +206,7 @@ def create_entry(topic, content=None, tags=None, ai_metadata=None):
         "tags": tags,
         "word_count": len(entry_content.split()),
     }
-    index_data["next_id"] = next_id + 1
+    op = {"op": "create", "entry": entry_record}
 
     # Add AI metadata to entry record
     if ai_metadata:
@@ -218,41 +220,41 @@ def create_entry(topic, content=None, tags=None, ai_metadata=None):
         entry_record["verification_status"] = ai_metadata.get(
             "verification_status", "untested"
         )
+        # AI statistics (sources used, average review score) are derived
+        # from this when the log is replayed.
+        op["ai"] = {
+            "source": ai_metadata.get("source", "unknown"),
+            "rating": ai_metadata.get("quality_rating", 5),
+        }
+    return op
 
-        # Update AI statistics
-        if "ai_stats" not in index_data:
-            index_data["ai_stats"] = {
-                "total_ai_assisted": 0,
-                "sources_used": {},
-                "avg_quality_rating": 0.0,
-            }
-
-        index_data["ai_stats"]["total_ai_assisted"] += 1
-        source = ai_metadata.get("source", "unknown")
-        if source in index_data["ai_stats"]["sources_used"]:
-            index_data["ai_stats"]["sources_used"][source] += 1
-        else:
-            index_data["ai_stats"]["sources_used"][source] = 1
-
-        # Update average review score. Keep the JSON key for compatibility.
-        total_ai = index_data["ai_stats"]["total_ai_assisted"]
-        current_avg = index_data["ai_stats"]["avg_quality_rating"]
-        new_rating = ai_metadata.get("quality_rating", 5)
-        index_data["ai_stats"]["avg_quality_rating"] = (
-            (current_avg * (total_ai - 1)) + new_rating
-        ) / total_ai
-
-    index_data["entries"].append(entry_record)
-    index_data["stats"]["total_entries"] += 1
-
-    # Update tag counts
-    for tag in tags:
-        if tag in index_data["tags"]:
-            index_data["tags"][tag] += 1
-        else:
-            index_data["tags"][tag] = 1
-
-    save_index(index_data)
+
+def create_entry(topic, content=None, tags=None, ai_metadata=None):
+    """Create a new journal entry with optional AI metadata."""
+    if tags is None:
+        tags = []
+
+    now = datetime.now()
+    topic, slug, entry_path, entry_content = _write_entry_file(
+        topic, content, tags, ai_metadata, now
+    )
+
+    # Record the new entry in the index change log (no full rewrite). The
+    # lock spans reading next_id and appending, so another process writing
+    # the journal cannot take the same id in between.
+    with journal_index.write_lock(get_journal_dir()):
+        op = _create_op(
+            _next_entry_id(load_index()),
+            topic,
+            slug,
+            entry_path,
+            entry_content,
+            now,
+            tags,
+            ai_metadata,
+        )
+        journal_index.append_op(get_journal_dir(), op)
+    _remember_previews([(op["entry"], entry_content)])
 
     status("Created new entry", entry_path)
     status("Topic", topic)
@@ -271,6 +273,70 @@ def create_entry(topic, content=None, tags=None, ai_metadata=None):
     return str(entry_path)
 
 
+def create_entries(batch):
+    """Create many entries at once with a single index commit. No console output.
+
+    ``batch`` is a list of dicts with the same fields as ``create_entry``
+    (``topic``, and optionally ``content``, ``tags``, ``ai_metadata``) plus an
+    optional ``created`` datetime for importing historical notes. All Markdown
+    files are written first; then every index record goes into the change log
+    in one append, and the search database (when one exists) is updated in one
+    transaction. Returns the new entry paths in batch order.
+    """
+    made_dirs = set()
+    written = []
+    for item in batch:
+        tags = list(item.get("tags") or [])
+        now = item.get("created") or datetime.now()
+        topic, slug, entry_path, entry_content = _write_entry_file(
+            item.get("topic"),
+            item.get("content"),
+            tags,
+            item.get("ai_metadata"),
+            now,
+            made_dirs=made_dirs,
+            quiet=True,
+        )
+        written.append(
+            (topic, slug, entry_path, entry_content, now, tags, item.get("ai_metadata"))
+        )
+    if not written:
+        return []
+
+    with journal_index.write_lock(get_journal_dir()):
+        next_id = _next_entry_id(load_index())
+        ops = [_create_op(next_id + n, *fields) for n, fields in enumerate(written)]
+        journal_index.append_ops(get_journal_dir(), ops)
+    _update_search_db([op["entry"] for op in ops])
+    _remember_previews([(op["entry"], fields[3]) for op, fields in zip(ops, written)])
+    return [str(fields[2]) for fields in written]
+
+
+def _remember_previews(written):
+    """Cache the list preview of freshly written (entry, text) pairs."""
+    try:
+        from entry_previews import refresh
+
+        refresh(get_journal_dir(), written)
+    except Exception:
+        # Only a cache: the next listing reads the file instead.
+        pass
+
+
+def _update_search_db(entries):
+    """Upsert new entries into the optional SQLite search index, if it exists."""
+    journal = get_journal_dir()
+    try:
+        from sqlite_index import database_path, update_entries
+
+        if database_path(journal).exists():
+            update_entries(journal, entries)
+    except Exception:
+        # The search DB is rebuildable; a failed upsert is picked up by the
+        # next search's sync.
+        pass
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
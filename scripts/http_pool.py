@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Keep-alive HTTPS connections to the AI providers, pooled per host.
+
+``urllib.request.urlopen`` opens a new connection for every call, so every
+question paid for a DNS lookup, a TCP connect and a TLS handshake before the
+provider saw a byte of it. ``ConnectionPool`` keeps finished connections open
+per (host, port) and hands them to the next request for that host:
+
+  - a connection is used by one request at a time; the pool itself is shared
+    by the web server's AI threads (a lock guards the idle lists);
+  - connections idle for more than ``IDLE_SECONDS`` are closed rather than
+    reused, since providers drop idle keep-alive connections on their side;
+  - when a reused connection turns out to have been closed by the server
+    (broken pipe, reset, no status line) the request is sent once more on a
+    fresh connection;
+  - a response is only given back to the pool once it has been read to the
+    end; anything else (an error, a stream abandoned part way) closes it.
+
+``HTTPS_PROXY`` is honoured by tunnelling through the proxy, as urllib did,
+including ``user:password@`` credentials (sent as ``Proxy-Authorization`` on
+the CONNECT request).
+"""
+from __future__ import annotations
+
+import base64
+import http.client
+import ssl
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.parse import unquote, urlsplit
+
+IDLE_SECONDS = 60.0
+MAX_IDLE_PER_HOST = 4
+
+# Raised when a kept-alive connection was closed by the server meanwhile.
+STALE = (ConnectionError, http.client.BadStatusLine)
+
+
+def _proxy_for(host: str):
+    """(host, port, CONNECT headers) of the HTTPS proxy for ``host``, or None."""
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    parts = urlsplit(proxy if "://" in proxy else "http://" + proxy)
+    headers = {}
+    if parts.username is not None:
+        login = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(login.encode("utf-8")).decode("ascii")
+        headers["Proxy-Authorization"] = f"Basic {token}"
+    # Without a port, an http:// proxy is on 80, as urllib assumed.
+    return parts.hostname, parts.port or 80, headers
+
+
+class ConnectionPool:
+    """Idle ``HTTPSConnection``s per (host, port), reused for later requests."""
+
+    def __init__(self, idle_seconds: float = IDLE_SECONDS, max_idle: int = MAX_IDLE_PER_HOST):
+        self.idle_seconds = idle_seconds
+        self.max_idle = max_idle
+        self.idle: dict[tuple[str, int], list[tuple[float, http.client.HTTPSConnection]]] = {}
+        self.lock = threading.Lock()
+        self.context: ssl.SSLContext | None = None
+        self.opened = 0
+        self.reused = 0
+        self.retried = 0
+
+    def _connect(self, host: str, port: int) -> http.client.HTTPSConnection:
+        with self.lock:
+            if self.context is None:
+                self.context = ssl.create_default_context()
+            self.opened += 1
+        proxy = _proxy_for(host)
+        if proxy is None:
+            return http.client.HTTPSConnection(host, port, context=self.context)
+        proxy_host, proxy_port, headers = proxy
+        conn = http.client.HTTPSConnection(proxy_host, proxy_port, context=self.context)
+        conn.set_tunnel(host, port, headers=headers)
+        return conn
+
+    def _checkout(self, key: tuple[str, int]) -> http.client.HTTPSConnection | None:
+        """The most recently used live idle connection for ``key``, if any."""
+        now = time.monotonic()
+        expired = []
+        conn = None
+        with self.lock:
+            idle = self.idle.get(key, [])
+            while idle:  # newest first: once one has expired, so have the rest
+                used, candidate = idle.pop()
+                if now - used <= self.idle_seconds:
+                    conn = candidate
+                    self.reused += 1
+                    break
+                expired.append(candidate)
+        for old in expired:
+            old.close()
+        return conn
+
+    def _checkin(self, key: tuple[str, int], conn: http.client.HTTPSConnection) -> None:
+        if conn.sock is None:  # the server asked to close it
+            return
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    @staticmethod
+    def _send(conn, path: str, body: bytes, headers: dict, timeout: float):
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.request("POST", path, body=body, headers=headers)
+        return conn.getresponse()
+
+    @contextmanager
+    def post(
+        self, url: str, body: bytes, headers: dict, timeout: float
+    ) -> Iterator[http.client.HTTPResponse]:
+        """POST ``body`` to an https ``url`` and yield the response.
+
+        Read the response inside the ``with`` block; the connection goes
+        back to the pool when the block ends with the response fully read.
+        """
+        parts = urlsplit(url)
+        key = (parts.hostname or "", parts.port or 443)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        conn = self._checkout(key)
+        fresh = conn is None
+        if fresh:
+            conn = self._connect(*key)
+        try:
+            try:
+                resp = self._send(conn, path, body, headers, timeout)
+            except STALE:
+                if fresh:
+                    raise
+                conn.close()
+                with self.lock:
+                    self.retried += 1
+                conn = self._connect(*key)
+                resp = self._send(conn, path, body, headers, timeout)
+            yield resp
+            if not resp.isclosed():
+                resp.read()  # e.g. the end of a stream after its last event
+        except BaseException:
+            conn.close()
+            raise
+        self._checkin(key, conn)
+
+    def stats(self) -> dict:
+        with self.lock:
+            idle = sum(len(conns) for conns in self.idle.values())
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "retried": self.retried,
+                "idle": idle,
+            }
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self.lock:
+            conns = [conn for idle in self.idle.values() for _used, conn in idle]
+            self.idle.clear()
+        for conn in conns:
+            conn.close()
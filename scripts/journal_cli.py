@@ -2,7 +2,6 @@
 """Cross-platform command dispatcher for AI Journal."""
 
 import argparse
-import json
 import os
 import subprocess
 import sys
@@ -10,6 +9,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import journal_index
+import journal_search
 from auto_append import append_to_entry, find_entry, get_latest_entry
 from entry_saver import create_entry, get_journal_dir
 from entry_saver import load_index as ensure_index
@@ -29,8 +30,9 @@ def require_index() -> Path:
 
 
 def load_index() -> dict:
-    """Load the journal index."""
-    return json.loads(require_index().read_text(encoding="utf-8"))
+    """Load the journal index from the shared cache (treat it as read-only)."""
+    require_index()
+    return journal_index.load_index(get_journal_dir())
 
 
 def prompt_required(label: str) -> str:
@@ -187,47 +189,18 @@ def cmd_list(args: argparse.Namespace) -> None:
         print(format_entry(entry))
 
 
-def search_entries(query: str) -> list[tuple[dict, Optional[str]]]:
+def search_entries(
+    query: str, filters: journal_search.SearchFilters = journal_search.NO_FILTERS
+) -> list[tuple[dict, Optional[str]]]:
     """Search entries by title, tag, AND full text. Pure: returns matches.
 
     Returns a list of (entry, snippet) tuples sorted newest-first. ``snippet``
     is the first non-heading line containing the query, or ``None`` when the
     match came only from the topic/tags. Shared by the CLI and the web layer
-    so search behaves identically in both.
+    so search behaves identically in both (see journal_search).
     """
-    index = load_index()
-    query = (query or "").lower()
-    journal_dir = get_journal_dir()
-
-    matches = []
-    for entry in index["entries"]:
-        in_meta = query in entry["topic"].lower() or any(
-            query in tag.lower() for tag in entry.get("tags", [])
-        )
-
-        snippet = None
-        try:
-            text = (journal_dir / entry["filename"]).read_text(encoding="utf-8")
-        except OSError:
-            text = ""
-        if query in text.lower():
-            for line in text.splitlines():
-                stripped = line.strip()
-                if (
-                    query in stripped.lower()
-                    and stripped
-                    and not stripped.startswith("#")
-                    and not stripped.startswith("<!--")
-                ):
-                    snippet = (
-                        stripped if len(stripped) <= 100 else stripped[:97] + "..."
-                    )
-                    break
-
-        if in_meta or snippet is not None:
-            matches.append((entry, snippet))
-
-    return sorted(matches, key=lambda m: m[0]["created"], reverse=True)
+    require_index()
+    return journal_search.search_entries(query, filters)
 
 
 def cmd_search(args: argparse.Namespace) -> None:
@@ -446,18 +419,26 @@ def cmd_doctor(args: argparse.Namespace) -> None:
 
 
 def cmd_reindex(args: argparse.Namespace) -> None:
-    """Rebuild the optional SQLite full-text search index."""
+    """Update (or with --full, rebuild) the optional SQLite search index."""
     from modern_tools import reindex
 
-    raise SystemExit(reindex())
+    raise SystemExit(reindex(full=getattr(args, "full", False)))
 
 
 def cmd_find(args: argparse.Namespace) -> None:
-    """Run ranked full-text search."""
+    """Run ranked full-text search, optionally narrowed by tag, date or AI source."""
     from modern_tools import search_command
 
-    query = args.query or prompt_required("Search words")
-    raise SystemExit(search_command(query, args.limit))
+    try:
+        filters = journal_search.SearchFilters.of(
+            tags=args.tags, since=args.since, until=args.until, ai_source=args.source
+        )
+        after = journal_index.decode_cursor(args.after) if args.after else None
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1)
+    query = args.query or ("" if filters else prompt_required("Search words"))
+    raise SystemExit(search_command(query, args.limit, filters, after))
 
 
 def cmd_backup(args: argparse.Namespace) -> None:
@@ -548,13 +529,30 @@ def build_parser() -> argparse.ArgumentParser:
     doctor_parser.set_defaults(func=cmd_doctor)
 
     reindex_parser = subparsers.add_parser(
-        "reindex", help="Rebuild fast full-text search"
+        "reindex", help="Update fast full-text search"
+    )
+    reindex_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild the whole search database instead of only what changed",
     )
     reindex_parser.set_defaults(func=cmd_reindex)
 
     find_parser = subparsers.add_parser("find", help="Ranked full-text journal search")
     find_parser.add_argument("query", nargs="?")
     find_parser.add_argument("--limit", type=int, default=20)
+    find_parser.add_argument(
+        "--tag",
+        dest="tags",
+        action="append",
+        help="Only entries with this tag (repeat to require several)",
+    )
+    find_parser.add_argument("--since", help="Only entries created on or after YYYY-MM-DD")
+    find_parser.add_argument("--until", help="Only entries created on or before YYYY-MM-DD")
+    find_parser.add_argument("--source", help="Only entries from this AI source")
+    find_parser.add_argument(
+        "--after", help="Next page of a filtered listing (cursor from the last page)"
+    )
     find_parser.set_defaults(func=cmd_find)
 
     backup_parser = subparsers.add_parser("backup", help="Create a ZIP backup")
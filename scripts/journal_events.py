@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Change feed for the journal: which entries were created, updated or deleted.
+
+``ChangeFeed`` keeps the index it saw last and, whenever the index
+generation moves, diffs the current index against it by entry id. Checks run
+
+  - straight after every write this process makes (a ``journal_index``
+    listener), so changes from the web UI are pushed at once;
+  - every ``WATCH_SECONDS`` on a watcher thread, which catches the CLI and
+    anything else that writes ``index.json`` / ``index.log``. Only those two
+    files are stat-ed, however large the journal is.
+
+A change that touches no entry record (a log compaction or a reindex, which
+rewrite the index) is reported as ``reindexed``: clients should reload.
+
+Events are numbered and kept in a short backlog. ``wait(after)`` blocks
+until newer ones exist, so any number of listeners (the web server's
+``/api/events`` streams) share one backlog and can resume from the last
+number they saw.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+import journal_index
+
+WATCH_SECONDS = 1.0
+BACKLOG = 256
+
+KINDS = ("created", "updated", "deleted")
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    seq: int
+    kind: str  # created / updated / deleted / reindexed
+    ids: tuple[int, ...]
+    generation: str
+
+    def to_json(self) -> dict:
+        return {"type": self.kind, "ids": list(self.ids), "generation": self.generation}
+
+
+def generation_tag(journal_dir: Path) -> str:
+    """A short string that changes whenever the index on disk changes."""
+    raw = repr(journal_index.generation(journal_dir)).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def _records(journal_dir: Path) -> dict:
+    try:
+        entries = journal_index.load_index(journal_dir).get("entries", [])
+    except (FileNotFoundError, ValueError):
+        return {}
+    return {entry.get("id"): entry for entry in entries}
+
+
+def diff(old: dict, new: dict) -> dict[str, list]:
+    """Entry ids created, updated and deleted between two id -> record maps."""
+    return {
+        "created": sorted(i for i in new if i not in old),
+        "updated": sorted(
+            i for i, record in new.items()
+            if i in old and old[i] is not record and old[i] != record
+        ),
+        "deleted": sorted(i for i in old if i not in new),
+    }
+
+
+class ChangeFeed:
+    """Numbered change events for one journal folder (see module docstring)."""
+
+    def __init__(
+        self, journal_dir: Path, interval: float = WATCH_SECONDS, backlog: int = BACKLOG
+    ):
+        self.journal_dir = journal_dir
+        self.interval = interval
+        self.events: deque[ChangeEvent] = deque(maxlen=backlog)
+        self.last_seq = 0
+        self.generation = generation_tag(journal_dir)
+        self.records = _records(journal_dir)
+        self.changed = threading.Condition()
+        self.stopping = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    # --- lifecycle ---------------------------------------------------------
+
+    def start(self) -> ChangeFeed:
+        journal_index.add_listener(self._on_write)
+        self.thread = threading.Thread(target=self._watch, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        journal_index.remove_listener(self._on_write)
+        self.stopping.set()
+        with self.changed:
+            self.changed.notify_all()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=self.interval + 1)
+
+    @property
+    def stopped(self) -> bool:
+        return self.stopping.is_set()
+
+    def _on_write(self, journal_dir: Path) -> None:
+        if Path(journal_dir) == Path(self.journal_dir):
+            self.check()
+
+    def _watch(self) -> None:
+        while not self.stopping.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                pass  # e.g. index.json mid-rewrite; try again next tick
+
+    # --- events ------------------------------------------------------------
+
+    def check(self) -> list[ChangeEvent]:
+        """Record events for whatever changed since the last check."""
+        with self.changed:
+            tag = generation_tag(self.journal_dir)
+            if tag == self.generation:
+                return []
+            records = _records(self.journal_dir)
+            changes = diff(self.records, records)
+            self.records, self.generation = records, tag
+            kinds = [(kind, changes[kind]) for kind in KINDS if changes[kind]]
+            new = []
+            for kind, ids in kinds or [("reindexed", [])]:
+                self.last_seq += 1
+                new.append(ChangeEvent(self.last_seq, kind, tuple(ids), tag))
+            self.events.extend(new)
+            self.changed.notify_all()
+            return new
+
+    def since(self, after: int) -> list[ChangeEvent] | None:
+        """Events numbered after ``after``; None when the caller cannot catch up.
+
+        That is when some have already left the backlog, or ``after`` is from
+        an earlier run (numbers restart with the process).
+        """
+        with self.changed:
+            if after > self.last_seq:
+                return None
+            if after < self.last_seq and self.events[0].seq > after + 1:
+                return None
+            return [event for event in self.events if event.seq > after]
+
+    def wait(self, after: int, timeout: float) -> list[ChangeEvent] | None:
+        """Like ``since``, but block up to ``timeout`` seconds for a new event."""
+        with self.changed:
+            self.changed.wait_for(
+                lambda: self.last_seq > after or self.stopping.is_set(), timeout
+            )
+        return self.since(after)
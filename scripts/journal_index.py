@@ -0,0 +1,682 @@
+#!/usr/bin/env python3
+"""Append-only change log for the journal index.
+
+``index.json`` is a snapshot. Writers no longer rewrite it for every change;
+they append one JSON line to ``index.log`` (create / update / delete), which
+costs the same on a journal of ten entries or ten thousand. Readers replay
+snapshot + log, so ``load_index`` callers see the same dict as before.
+``compact`` folds the log back into the snapshot; it also runs automatically
+once the log grows past ``COMPACT_BYTES``.
+
+The first log line records a hash of the contents of the snapshot the log
+was started against, so copies that change file times (unzipping a backup,
+a USB copy, cloud sync) keep their pending changes. If ``index.json`` is
+replaced by a different one (a hand edit), the hash no longer matches and
+the stale log is ignored: the file on disk wins. The next write sets such a
+log aside as ``index.log.<time>.stale`` instead of overwriting it. Replay
+is idempotent, so a crash between writing a new snapshot and removing the
+old log is harmless.
+
+Writers take ``write_lock``, an OS file lock on ``index.lock``, so the CLI
+and the web server can write the same journal at once without handing out
+the same entry id.
+
+``load_index`` adds a process-wide cache on top: the parsed index is kept
+per journal folder and reused until the (inode, mtime_ns, size) of
+``index.json`` or ``index.log`` changes. Writes made through this module
+update the cached copy directly, so the web server and the menu loop only
+re-parse the file after an edit from another process.
+
+``entry_lookup`` builds id / slug / topic dictionaries and a created-date
+sorted list once per cached index, so finding an entry does not scan every
+record. It also keeps entries (overall and per tag) sorted by a
+(created, id) key, so ``EntryLookup.page`` can return any newest-first page
+after a keyset cursor with a bisect instead of walking earlier pages.
+
+``daily_rollup`` keeps entry and AI-assisted counts per created day. It is
+built once per cached index and then carried forward op by op as writes go
+through ``append_ops``, so streaks and heatmaps cost O(days), not O(entries).
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Fold the log into index.json once it grows past this many bytes.
+COMPACT_BYTES = 256 * 1024
+
+_write_lock = threading.RLock()
+
+# journal folder -> [open index.lock file, nesting depth]. Guarded by _write_lock.
+_file_locks: dict[str, list] = {}
+
+# index.json path -> (on-disk key, content hash). Guarded by _cache_lock.
+_snapshot_hashes: dict[str, tuple[tuple, str]] = {}
+
+# journal folder -> (on-disk key, parsed index). Guarded by _cache_lock.
+_cache: dict[str, tuple[tuple, dict]] = {}
+_cache_lock = threading.Lock()
+
+# journal folder -> (parsed index, EntryLookup built from it).
+_lookups: dict[str, tuple[dict, EntryLookup]] = {}
+
+# Called with the journal folder after every write made through this module.
+_listeners: list = []
+
+# journal folder -> (parsed index, DailyRollup of its entries).
+_rollups: dict[str, tuple[dict, DailyRollup]] = {}
+
+
+def index_path(journal_dir: Path) -> Path:
+    return journal_dir / "index.json"
+
+
+def log_path(journal_dir: Path) -> Path:
+    return journal_dir / "index.log"
+
+
+def lock_path(journal_dir: Path) -> Path:
+    return journal_dir / "index.lock"
+
+
+def _lock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def write_lock(journal_dir: Path) -> Iterator[None]:
+    """Serialize index writers, across threads and across processes.
+
+    The CLI and the web server write the same index from separate
+    processes, so a thread lock alone is not enough: a writer that reads
+    ``next_id`` and then appends must hold this for the whole sequence, or
+    two processes can hand out the same id. It is an OS lock (fcntl / msvcrt)
+    on ``index.lock``, re-entrant within a thread.
+    """
+    slot = str(journal_dir)
+    with _write_lock:
+        held = _file_locks.get(slot)
+        if held is not None:
+            held[1] += 1
+        else:
+            journal_dir.mkdir(parents=True, exist_ok=True)
+            f = open(lock_path(journal_dir), "a+b")
+            try:
+                _lock_file(f)
+            except BaseException:
+                f.close()
+                raise
+            held = _file_locks[slot] = [f, 1]
+        try:
+            yield
+        finally:
+            held[1] -= 1
+            if held[1] == 0:
+                del _file_locks[slot]
+                _unlock_file(held[0])
+                held[0].close()
+
+
+def _now() -> str:
+    return datetime.now().isoformat() + "Z"
+
+
+def _fingerprint(path: Path) -> list | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _snapshot_hash(path: Path, data: bytes | None = None) -> str | None:
+    """Hash of index.json's contents, re-read only when the file changes.
+
+    Pass ``data`` when the caller has just read or written the file.
+    """
+    key = _stat_key(path)
+    if key is None:
+        return None
+    if data is None:
+        with _cache_lock:
+            hit = _snapshot_hashes.get(str(path))
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+    digest = "sha256:" + hashlib.sha256(data).hexdigest()
+    with _cache_lock:
+        _snapshot_hashes[str(path)] = (key, digest)
+    return digest
+
+
+def _snapshot_ids(path: Path, data: bytes | None = None) -> tuple:
+    """The snapshot ids a matching log header may name.
+
+    That is the content hash, or the mtime and size for logs started
+    before headers carried a hash.
+    """
+    return (_snapshot_hash(path, data), _fingerprint(path))
+
+
+def _read_log(journal_dir: Path, snapshot_ids: tuple) -> list[dict]:
+    """Return the ops logged against the current snapshot ([] when stale)."""
+    try:
+        lines = log_path(journal_dir).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    ops = []
+    for number, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # a torn last line from an interrupted append
+        if number == 0:
+            if record.get("op") != "base" or record.get("snapshot") not in snapshot_ids:
+                return []
+            continue
+        if isinstance(record, dict):
+            ops.append(record)
+    return ops
+
+
+def apply_op(index_data: dict, op: dict, ids: set | None = None) -> None:
+    """Apply one logged change to an in-memory index (idempotent).
+
+    When replaying many ops, pass ``ids`` (the set of entry ids already in
+    ``index_data``) so creates skip duplicates without scanning the list.
+    """
+    kind = op.get("op")
+    entries = index_data.setdefault("entries", [])
+    stats = index_data.setdefault("stats", {"total_entries": len(entries)})
+
+    if kind == "create":
+        record = op["entry"]
+        if ids is None:
+            ids = {e.get("id") for e in entries}
+        if record["id"] in ids:
+            return
+        ids.add(record["id"])
+        entries.append(record)
+        index_data["next_id"] = max(index_data.get("next_id") or 0, record["id"] + 1)
+        stats["total_entries"] = stats.get("total_entries", 0) + 1
+        tags = index_data.setdefault("tags", {})
+        for tag in record.get("tags", []):
+            tags[tag] = tags.get(tag, 0) + 1
+        ai = op.get("ai")
+        if ai:
+            ai_stats = index_data.setdefault(
+                "ai_stats",
+                {"total_ai_assisted": 0, "sources_used": {}, "avg_quality_rating": 0.0},
+            )
+            ai_stats["total_ai_assisted"] += 1
+            source = ai.get("source", "unknown")
+            sources = ai_stats["sources_used"]
+            sources[source] = sources.get(source, 0) + 1
+            # Running average of review scores. Keep the JSON key for compatibility.
+            total_ai = ai_stats["total_ai_assisted"]
+            ai_stats["avg_quality_rating"] = (
+                (ai_stats["avg_quality_rating"] * (total_ai - 1)) + ai.get("rating", 5)
+            ) / total_ai
+
+    elif kind == "update":
+        for i, entry in enumerate(entries):
+            if entry.get("id") == op["id"]:
+                # Replace rather than mutate: cached readers may hold the old record.
+                entries[i] = {**entry, **op.get("fields", {})}
+                break
+
+    elif kind == "delete":
+        removed = None
+        for i, entry in enumerate(entries):
+            if entry.get("id") == op["id"]:
+                removed = entries.pop(i)
+                break
+        if removed is None:
+            return
+        if ids is not None:
+            ids.discard(op["id"])
+        stats["total_entries"] = len(entries)
+        # Keep tag counts in step with the entries that remain.
+        tags = index_data.get("tags", {})
+        for tag in removed.get("tags", []) or []:
+            if tag in tags:
+                tags[tag] -= 1
+                if tags[tag] <= 0:
+                    del tags[tag]
+    else:
+        return
+
+    if op.get("at"):
+        stats["last_modified"] = op["at"]
+
+
+def read_index(journal_dir: Path) -> dict:
+    """Load index.json and replay any pending log entries on top of it.
+
+    Raises FileNotFoundError when the journal has no index yet.
+    """
+    path = index_path(journal_dir)
+    data = path.read_bytes()
+    index_data = json.loads(data.decode("utf-8"))
+    ops = _read_log(journal_dir, _snapshot_ids(path, data))
+    if ops:
+        ids = {e.get("id") for e in index_data.get("entries", [])}
+        for op in ops:
+            apply_op(index_data, op, ids)
+    return index_data
+
+
+def _stat_key(path: Path) -> tuple | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _cache_key(journal_dir: Path) -> tuple:
+    return (_stat_key(index_path(journal_dir)), _stat_key(log_path(journal_dir)))
+
+
+def generation(journal_dir: Path) -> tuple:
+    """A token that changes whenever the index on disk changes.
+
+    Every create / append / update / delete, from this process or another,
+    rewrites index.json or grows index.log, so callers can key caches on it.
+    """
+    return _cache_key(journal_dir)
+
+
+def _copy_for_write(index_data: dict) -> dict:
+    """Shallow copy of the parts apply_op changes, so cached readers are safe."""
+    copy = dict(index_data)
+    copy["entries"] = list(index_data.get("entries", []))
+    copy["tags"] = dict(index_data.get("tags", {}))
+    copy["stats"] = dict(index_data.get("stats", {}))
+    if "ai_stats" in index_data:
+        copy["ai_stats"] = dict(index_data["ai_stats"])
+        copy["ai_stats"]["sources_used"] = dict(
+            index_data["ai_stats"].get("sources_used", {})
+        )
+    return copy
+
+
+def load_index(journal_dir: Path) -> dict:
+    """Cached ``read_index``: re-parses only when the files changed on disk.
+
+    The returned dict is shared by every caller in the process. Treat it as
+    read-only; to change the index, use ``append_op`` or ``write_snapshot``.
+    Raises FileNotFoundError when the journal has no index yet.
+    """
+    slot = str(journal_dir)
+    key = _cache_key(journal_dir)
+    with _cache_lock:
+        hit = _cache.get(slot)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+    index_data = read_index(journal_dir)
+    with _cache_lock:
+        _cache[slot] = (key, index_data)
+    return index_data
+
+
+def add_listener(callback) -> None:
+    """Call ``callback(journal_dir)`` after each index write in this process."""
+    _listeners.append(callback)
+
+
+def remove_listener(callback) -> None:
+    try:
+        _listeners.remove(callback)
+    except ValueError:
+        pass
+
+
+def _notify(journal_dir: Path) -> None:
+    for callback in list(_listeners):
+        try:
+            callback(journal_dir)
+        except Exception:
+            pass  # listeners are observers; they must not fail a write
+
+
+def write_snapshot(journal_dir: Path, index_data: dict) -> None:
+    """Atomically rewrite index.json in full and retire the folded log."""
+    path = index_path(journal_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index_data.setdefault("stats", {})["last_modified"] = _now()
+    tmp_path = path.with_suffix(".json.tmp")
+    data = (json.dumps(index_data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    with write_lock(journal_dir):
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        _snapshot_hash(path, data)
+        try:
+            log_path(journal_dir).unlink()
+        except FileNotFoundError:
+            pass
+        with _cache_lock:
+            _cache[str(journal_dir)] = (_cache_key(journal_dir), index_data)
+    _notify(journal_dir)
+
+
+def append_op(journal_dir: Path, op: dict) -> None:
+    """Record one index change by appending a line to index.log."""
+    append_ops(journal_dir, [op])
+
+
+def append_ops(journal_dir: Path, ops: list[dict]) -> None:
+    """Record several index changes with a single append to index.log."""
+    at = _now()
+    ops = [{"at": at, **op} for op in ops]
+    log = log_path(journal_dir)
+    with write_lock(journal_dir):
+        key_before = _cache_key(journal_dir)
+        snapshot_ids = _snapshot_ids(index_path(journal_dir))
+        header = None
+        try:
+            with open(log, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            pass
+        fresh = not (
+            isinstance(header, dict)
+            and header.get("op") == "base"
+            and header.get("snapshot") in snapshot_ids
+        )
+        if fresh:
+            _set_aside(log)
+        lines = [json.dumps(op, ensure_ascii=False) + "\n" for op in ops]
+        if fresh:
+            lines.insert(0, json.dumps({"op": "base", "snapshot": snapshot_ids[0]}) + "\n")
+        with open(log, "w" if fresh else "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+        _write_through(journal_dir, key_before, ops, fresh)
+        if log.stat().st_size > COMPACT_BYTES:
+            compact(journal_dir)
+    _notify(journal_dir)
+
+
+def _set_aside(log: Path) -> None:
+    """Move a log that does not belong to index.json aside, for recovery.
+
+    A log with no changes in it is simply overwritten.
+    """
+    try:
+        with open(log, "r", encoding="utf-8") as f:
+            f.readline()
+            if not f.readline().strip():
+                return
+    except OSError:
+        return
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    log.replace(log.with_name(f"{log.name}.{stamp}.stale"))
+
+
+def _write_through(
+    journal_dir: Path, key_before: tuple, ops: list[dict], fresh: bool
+) -> None:
+    """Apply just-logged ops to the cached index instead of dropping it."""
+    slot = str(journal_dir)
+    with _cache_lock:
+        hit = _cache.pop(slot, None)
+        # A fresh log replaced a stale one, so the cached replay no longer
+        # describes what is on disk; let the next load re-read it.
+        if hit is None or hit[0] != key_before or (fresh and key_before[1]):
+            return
+        index_data = _copy_for_write(hit[1])
+        ids = {e.get("id") for e in index_data["entries"]}
+        rollup_hit = _rollups.get(slot)
+        rollup = rollup_hit[1].copy() if rollup_hit and rollup_hit[0] is hit[1] else None
+        for op in ops:
+            if rollup is not None:
+                rollup.apply(index_data, op, ids)
+            else:
+                apply_op(index_data, op, ids)
+        _cache[slot] = (_cache_key(journal_dir), index_data)
+        if rollup is not None:
+            _rollups[slot] = (index_data, rollup)
+
+
+def compact(journal_dir: Path) -> int:
+    """Fold index.log into index.json. Returns the number of changes folded."""
+    with write_lock(journal_dir):
+        if not log_path(journal_dir).exists():
+            return 0
+        try:
+            folded = len(_read_log(journal_dir, _snapshot_ids(index_path(journal_dir))))
+            index_data = read_index(journal_dir)
+        except FileNotFoundError:
+            return 0
+        write_snapshot(journal_dir, index_data)
+        return folded
+
+
+PageKey = tuple  # (created, id): the keyset position of an entry
+
+
+def page_key(entry: dict) -> PageKey:
+    entry_id = entry.get("id")
+    return (entry.get("created") or "", entry_id if isinstance(entry_id, int) else -1)
+
+
+def encode_cursor(key: PageKey) -> str:
+    """Opaque, URL-safe form of a page key for APIs."""
+    raw = json.dumps([key[0], key[1]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """Inverse of ``encode_cursor``; raises ValueError for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created, entry_id = json.loads(raw.decode("utf-8"))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(created, str) or not isinstance(entry_id, int):
+        raise ValueError("Invalid cursor")
+    return (created, entry_id)
+
+
+class EntryLookup:
+    """Constant-time ways into one generation of the index's entries.
+
+    Where several records share a key, the first one in index order wins,
+    matching the linear scans this replaces.
+    """
+
+    def __init__(self, entries: list[dict]):
+        self.by_id: dict[int, dict] = {}
+        self.by_slug: dict[str, dict] = {}
+        self.by_topic: dict[str, dict] = {}
+        self._topics: list[tuple[str, dict]] = []
+        for entry in entries:
+            topic = (entry.get("topic") or "").lower()
+            self.by_id.setdefault(entry.get("id"), entry)
+            self.by_slug.setdefault(entry.get("slug"), entry)
+            self.by_topic.setdefault(topic, entry)
+            self._topics.append((topic, entry))
+        # Oldest -> newest; among equal timestamps the first in index order
+        # sorts last, so it is what "latest" returns (like max()).
+        order = sorted(
+            range(len(entries)),
+            key=lambda i: (entries[i].get("created") or "", -i),
+        )
+        self.by_created = [entries[i] for i in order]
+        self._created_keys = [e.get("created") or "" for e in self.by_created]
+        # Paging order: ascending (created, id), overall and per lowercased tag.
+        ordered = sorted(entries, key=page_key)
+        self._pages: dict[str | None, tuple[list[PageKey], list[dict]]] = {
+            None: ([page_key(e) for e in ordered], ordered)
+        }
+        for entry in ordered:
+            for tag in {str(tag).lower() for tag in entry.get("tags") or []}:
+                keys, tagged = self._pages.setdefault(tag, ([], []))
+                keys.append(page_key(entry))
+                tagged.append(entry)
+
+    def latest(self) -> dict | None:
+        """The most recently created entry."""
+        return self.by_created[-1] if self.by_created else None
+
+    def latest_on(self, day: str) -> dict | None:
+        """The most recent entry created on a YYYY-MM-DD day."""
+        end = bisect_left(self._created_keys, day + "\U0010ffff")
+        if end == 0 or not self._created_keys[end - 1].startswith(day):
+            return None
+        return self.by_created[end - 1]
+
+    def count(self, tag: str | None = None) -> int:
+        """Number of entries (with ``tag``, if given)."""
+        return len(self._pages.get(tag.lower() if tag else None, ((), ()))[0])
+
+    def page(
+        self, after: PageKey | None = None, limit: int = 50, tag: str | None = None
+    ) -> tuple[list[dict], PageKey | None]:
+        """Newest-first entries older than ``after`` (with ``tag``, if given).
+
+        Returns the page and the key to pass as ``after`` for the next one
+        (None on the last page). Cost depends on ``limit``, not on how far
+        into the journal the page is.
+        """
+        keys, entries = self._pages.get(tag.lower() if tag else None, ([], []))
+        end = len(keys) if after is None else bisect_left(keys, tuple(after))
+        start = max(0, end - max(1, limit))
+        return entries[start:end][::-1], (keys[start] if start > 0 else None)
+
+    def topics_containing(self, text: str) -> list[dict]:
+        """Entries whose topic contains ``text`` (case-insensitive)."""
+        text = text.lower()
+        return [entry for topic, entry in self._topics if text in topic]
+
+
+def entry_lookup(journal_dir: Path) -> EntryLookup:
+    """Lookup tables for the current index, rebuilt only when it changes.
+
+    Raises FileNotFoundError when the journal has no index yet.
+    """
+    index_data = load_index(journal_dir)
+    slot = str(journal_dir)
+    with _cache_lock:
+        hit = _lookups.get(slot)
+        if hit is not None and hit[0] is index_data:
+            return hit[1]
+    lookup = EntryLookup(index_data.get("entries", []))
+    with _cache_lock:
+        _lookups[slot] = (index_data, lookup)
+    return lookup
+
+
+def _entry_day(entry: dict) -> date | None:
+    """The day an entry was created; None when its timestamp is unreadable."""
+    try:
+        return date.fromisoformat((entry.get("created") or "")[:10])
+    except ValueError:
+        return None
+
+
+class DailyRollup:
+    """Entry and AI-assisted entry counts per created day.
+
+    Entries whose ``created`` cannot be read are counted under ``None``.
+    """
+
+    def __init__(self, entries: Iterable[dict] = ()):
+        self.days: dict[date | None, list[int]] = {}  # day -> [entries, ai_assisted]
+        self.counted: dict[int, dict] = {}  # id -> the record as last counted
+        for entry in entries:
+            self.counted.setdefault(entry.get("id"), entry)
+            self._add(entry, 1)
+
+    def copy(self) -> DailyRollup:
+        rollup = DailyRollup()
+        rollup.days = {day: list(counts) for day, counts in self.days.items()}
+        rollup.counted = dict(self.counted)
+        return rollup
+
+    def _add(self, entry: dict, sign: int) -> None:
+        day = _entry_day(entry)
+        counts = self.days.setdefault(day, [0, 0])
+        counts[0] += sign
+        counts[1] += sign if entry.get("ai_sources") else 0
+        if counts[0] <= 0:
+            del self.days[day]
+
+    def apply(self, index_data: dict, op: dict, ids: set) -> None:
+        """``apply_op``, keeping these counts in step with the change."""
+        kind = op.get("op")
+        created = kind == "create" and op["entry"]["id"] not in ids
+        old = None
+        if kind == "delete" or (
+            kind == "update" and {"created", "ai_sources"} & set(op.get("fields", {}))
+        ):
+            old = self.counted.get(op["id"])
+        apply_op(index_data, op, ids)
+        if created:
+            self.counted[op["entry"]["id"]] = op["entry"]
+            self._add(op["entry"], 1)
+        if old is not None:
+            self._add(old, -1)
+            if kind == "update":
+                new = self.counted[op["id"]] = {**old, **op.get("fields", {})}
+                self._add(new, 1)
+            else:
+                del self.counted[op["id"]]
+
+    def count(self, day: date) -> tuple[int, int]:
+        """(entries, AI-assisted entries) created on ``day``."""
+        entries, ai = self.days.get(day, (0, 0))
+        return entries, ai
+
+    def window(self, end: date, days: int) -> list[tuple[date, int, int]]:
+        """(day, entries, AI-assisted) for the ``days`` days ending on ``end``."""
+        out = []
+        for back in range(days - 1, -1, -1):
+            day = date.fromordinal(end.toordinal() - back)
+            out.append((day, *self.count(day)))
+        return out
+
+
+def daily_rollup(journal_dir: Path) -> DailyRollup:
+    """Per-day counts for the current index, kept up to date by ``append_ops``.
+
+    Raises FileNotFoundError when the journal has no index yet.
+    """
+    index_data = load_index(journal_dir)
+    slot = str(journal_dir)
+    with _cache_lock:
+        hit = _rollups.get(slot)
+        if hit is not None and hit[0] is index_data:
+            return hit[1]
+    rollup = DailyRollup(index_data.get("entries", []))
+    with _cache_lock:
+        _rollups[slot] = (index_data, rollup)
+    return rollup
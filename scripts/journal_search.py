@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""One search engine for the CLI ``search``, the web UI and the AI context.
+
+Matching is a case-insensitive substring test over each entry's topic, tags
+and text, exactly as the original file scan did. Candidates now come from the
+SQLite search database (kept in step by ``sqlite_index.sync``) instead of
+opening every Markdown file: a trigram index lookup for queries of three or
+more characters, or a scan inside SQLite otherwise. When SQLite is unusable
+here (some network drives and USB sticks), the plain file scan takes over
+with the same results.
+
+``SearchFilters`` (tags, created range, AI source) narrow the candidates
+inside SQL. Results are kept in a small LRU cache keyed on the lowercased
+query, the filters and the journal's generation: the index on disk (which
+every create / append / update / delete changes) plus a counter bumped when
+``sync`` finds entry files edited outside the app. That check runs at most
+every ``FILE_CHECK_SECONDS``, so a repeated query (the web UI searches on
+each keystroke) is answered from memory.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Optional
+
+from entry_saver import get_journal_dir
+from journal_index import PageKey, entry_lookup, generation, page_key
+from sqlite_index import (
+    NO_FILTERS,
+    SearchFilters,
+    database_path,
+    substring_candidates,
+    sync,
+)
+
+CACHE_SIZE = 256
+FILE_CHECK_SECONDS = 1.0
+
+# (journal folder, query, filters, generation) -> (matches, their page keys
+# oldest first), least recently used first.
+_results: OrderedDict[tuple, tuple[list, list]] = OrderedDict()
+# journal folder -> (monotonic time of the last file check, edit counter,
+# index generation at that check).
+_file_checks: dict[str, tuple[float, int, Optional[tuple]]] = {}
+_stats = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+
+
+def _snippet(text: str, query: str) -> Optional[str]:
+    """First non-heading line containing the query, trimmed for display."""
+    for line in text.splitlines():
+        stripped = line.strip()
+        if (
+            query in stripped.lower()
+            and stripped
+            and not stripped.startswith("#")
+            and not stripped.startswith("<!--")
+        ):
+            return stripped if len(stripped) <= 100 else stripped[:97] + "..."
+    return None
+
+
+def _matches_meta(query: str, topic: str, tags: list) -> bool:
+    return query in topic.lower() or any(query in str(tag).lower() for tag in tags)
+
+
+def _newest_first(matches: list[tuple[dict, Optional[str]]]) -> list:
+    return sorted(matches, key=lambda m: page_key(m[0]), reverse=True)
+
+
+def scan_entries(
+    query: str, filters: SearchFilters = NO_FILTERS
+) -> list[tuple[dict, Optional[str]]]:
+    """The original search: read every entry file. Used when SQLite is unavailable."""
+    journal_dir = get_journal_dir()
+    query = (query or "").lower()
+    matches = []
+    for entry in entry_lookup(journal_dir).by_created:
+        if not filters.matches(entry):
+            continue
+        in_meta = _matches_meta(query, entry["topic"], entry.get("tags", []))
+        try:
+            text = (journal_dir / entry["filename"]).read_text(encoding="utf-8")
+        except OSError:
+            text = ""
+        snippet = _snippet(text, query) if query in text.lower() else None
+        if in_meta or snippet is not None:
+            matches.append((entry, snippet))
+    return _newest_first(matches)
+
+
+def _generation(journal_dir) -> Optional[tuple]:
+    """Current cache generation, or None when SQLite cannot tell us about edits.
+
+    This is also what keeps the search database in step: it syncs when the
+    index has changed since the last check (a write through the app) and at
+    most every ``FILE_CHECK_SECONDS`` otherwise (edits outside the app), so
+    the lookups that follow need not ``sync`` again.
+    """
+    slot = str(journal_dir)
+    now = time.monotonic()
+    try:
+        index_gen = generation(journal_dir)
+    except OSError:
+        return None
+    with _lock:
+        checked_at, edits, checked_gen = _file_checks.get(slot, (float("-inf"), 0, None))
+    if now - checked_at >= FILE_CHECK_SECONDS or index_gen != checked_gen:
+        if database_path(journal_dir).exists():
+            try:
+                result = sync(journal_dir)
+            except (sqlite3.Error, OSError):
+                return None
+            if result.added or result.changed or result.removed:
+                edits += 1
+        with _lock:
+            _file_checks[slot] = (now, edits, index_gen)
+    return index_gen, edits
+
+
+def cache_stats() -> dict:
+    """Search cache counters for the metrics endpoint."""
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+        size = len(_results)
+    lookups = hits + misses
+    return {
+        "size": size,
+        "capacity": CACHE_SIZE,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def clear_cache() -> None:
+    with _lock:
+        _results.clear()
+        _file_checks.clear()
+        _stats.update(hits=0, misses=0)
+
+
+def tag_facets(matches: list[tuple[dict, Optional[str]]]) -> list[tuple[str, int]]:
+    """(tag, matching entries) for a result list, most common first.
+
+    ``sqlite_index.faceted_search`` counts tags in SQL, but over its ranked
+    word and trigram matches; these are the substring matches above, and
+    work without SQLite too.
+    """
+    counts: dict[str, int] = {}
+    for entry, _snippet in matches:
+        for tag in {str(tag).lower() for tag in entry.get("tags") or []}:
+            counts[tag] = counts.get(tag, 0) + 1
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _cached(journal_dir, query: str, filters: SearchFilters) -> tuple[list, list]:
+    gen = _generation(journal_dir)
+    key = (str(journal_dir), query, filters, gen)
+    if gen is not None:
+        with _lock:
+            hit = _results.get(key)
+            if hit is not None:
+                _results.move_to_end(key)
+                _stats["hits"] += 1
+                return hit
+    checked = gen is not None and database_path(journal_dir).exists()
+    matches = _search(journal_dir, query, filters, checked)
+    result = (matches, [page_key(entry) for entry, _snippet in reversed(matches)])
+    with _lock:
+        _stats["misses"] += 1
+        if gen is not None:
+            _results[key] = result
+            _results.move_to_end(key)
+            while len(_results) > CACHE_SIZE:
+                _results.popitem(last=False)
+    return result
+
+
+def search_entries(
+    query: str, filters: SearchFilters = NO_FILTERS
+) -> list[tuple[dict, Optional[str]]]:
+    """Search entries by title, tag, AND full text. Pure: returns matches.
+
+    Returns a list of (entry, snippet) tuples sorted newest-first. ``snippet``
+    is the first non-heading line containing the query, or ``None`` when the
+    match came only from the topic/tags. Only entries passing ``filters``
+    are returned.
+    """
+    matches, _keys = _cached(get_journal_dir(), (query or "").lower(), filters)
+    return list(matches)
+
+
+def search_page(
+    query: str,
+    filters: SearchFilters = NO_FILTERS,
+    after: Optional[PageKey] = None,
+    limit: int = 50,
+) -> tuple[list[tuple[dict, Optional[str]]], Optional[PageKey], list]:
+    """One newest-first page of ``search_entries`` after a (created, id) key.
+
+    Returns (page, key for the next page or None, all matches). The full
+    match list is cached, so each later page is a bisect and a slice.
+    """
+    matches, keys = _cached(get_journal_dir(), (query or "").lower(), filters)
+    end = len(keys) if after is None else bisect_left(keys, tuple(after))
+    start = max(0, end - max(1, limit))
+    page = matches[len(keys) - end : len(keys) - start]
+    return page, (keys[start] if start > 0 else None), matches
+
+
+def _search(
+    journal_dir, query: str, filters: SearchFilters, checked: bool = False
+) -> list[tuple[dict, Optional[str]]]:
+    """Matches for ``query``; ``checked`` when _generation has synced the database."""
+    try:
+        candidates = substring_candidates(journal_dir, query, filters, check=not checked)
+    except (sqlite3.Error, OSError):
+        return scan_entries(query, filters)
+
+    by_id = entry_lookup(journal_dir).by_id
+    matches = []
+    for entry_id, body in candidates:
+        entry = by_id.get(entry_id)
+        if entry is None:
+            continue
+        in_meta = _matches_meta(query, entry["topic"], entry.get("tags", []))
+        snippet = _snippet(body, query) if query in body.lower() else None
+        if in_meta or snippet is not None:
+            matches.append((entry, snippet))
+    return _newest_first(matches)
@@ -6,11 +6,20 @@ import json
 import os
 import sqlite3
 import sys
+import time
 import zipfile
 from datetime import datetime
 from pathlib import Path
 
-from sqlite_index import database_path, rebuild, search
+from journal_index import compact, encode_cursor, read_index
+from sqlite_index import (
+    NO_FILTERS,
+    SearchFilters,
+    database_path,
+    faceted_search,
+    rebuild,
+    sync,
+)
 
 
 def journal_dir() -> Path:
@@ -27,7 +36,7 @@ def doctor() -> int:
     checks.append(("Journal index", index.exists(), str(index)))
     if index.exists():
         try:
-            data = json.loads(index.read_text(encoding="utf-8"))
+            data = read_index(root)
             valid = isinstance(data.get("entries", []), list)
             detail = (
                 f"{len(data.get('entries', []))} entries" if valid else "invalid format"
@@ -52,48 +61,89 @@ def doctor() -> int:
     return 0
 
 
-def reindex() -> int:
+def reindex(full: bool = False) -> int:
     root = journal_dir()
+    folded = compact(root)
+    if folded:
+        print(f"Journal index compacted: {folded} pending change(s) folded in")
     try:
-        count = rebuild(root)
+        if full or not database_path(root).exists():
+            started = time.perf_counter()
+            count = rebuild(root)
+            elapsed = max(time.perf_counter() - started, 1e-6)
+            print(
+                f"Search index rebuilt: {count} entries in {elapsed:.1f}s "
+                f"({count / elapsed:,.0f} entries/sec)"
+            )
+        else:
+            result = sync(root)
+            print(
+                f"Search index updated: {result.added} added, {result.changed} "
+                f"changed, {result.removed} removed ({result.total} entries)"
+            )
     except sqlite3.OperationalError as exc:
         print(f"Could not build the fast search database here ({exc}).")
         print("This can happen on network drives or USB sticks.")
         print("Basic search still works: ai-journal search \"<word>\"")
         return 1
-    print(f"Search index rebuilt: {count} entries")
     print(f"Database: {database_path(root)}")
     return 0
 
 
-def search_command(query: str, limit: int = 20) -> int:
+def _describe(query: str, filters: SearchFilters) -> str:
+    parts = [f'"{query}"'] if query else []
+    parts += [f"tag {tag}" for tag in filters.tags]
+    if filters.since:
+        parts.append(f"since {filters.since}")
+    if filters.until:
+        parts.append(f"until {filters.until}")
+    if filters.ai_source:
+        parts.append(f"source {filters.ai_source}")
+    return ", ".join(parts)
+
+
+def search_command(
+    query: str,
+    limit: int = 20,
+    filters: SearchFilters = NO_FILTERS,
+    after: tuple[str, int] | None = None,
+) -> int:
+    label = _describe(query, filters)
     try:
-        results = search(journal_dir(), query, limit)
+        page = faceted_search(journal_dir(), query, limit, filters, after)
     except sqlite3.OperationalError:
         # SQLite can fail on network drives / USB sticks. Fall back to the
         # plain full-text scan so the learner still gets an answer.
         from journal_cli import format_entry, search_entries
 
-        matches = search_entries(query)[: max(1, limit)]
+        matches = search_entries(query, filters)[: max(1, limit)]
         if not matches:
-            print(f'No journal entries matched "{query}".')
+            print(f"No journal entries matched {label}.")
             return 0
-        print(f'{len(matches)} result(s) for "{query}" (basic search)\n')
+        print(f"{len(matches)} result(s) for {label} (basic search)\n")
         for entry, snippet in matches:
             print(format_entry(entry))
             if snippet:
                 print(f"      > {snippet}")
         return 0
+    results = page.results
     if not results:
-        print(f'No journal entries matched "{query}".')
+        print(f"No journal entries matched {label}.")
         return 0
-    print(f'{len(results)} result(s) for "{query}"\n')
+    shown = f"{len(results)} of {page.total}" if page.total > len(results) else str(page.total)
+    print(f"{shown} result(s) for {label}")
+    if page.facets:
+        top = ", ".join(f"{tag} ({count})" for tag, count in page.facets[:8])
+        print(f"Tags in these results: {top}")
+    print()
     for result in results:
         tags = ", ".join(result.tags) or "untagged"
         print(f"{result.id:>3}  {result.created[:10]}  {result.topic}")
         print(f"     Tags: {tags}")
         if result.snippet:
             print(f"     {result.snippet}")
+    if page.next_after:
+        print(f"\nMore: repeat with --after {encode_cursor(page.next_after)}")
     return 0
 
 
@@ -109,6 +159,8 @@ def backup(destination: str | None = None) -> int:
         else Path.home() / f"AI-Journal-backup-{stamp}.zip"
     )
     target.parent.mkdir(parents=True, exist_ok=True)
+    # Fold pending changes into index.json, so the zip holds one plain snapshot.
+    compact(root)
     db_name = database_path(root).name
     with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
         for path in root.rglob("*"):
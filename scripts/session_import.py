@@ -24,7 +24,7 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-from entry_saver import create_entry, load_index
+from entry_saver import create_entries, load_index
 
 # How much of each prompt/reply we keep in the draft.
 MAX_PROMPTS = 12
@@ -241,15 +241,20 @@ def import_session(session: dict) -> str:
     else:
         topic = f"Session in {session['project']}"
 
-    return create_entry(
-        topic,
-        content=build_draft(session),
-        tags=["session-import", "claude-code"],
-        ai_metadata={
-            "source": "claude-code-import",
-            "session_id": session["path"].stem,
-        },
+    (entry_path,) = create_entries(
+        [
+            {
+                "topic": topic,
+                "content": build_draft(session),
+                "tags": ["session-import", "claude-code"],
+                "ai_metadata": {
+                    "source": "claude-code-import",
+                    "session_id": session["path"].stem,
+                },
+            }
+        ]
     )
+    return entry_path
 
 
 def choose_session(reader: ClaudeCodeReader, take_latest: bool):
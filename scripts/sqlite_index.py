@@ -3,15 +3,52 @@
 
 Markdown remains the source of truth. The database can always be deleted and
 rebuilt from index.json plus the entry files.
+
+Schema version 2 stores each body once: ``entries_fts`` is an external-content
+FTS5 index over ``entries``, kept in step by triggers. Version-1 databases
+(which held a second copy of every body in the FTS table) are upgraded in
+place the first time they are opened. Where SQLite has the trigram tokenizer,
+a second external-content index (``entries_trigram``) makes substring
+matches ("pars" inside "subparsers") index lookups too.
+
+A ``manifest`` table remembers each entry file's (mtime_ns, size, content
+hash) as it was indexed, so ``sync`` can re-index just the entries that were
+added, changed or removed instead of rebuilding everything. A ``previews``
+table keeps what the entry list shows for each file version (see
+``entry_previews``); indexing fills it for free since the file is read anyway.
+
+Connections are pooled per database file and reused across calls (and
+threads), with schema setup done once per process; see ``_ConnectionPool``.
 """
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import date
+from functools import partial
 from pathlib import Path
+from typing import Iterator
+
+from entry_previews import EntryPreview, summarize
+from journal_index import load_index
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 3
+
+# Pooled connections kept open per database, and their read-tuning pragmas.
+POOL_SIZE = 4
+MMAP_BYTES = 64 * 1024 * 1024
+CACHE_KIB = 16 * 1024
+
+# Full rebuilds: threads reading entry files, and rows per executemany batch.
+REBUILD_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+REBUILD_BATCH = 500
 
 
 @dataclass(frozen=True)
@@ -30,43 +67,366 @@ def database_path(journal_dir: Path) -> Path:
 
 
 def connect(journal_dir: Path) -> sqlite3.Connection:
+    """Open a new, caller-owned connection with the standard pragmas."""
     journal_dir.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(database_path(journal_dir))
+    return _open(database_path(journal_dir))
+
+
+def _open(path: Path | str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    # Read-tuned: map the file into memory, keep more pages cached, and sort
+    # or group in RAM instead of temp files (slow on USB sticks).
+    conn.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
-def initialize(conn: sqlite3.Connection) -> None:
-    conn.executescript(
-        """
-        CREATE TABLE IF NOT EXISTS metadata (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL
-        );
-        CREATE TABLE IF NOT EXISTS entries (
-            id INTEGER PRIMARY KEY,
-            topic TEXT NOT NULL,
-            filename TEXT NOT NULL UNIQUE,
-            created TEXT NOT NULL,
-            tags_json TEXT NOT NULL,
-            body TEXT NOT NULL
-        );
-        CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
-            entry_id UNINDEXED,
-            topic,
-            tags,
-            body,
-            tokenize='unicode61 remove_diacritics 2'
-        );
-        """
+class _ConnectionPool:
+    """Idle connections to one database file, reused across threads.
+
+    The threaded web server starts a new thread per request, so connections
+    are pooled rather than tied to thread lifetime: each concurrent caller
+    checks one out and hands it back. Schema setup runs once per database
+    file per process. If the file is replaced or deleted, the pool notices
+    (its inode changes) and drops every connection to the old file.
+    """
+
+    def __init__(self, journal_dir: Path):
+        self.journal_dir = journal_dir
+        self.path = database_path(journal_dir)
+        self.idle: list[sqlite3.Connection] = []
+        self.generation = 0
+        self.inode: int | None = None
+        self.ready = False
+        self.lock = threading.Lock()
+
+    def _inode(self) -> int | None:
+        try:
+            return os.stat(self.path).st_ino
+        except OSError:
+            return None
+
+    def checkout(self) -> tuple[sqlite3.Connection, int]:
+        inode = self._inode()
+        with self.lock:
+            if inode is None or inode != self.inode:
+                stale, self.idle = self.idle, []
+                self.generation += 1
+                self.ready = False
+            else:
+                stale = []
+            conn = self.idle.pop() if self.idle else None
+            generation, ready = self.generation, self.ready
+        for old in stale:
+            old.close()
+        if conn is None:
+            conn = connect(self.journal_dir)
+        if not ready:
+            initialize(conn)
+            with self.lock:
+                if self.generation == generation:
+                    self.inode, self.ready = self._inode(), True
+        return conn, generation
+
+    def checkin(self, conn: sqlite3.Connection, generation: int) -> None:
+        with self.lock:
+            if generation == self.generation and len(self.idle) < POOL_SIZE:
+                self.idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self.lock:
+            stale, self.idle = self.idle, []
+            self.generation += 1
+            self.ready = False
+        for conn in stale:
+            conn.close()
+
+
+_pools: dict[str, _ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+@contextmanager
+def _connection(journal_dir: Path) -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled connection; uncommitted work is rolled back on error."""
+    key = str(database_path(journal_dir))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _ConnectionPool(journal_dir)
+    conn, generation = pool.checkout()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        pool.checkin(conn, generation)
+
+
+def close_connections() -> None:
+    """Close every pooled connection (server shutdown, tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+# The FTS table holds only the inverted index: its documents are read from
+# ``entries`` (external content), and triggers keep the two in step.
+_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
     )
-    conn.execute(
-        "INSERT OR REPLACE INTO metadata(key, value) VALUES('schema_version', ?)",
-        (str(SCHEMA_VERSION),),
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY,
+        topic TEXT NOT NULL,
+        filename TEXT NOT NULL UNIQUE,
+        created TEXT NOT NULL,
+        tags_json TEXT NOT NULL,
+        body TEXT NOT NULL,
+        tags TEXT NOT NULL DEFAULT '',
+        ai_source TEXT
     )
-    conn.commit()
+    """,
+    "CREATE INDEX IF NOT EXISTS entries_created ON entries(created, id)",
+    """
+    CREATE TABLE IF NOT EXISTS entry_tags (
+        tag TEXT NOT NULL COLLATE NOCASE,
+        entry_id INTEGER NOT NULL,
+        PRIMARY KEY (tag, entry_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS entry_tags_entry ON entry_tags(entry_id)",
+    """
+    CREATE TABLE IF NOT EXISTS manifest (
+        entry_id INTEGER PRIMARY KEY,
+        filename TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        content_hash TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS previews (
+        filename TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        preview TEXT NOT NULL,
+        excerpt TEXT NOT NULL,
+        word_count INTEGER NOT NULL,
+        sections_json TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+        topic,
+        tags,
+        body,
+        content='entries',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+)
+
+_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+        INSERT INTO entries_fts(rowid, topic, tags, body)
+        VALUES (new.id, new.topic, new.tags, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+        INSERT INTO entries_fts(entries_fts, rowid, topic, tags, body)
+        VALUES ('delete', old.id, old.topic, old.tags, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_fts_update AFTER UPDATE ON entries BEGIN
+        INSERT INTO entries_fts(entries_fts, rowid, topic, tags, body)
+        VALUES ('delete', old.id, old.topic, old.tags, old.body);
+        INSERT INTO entries_fts(rowid, topic, tags, body)
+        VALUES (new.id, new.topic, new.tags, new.body);
+    END
+    """,
+)
+
+# One row per (tag, entry) for filtering and facet counts, derived from
+# ``tags_json`` so every write path keeps it current.
+_TAG_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS entry_tags_insert AFTER INSERT ON entries BEGIN
+        INSERT OR IGNORE INTO entry_tags(tag, entry_id)
+        SELECT CAST(value AS TEXT), new.id FROM json_each(new.tags_json);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entry_tags_delete AFTER DELETE ON entries BEGIN
+        DELETE FROM entry_tags WHERE entry_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entry_tags_update AFTER UPDATE OF tags_json ON entries
+    BEGIN
+        DELETE FROM entry_tags WHERE entry_id = old.id;
+        INSERT OR IGNORE INTO entry_tags(tag, entry_id)
+        SELECT CAST(value AS TEXT), new.id FROM json_each(new.tags_json);
+    END
+    """,
+)
+
+# Optional second index over the same rows, tokenized into trigrams so any
+# substring of three or more characters is an index lookup. Needs SQLite
+# 3.34+; without it searches fall back to scanning ``entries``.
+_TRIGRAM_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS entries_trigram USING fts5(
+        topic,
+        tags,
+        body,
+        content='entries',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+"""
+
+_TRIGRAM_TRIGGERS = tuple(
+    statement.replace("entries_fts", "entries_trigram") for statement in _TRIGGERS
+)
+
+
+def _drop_triggers(table: str) -> tuple[str, ...]:
+    return tuple(
+        f"DROP TRIGGER IF EXISTS {table}_{event}"
+        for event in ("insert", "delete", "update")
+    )
+
+
+_DROP_TRIGGERS = _drop_triggers("entries_fts") + _drop_triggers("entries_trigram")
+
+TRIGRAM_MIN = 3  # shorter tokens have no trigram to look up
+
+
+def _tags_text(tags: list) -> str:
+    return " ".join(str(tag) for tag in tags)
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    try:
+        row = conn.execute(
+            "SELECT value FROM metadata WHERE key = 'schema_version'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return 0  # new, empty database
+    return int(row[0]) if row else 0
+
+
+def _migrate_v1(conn: sqlite3.Connection) -> None:
+    """Version 1 kept a second copy of every body inside ``entries_fts``.
+
+    Drop that table, add the plain-text ``tags`` column the external-content
+    index reads, and let ``initialize`` create and fill the new index.
+    """
+    conn.execute("DROP TABLE IF EXISTS entries_fts")
+    conn.execute("ALTER TABLE entries ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+    rows = conn.execute("SELECT id, tags_json FROM entries").fetchall()
+    conn.executemany(
+        "UPDATE entries SET tags = ? WHERE id = ?",
+        [(_tags_text(json.loads(row["tags_json"])), row["id"]) for row in rows],
+    )
+
+
+def has_trigram(conn: sqlite3.Connection) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'entries_trigram'"
+        ).fetchone()
+        is not None
+    )
+
+
+def trigram_enabled() -> bool:
+    """The trigram index is on unless ``AI_JOURNAL_TRIGRAM=0`` (it roughly
+    triples the database size, which matters for very large journals)."""
+    return os.getenv("AI_JOURNAL_TRIGRAM") != "0"
+
+
+def _create_trigram(conn: sqlite3.Connection) -> bool:
+    """Create the trigram index if enabled and supported; True if present."""
+    if not trigram_enabled():
+        for statement in _drop_triggers("entries_trigram"):
+            conn.execute(statement)
+        conn.execute("DROP TABLE IF EXISTS entries_trigram")
+        return False
+    try:
+        conn.execute(_TRIGRAM_TABLE)
+    except sqlite3.OperationalError:
+        return False  # no trigram tokenizer in this SQLite build
+    for statement in _TRIGRAM_TRIGGERS:
+        conn.execute(statement)
+    return True
+
+
+def _index_triggers(conn: sqlite3.Connection) -> tuple[str, ...]:
+    return _TRIGGERS + (_TRIGRAM_TRIGGERS if has_trigram(conn) else ())
+
+
+def _migrate_v2(conn: sqlite3.Connection) -> None:
+    """Version 3 adds ``ai_source`` and the ``entry_tags`` facet table."""
+    conn.execute("ALTER TABLE entries ADD COLUMN ai_source TEXT")
+
+
+def initialize(conn: sqlite3.Connection) -> None:
+    """Create the schema, upgrading a version-1 database in place.
+
+    Indexes missing from an existing database (after a migration, or the
+    trigram index once SQLite supports it) are filled from ``entries``.
+    """
+    version = _schema_version(conn)
+    conn.execute("BEGIN")
+    try:
+        if version == 1:
+            _migrate_v1(conn)
+        if version in (1, 2):
+            _migrate_v2(conn)
+        had_trigram = has_trigram(conn)
+        for statement in _TABLES + _TRIGGERS + _TAG_TRIGGERS:
+            conn.execute(statement)
+        if version == 1:
+            conn.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+        if version in (1, 2):
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO entry_tags(tag, entry_id)
+                SELECT CAST(j.value AS TEXT), e.id FROM entries e, json_each(e.tags_json) j
+                """
+            )
+            # ai_source comes from index.json: let the next sync re-read every entry.
+            conn.execute("DELETE FROM manifest")
+        if _create_trigram(conn) and version and not had_trigram:
+            conn.execute("INSERT INTO entries_trigram(entries_trigram) VALUES ('rebuild')")
+        conn.execute(
+            "INSERT OR REPLACE INTO metadata(key, value) VALUES('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    if version == 1:
+        conn.execute("VACUUM")  # hand the space of the old FTS copy back
 
 
 def _read_index(journal_dir: Path) -> list[dict]:
@@ -74,7 +434,7 @@ def _read_index(journal_dir: Path) -> list[dict]:
     if not path.exists():
         return []
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = load_index(journal_dir)
     except (OSError, json.JSONDecodeError) as exc:
         raise RuntimeError(f"Cannot read {path}: {exc}") from exc
     entries = data.get("entries", [])
@@ -83,171 +443,679 @@ def _read_index(journal_dir: Path) -> list[dict]:
     return entries
 
 
+def _entry_fields(item: dict) -> tuple[int, str, str, str, list, str | None] | None:
+    """(id, topic, filename, created, tags, ai_source) for an index record, or None."""
+    try:
+        entry_id = int(item["id"])
+        filename = str(item["filename"])
+        topic = str(item.get("topic") or "Untitled")
+        created = str(item.get("created") or "")
+    except (KeyError, TypeError, ValueError):
+        return None
+    tags = item.get("tags") or []
+    if not isinstance(tags, list):
+        tags = [str(tags)]
+    sources = item.get("ai_sources") or []
+    ai_source = str(sources[0]) if isinstance(sources, list) and sources else None
+    return entry_id, topic, filename, created, tags, ai_source
+
+
+def _file_state(path: Path | str) -> tuple[int, int]:
+    """(mtime_ns, size) of an entry file; (-1, -1) when it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return -1, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_body(path: Path | str) -> tuple[str, str]:
+    """Entry text and a hash of its bytes ("" for a missing file)."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        raw = b""
+    return raw.decode("utf-8", errors="replace"), hashlib.sha256(raw).hexdigest()
+
+
+_UPSERT_ENTRY = """
+    INSERT INTO entries(id, topic, filename, created, tags_json, body, tags, ai_source)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        topic=excluded.topic,
+        filename=excluded.filename,
+        created=excluded.created,
+        tags_json=excluded.tags_json,
+        body=excluded.body,
+        tags=excluded.tags,
+        ai_source=excluded.ai_source
+"""
+
+_UPSERT_MANIFEST = """
+    INSERT OR REPLACE INTO manifest(entry_id, filename, mtime_ns, size, content_hash)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_UPSERT_PREVIEW = """
+    INSERT OR REPLACE INTO previews(
+        filename, mtime_ns, size, preview, excerpt, word_count, sections_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _preview_row(filename: str, p: EntryPreview) -> tuple:
+    return (
+        filename,
+        p.mtime_ns,
+        p.size,
+        p.preview,
+        p.excerpt,
+        p.word_count,
+        json.dumps(p.sections),
+    )
+
+
+def _entry_rows(root: str, fields: tuple) -> tuple[tuple, tuple, tuple]:
+    """Read one entry file: its ``entries``, ``manifest`` and ``previews`` rows.
+
+    Pure apart from the file read, so rebuilds run it on worker threads.
+    """
+    entry_id, topic, filename, created, tags, ai_source = fields
+    path = os.path.join(root, filename)
+    mtime_ns, size = _file_state(path)
+    body, content_hash = _read_body(path)
+    tags_json = json.dumps(tags)
+    return (
+        (entry_id, topic, filename, created, tags_json, body, _tags_text(tags), ai_source),
+        (entry_id, filename, mtime_ns, size, content_hash),
+        _preview_row(filename, summarize(body, mtime_ns, size)),
+    )
+
+
+def _upsert(conn: sqlite3.Connection, journal_dir: Path, fields: tuple) -> None:
+    """Write one entry's row and manifest state (triggers update the FTS index)."""
+    entry, manifest, preview = _entry_rows(str(journal_dir), fields)
+    conn.execute(_UPSERT_ENTRY, entry)
+    conn.execute(_UPSERT_MANIFEST, manifest)
+    conn.execute(_UPSERT_PREVIEW, preview)
+
+
+def _delete(conn: sqlite3.Connection, entry_id: int) -> None:
+    conn.execute(
+        "DELETE FROM previews WHERE filename IN (SELECT filename FROM entries WHERE id = ?)",
+        (entry_id,),
+    )
+    conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+    conn.execute("DELETE FROM manifest WHERE entry_id = ?", (entry_id,))
+
+
+def _insert_batch(conn: sqlite3.Connection, batch: list[tuple[tuple, tuple, tuple]]) -> None:
+    conn.executemany(_UPSERT_ENTRY, [rows[0] for rows in batch])
+    conn.executemany(_UPSERT_MANIFEST, [rows[1] for rows in batch])
+    conn.executemany(_UPSERT_PREVIEW, [rows[2] for rows in batch])
+
+
+def _build(conn: sqlite3.Connection, root: str, fields: list[tuple]) -> None:
+    """Fill an empty database: batched rows, then each FTS index in one pass."""
+    # Load rows with the sync triggers off; trigger DDL is transactional.
+    triggers = _index_triggers(conn)
+    for statement in _DROP_TRIGGERS:
+        conn.execute(statement)
+    read = partial(_entry_rows, root)
+    with ThreadPoolExecutor(max_workers=REBUILD_WORKERS) as pool:
+        # Read one batch ahead while the previous one is inserted, so at most
+        # two batches of entry bodies are held in memory at once.
+        pending = None
+        for start in range(0, len(fields), REBUILD_BATCH):
+            reading = pool.map(read, fields[start:start + REBUILD_BATCH])
+            if pending is not None:
+                _insert_batch(conn, list(pending))
+            pending = reading
+        if pending is not None:
+            _insert_batch(conn, list(pending))
+    tables = ["entries_fts"] + (["entries_trigram"] if has_trigram(conn) else [])
+    for table in tables:
+        conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        conn.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+    for statement in triggers:
+        conn.execute(statement)
+    conn.commit()
+
+
 def rebuild(journal_dir: Path) -> int:
-    """Rebuild the search database. Returns the number of indexed entries."""
-    conn = connect(journal_dir)
+    """Rebuild the search database. Returns the number of indexed entries.
+
+    The new index is built in a shadow file beside the live database: entry
+    files are read on a thread pool (file I/O releases the GIL), rows go in
+    with ``executemany`` batches, and the FTS index is built and optimized
+    once. The finished copy then replaces the live contents in a single
+    transaction, so concurrent searches keep reading the old index until
+    that commit and never see a half-built one.
+    """
+    fields = [f for f in map(_entry_fields, _read_index(journal_dir)) if f is not None]
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    fd, shadow_path = tempfile.mkstemp(
+        dir=journal_dir, prefix=".journal-search-", suffix=".sqlite3"
+    )
+    os.close(fd)
     try:
-        initialize(conn)
-        conn.execute("DELETE FROM entries")
-        conn.execute("DELETE FROM entries_fts")
-        count = 0
-        for item in _read_index(journal_dir):
-            try:
-                entry_id = int(item["id"])
-                filename = str(item["filename"])
-                topic = str(item.get("topic") or "Untitled")
-                created = str(item.get("created") or "")
-            except (KeyError, TypeError, ValueError):
-                continue
-            tags = item.get("tags") or []
-            if not isinstance(tags, list):
-                tags = [str(tags)]
-            path = journal_dir / filename
+        shadow = _open(shadow_path)
+        try:
+            # A throwaway file: no rollback journal, no fsyncs.
+            shadow.execute("PRAGMA journal_mode=OFF")
+            shadow.execute("PRAGMA synchronous=OFF")
+            initialize(shadow)
+            _build(shadow, str(journal_dir), fields)
+            with _connection(journal_dir) as conn:
+                shadow.backup(conn)
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        finally:
+            shadow.close()
+    finally:
+        for leftover in (shadow_path, shadow_path + "-journal"):
             try:
-                body = path.read_text(encoding="utf-8")
-            except OSError:
-                body = ""
-            tags_json = json.dumps(tags)
-            conn.execute(
-                """
-                INSERT INTO entries(id, topic, filename, created, tags_json, body)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (entry_id, topic, filename, created, tags_json, body),
+                os.unlink(leftover)
+            except FileNotFoundError:
+                pass
+    return len(fields)
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    added: int
+    changed: int
+    removed: int
+    total: int
+
+
+def sync(journal_dir: Path) -> SyncResult:
+    """Bring the database in step with the journal, touching only what changed.
+
+    Each entry's (mtime_ns, size) is compared with the manifest; only files
+    whose stat differs are re-read, and only those whose content hash (or
+    index metadata) really changed are re-indexed. Entries gone from the
+    index are removed.
+    """
+    with _connection(journal_dir) as conn:
+        indexed = {
+            row["id"]: tuple(row)[1:]
+            for row in conn.execute(
+                "SELECT id, topic, filename, created, tags_json, ai_source FROM entries"
             )
-            conn.execute(
-                "INSERT INTO entries_fts(entry_id, topic, tags, body) VALUES (?, ?, ?, ?)",
-                (entry_id, topic, " ".join(str(tag) for tag in tags), body),
+        }
+        manifest = {
+            row["entry_id"]: (row["mtime_ns"], row["size"], row["content_hash"])
+            for row in conn.execute(
+                "SELECT entry_id, mtime_ns, size, content_hash FROM manifest"
+            )
+        }
+        added = changed = 0
+        seen = set()
+        root = str(journal_dir)  # os.path is much cheaper than Path per entry
+        for item in _read_index(journal_dir):
+            fields = _entry_fields(item)
+            if fields is None:
+                continue
+            entry_id, topic, filename, created, tags, ai_source = fields
+            seen.add(entry_id)
+            if entry_id not in indexed:
+                _upsert(conn, journal_dir, fields)
+                added += 1
+                continue
+            same_meta = indexed[entry_id] == (
+                topic, filename, created, json.dumps(tags), ai_source
             )
-            count += 1
+            state = _file_state(os.path.join(root, filename))
+            known = manifest.get(entry_id)
+            if same_meta and known is not None and known[:2] == state:
+                continue
+            if same_meta and known is not None:
+                # Touched but maybe not edited: compare content before re-indexing.
+                _body, content_hash = _read_body(journal_dir / filename)
+                if content_hash == known[2]:
+                    conn.execute(
+                        "UPDATE manifest SET mtime_ns = ?, size = ? WHERE entry_id = ?",
+                        (state[0], state[1], entry_id),
+                    )
+                    conn.execute(
+                        "UPDATE previews SET mtime_ns = ?, size = ? WHERE filename = ?",
+                        (state[0], state[1], filename),
+                    )
+                    continue
+            _upsert(conn, journal_dir, fields)
+            changed += 1
+        removed = set(indexed) - seen
+        for entry_id in removed:
+            _delete(conn, entry_id)
         conn.commit()
-        return count
-    finally:
-        conn.close()
+        return SyncResult(added, changed, len(removed), len(seen))
 
 
-def needs_rebuild(journal_dir: Path) -> bool:
-    """Return True when Markdown/index data is newer than the search database."""
-    db = database_path(journal_dir)
-    if not db.exists():
-        return True
+def _quote(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
+def _fts_query(text: str) -> str:
+    tokens = [token for token in text.split() if token.strip()]
+    return " AND ".join(f"{_quote(token)}*" for token in tokens)
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """How each query token is looked up.
+
+    ``words`` go to the word index as prefix matches; ``substrings`` (tokens
+    long enough to have trigrams) go to the trigram index, which matches
+    them anywhere inside a word.
+    """
+
+    words: tuple[str, ...]
+    substrings: tuple[str, ...]
+
+    def word_query(self) -> str:
+        return " AND ".join(f"{_quote(token)}*" for token in self.words)
+
+    def substring_query(self) -> str:
+        return " AND ".join(_quote(token) for token in self.substrings)
+
+
+def plan_query(text: str, trigram: bool) -> QueryPlan:
+    tokens = [token for token in text.split() if token.strip()]
+    if not trigram:
+        return QueryPlan(tuple(tokens), ())
+    return QueryPlan(
+        tuple(token for token in tokens if len(token) < TRIGRAM_MIN),
+        tuple(token for token in tokens if len(token) >= TRIGRAM_MIN),
+    )
+
+
+def _day(value: str | date | None, name: str) -> str | None:
+    if value is None or value == "":
+        return None
+    text = value.isoformat() if isinstance(value, date) else str(value).strip()
     try:
-        db_mtime = db.stat().st_mtime
-    except OSError:
+        date.fromisoformat(text[:10])
+    except ValueError:
+        raise ValueError(f"{name} must be a date like 2026-07-01, not {value!r}") from None
+    return text
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Facet filters applied inside SQL: every tag, a created range, an AI source.
+
+    ``since`` and ``until`` are ISO dates (or datetimes); both ends are
+    inclusive, so ``until="2026-07-31"`` keeps entries from that whole day.
+    Build with ``SearchFilters.of(...)`` to normalize and validate input.
+    """
+
+    tags: tuple[str, ...] = ()
+    since: str | None = None
+    until: str | None = None
+    ai_source: str | None = None
+
+    @classmethod
+    def of(
+        cls,
+        tags: list[str] | tuple[str, ...] | None = None,
+        since: str | date | None = None,
+        until: str | date | None = None,
+        ai_source: str | None = None,
+    ) -> SearchFilters:
+        clean = sorted({str(tag).strip().lower() for tag in tags or () if str(tag).strip()})
+        return cls(
+            tags=tuple(clean),
+            since=_day(since, "since"),
+            until=_day(until, "until"),
+            ai_source=(ai_source or "").strip() or None,
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.tags or self.since or self.until or self.ai_source)
+
+    def _until_bound(self) -> str:
+        # A bare date keeps the whole day: "2026-07-31T23:59" sorts below it.
+        return self.until + "\U0010ffff" if len(self.until) == 10 else self.until
+
+    def sql(self) -> tuple[str, list]:
+        """``AND ...`` conditions on ``entries e`` and their parameters."""
+        clauses, params = [], []
+        for tag in self.tags:
+            clauses.append("e.id IN (SELECT entry_id FROM entry_tags WHERE tag = ?)")
+            params.append(tag)
+        if self.since:
+            clauses.append("e.created >= ?")
+            params.append(self.since)
+        if self.until:
+            clauses.append("e.created <= ?")
+            params.append(self._until_bound())
+        if self.ai_source:
+            clauses.append("e.ai_source = ? COLLATE NOCASE")
+            params.append(self.ai_source)
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    def matches(self, entry: dict) -> bool:
+        """The same test in Python, for the file-scan fallback."""
+        created = str(entry.get("created") or "")
+        if self.since and created < self.since:
+            return False
+        if self.until and created > self._until_bound():
+            return False
+        if self.tags:
+            have = {str(tag).lower() for tag in entry.get("tags") or []}
+            if not have.issuperset(self.tags):
+                return False
+        if self.ai_source:
+            sources = entry.get("ai_sources") or []
+            if not sources or str(sources[0]).lower() != self.ai_source.lower():
+                return False
         return True
-    index_path = journal_dir / "index.json"
-    try:
-        if index_path.stat().st_mtime > db_mtime:
-            return True
-    except OSError:
-        return False
-    for item in _read_index(journal_dir):
-        filename = item.get("filename")
-        if not filename:
-            continue
-        try:
-            if (journal_dir / str(filename)).stat().st_mtime > db_mtime:
-                return True
-        except OSError:
-            continue
-    return False
 
 
-def _fts_query(text: str) -> str:
-    tokens = [token.replace('"', '""') for token in text.split() if token.strip()]
-    return " AND ".join(f'"{token}"*' for token in tokens)
+NO_FILTERS = SearchFilters()
+FACET_LIMIT = 50
 
 
-def search(journal_dir: Path, query: str, limit: int = 20) -> list[SearchResult]:
-    query = query.strip()
-    if not query:
-        return []
-    if needs_rebuild(journal_dir):
+@dataclass(frozen=True)
+class SearchPage:
+    results: list[SearchResult]
+    total: int
+    facets: tuple[tuple[str, int], ...]  # (tag, matching entries), most common first
+    next_after: tuple[str, int] | None = None  # keyset for the next page (listings)
+
+
+def _ensure_current(journal_dir: Path) -> None:
+    if database_path(journal_dir).exists():
+        sync(journal_dir)
+    else:
         rebuild(journal_dir)
-    conn = connect(journal_dir)
-    try:
-        initialize(conn)
+
+
+def _result(row: sqlite3.Row) -> SearchResult:
+    return SearchResult(
+        id=row["id"],
+        topic=row["topic"],
+        filename=row["filename"],
+        created=row["created"],
+        tags=tuple(json.loads(row["tags_json"])),
+        snippet=row["snippet"] or "",
+        rank=float(row["rank"]),
+    )
+
+
+def _matched_ids(query: str, plan: QueryPlan) -> tuple[str, list]:
+    """SQL selecting the id of every entry the query matches, in either index."""
+    sql, params = "SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?", [
+        _fts_query(query)
+    ]
+    if plan.substrings:
+        sql += " UNION SELECT rowid FROM entries_trigram WHERE entries_trigram MATCH ?"
+        params.append(plan.substring_query())
+        if plan.words:
+            sql += " AND rowid IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)"
+            params.append(plan.word_query())
+    return sql, params
+
+
+def _listing(
+    conn: sqlite3.Connection,
+    limit: int,
+    filters: SearchFilters,
+    after: tuple[str, int] | None,
+) -> tuple[list[SearchResult], tuple[str, int] | None]:
+    """Filtered entries, newest first, after a (created, id) keyset cursor.
+
+    Walks the ``entries(created, id)`` index from the cursor, so every page
+    costs the same however deep it is.
+    """
+    where, params = filters.sql()
+    if after is not None:
+        where += " AND (e.created, e.id) < (?, ?)"
+        params += [after[0], after[1]]
+    rows = conn.execute(
+        f"""
+        SELECT e.id, e.topic, e.filename, e.created, e.tags_json,
+               '' AS snippet, 0.0 AS rank
+        FROM entries e
+        WHERE 1 {where}
+        ORDER BY e.created DESC, e.id DESC
+        LIMIT ?
+        """,
+        (*params, limit + 1),
+    ).fetchall()
+    results = [_result(row) for row in rows[:limit]]
+    more = len(rows) > limit
+    return results, ((results[-1].created, results[-1].id) if more else None)
+
+
+def _ranked(
+    conn: sqlite3.Connection,
+    query: str,
+    plan: QueryPlan,
+    limit: int,
+    filters: SearchFilters,
+) -> list[SearchResult]:
+    where, params = filters.sql()
+    rows = conn.execute(
+        f"""
+        SELECT e.id, e.topic, e.filename, e.created, e.tags_json,
+               snippet(entries_fts, 2, '[', ']', ' … ', 18) AS snippet,
+               bm25(entries_fts, 6.0, 3.0, 1.0) AS rank
+        FROM entries_fts
+        JOIN entries e ON e.id = entries_fts.rowid
+        WHERE entries_fts MATCH ? {where}
+        ORDER BY rank, e.created DESC
+        LIMIT ?
+        """,
+        (_fts_query(query), *params, limit),
+    ).fetchall()
+    results = [_result(row) for row in rows]
+    if len(results) < limit and plan.substrings:
+        seen = [result.id for result in results]
+        words = plan.word_query()
+        # Short tokens (no trigrams) still narrow the hits as word prefixes.
+        word_filter = (
+            "AND e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)"
+            if words
+            else ""
+        )
         rows = conn.execute(
-            """
+            f"""
             SELECT e.id, e.topic, e.filename, e.created, e.tags_json,
-                   snippet(entries_fts, 3, '[', ']', ' … ', 18) AS snippet,
-                   bm25(entries_fts, 0.0, 6.0, 3.0, 1.0) AS rank
-            FROM entries_fts
-            JOIN entries e ON e.id = CAST(entries_fts.entry_id AS INTEGER)
-            WHERE entries_fts MATCH ?
+                   snippet(entries_trigram, 2, '[', ']', ' … ', 18) AS snippet,
+                   bm25(entries_trigram, 6.0, 3.0, 1.0) AS rank
+            FROM entries_trigram
+            JOIN entries e ON e.id = entries_trigram.rowid
+            WHERE entries_trigram MATCH ?
+              {word_filter}
+              AND e.id NOT IN (SELECT value FROM json_each(?)) {where}
             ORDER BY rank, e.created DESC
             LIMIT ?
             """,
-            (_fts_query(query), max(1, min(limit, 200))),
+            (
+                plan.substring_query(),
+                *([words] if words else []),
+                json.dumps(seen),
+                *params,
+                limit - len(results),
+            ),
         ).fetchall()
-        return [
-            SearchResult(
-                id=row["id"],
-                topic=row["topic"],
-                filename=row["filename"],
-                created=row["created"],
-                tags=tuple(json.loads(row["tags_json"])),
-                snippet=row["snippet"] or "",
-                rank=float(row["rank"]),
-            )
-            for row in rows
-        ]
-    finally:
-        conn.close()
+        results.extend(_result(row) for row in rows)
+    return results
+
+
+def faceted_search(
+    journal_dir: Path,
+    query: str,
+    limit: int = 20,
+    filters: SearchFilters = NO_FILTERS,
+    after: tuple[str, int] | None = None,
+    check: bool = True,
+) -> SearchPage:
+    """Ranked search narrowed by ``filters``, with the total and tag facets.
+
+    Whole-word and prefix hits from the word index come first. When the
+    trigram index exists, entries that contain the tokens only inside
+    longer words ("pars" in "subparsers") follow, so the results cover the
+    same substring matches as the basic search. With filters but no query,
+    the matching entries are listed newest first and can be paged: pass the
+    previous page's ``next_after`` as ``after``. ``facets`` counts the tags
+    of every matching entry (not just this page), read in the same
+    transaction as the results. ``check=False`` skips bringing the database
+    up to date first, for callers that have just done so (see
+    ``substring_candidates``).
+    """
+    query = query.strip()
+    if not query and not filters:
+        return SearchPage([], 0, ())
+    limit = max(1, min(limit, 200))
+    if check:
+        _ensure_current(journal_dir)
+    with _connection(journal_dir) as conn:
+        conn.execute("BEGIN")  # one snapshot for results, total and facets
+        plan = plan_query(query, has_trigram(conn))
+        next_after = None
+        if query:
+            results = _ranked(conn, query, plan, limit, filters)
+        else:
+            results, next_after = _listing(conn, limit, filters, after)
+        where, params = filters.sql()
+        if query:
+            ids_sql, ids_params = _matched_ids(query, plan)
+            where = f" AND e.id IN ({ids_sql}){where}"
+            params = ids_params + params
+        total = conn.execute(
+            f"SELECT count(*) FROM entries e WHERE 1 {where}", params
+        ).fetchone()[0]
+        facets = conn.execute(
+            f"""
+            SELECT t.tag, count(*) AS n
+            FROM entry_tags t JOIN entries e ON e.id = t.entry_id
+            WHERE 1 {where}
+            GROUP BY t.tag
+            ORDER BY n DESC, t.tag
+            LIMIT ?
+            """,
+            (*params, FACET_LIMIT),
+        ).fetchall()
+        conn.commit()
+    return SearchPage(
+        results, total, tuple((row[0], row[1]) for row in facets), next_after
+    )
+
+
+def search(
+    journal_dir: Path,
+    query: str,
+    limit: int = 20,
+    filters: SearchFilters = NO_FILTERS,
+) -> list[SearchResult]:
+    """Ranked full-text search (see ``faceted_search``), results only."""
+    query = query.strip()
+    if not query and not filters:
+        return []
+    limit = max(1, min(limit, 200))
+    _ensure_current(journal_dir)
+    with _connection(journal_dir) as conn:
+        if not query:
+            return _listing(conn, limit, filters, None)[0]
+        return _ranked(conn, query, plan_query(query, has_trigram(conn)), limit, filters)
+
+
+def substring_candidates(
+    journal_dir: Path, needle: str, filters: SearchFilters = NO_FILTERS, check: bool = True
+) -> list[tuple[int, str]]:
+    """Entries whose topic, tags or body may contain ``needle`` (lowercased).
+
+    Returns (id, body) rows that pass ``filters``; the caller confirms each
+    with Python's lower(). A needle of three or more characters is looked up
+    in the trigram index when there is one. Otherwise the scan runs over
+    ``entries`` inside SQLite: an ASCII needle is filtered with
+    lower()/instr() (SQLite only folds ASCII), and any other needle returns
+    every row.
+
+    ``check=False`` skips the ``sync`` that otherwise runs first: journal_search
+    throttles that check itself, and a second full scan per query would undo
+    the throttle.
+    """
+    if check:
+        _ensure_current(journal_dir)
+    where, params = filters.sql()
+    with _connection(journal_dir) as conn:
+        if len(needle) >= TRIGRAM_MIN and has_trigram(conn):
+            rows = conn.execute(
+                f"""
+                SELECT e.id, e.body FROM entries_trigram
+                JOIN entries e ON e.id = entries_trigram.rowid
+                WHERE entries_trigram MATCH ? {where}
+                """,
+                (_quote(needle), *params),
+            ).fetchall()
+        elif needle.isascii():
+            rows = conn.execute(
+                f"""
+                SELECT e.id, e.body FROM entries e
+                WHERE (instr(lower(e.topic), ?) OR instr(lower(e.tags_json), ?)
+                       OR instr(lower(e.body), ?)) {where}
+                """,
+                (needle, needle, needle, *params),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT e.id, e.body FROM entries e WHERE 1 {where}", params
+            ).fetchall()
+        return [(row["id"], row["body"]) for row in rows]
 
 
 def remove_entry(journal_dir: Path, entry_id: int) -> None:
     """Remove one entry from the search database after a delete."""
-    conn = connect(journal_dir)
-    try:
-        initialize(conn)
-        conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
-        conn.execute("DELETE FROM entries_fts WHERE entry_id = ?", (entry_id,))
+    with _connection(journal_dir) as conn:
+        _delete(conn, entry_id)
+        conn.commit()
+
+
+def load_previews(journal_dir: Path, filenames: list[str]) -> dict[str, EntryPreview]:
+    """Stored previews for these entry files (whatever version they were made from)."""
+    found = {}
+    with _connection(journal_dir) as conn:
+        # Stay well under SQLite's bound-parameter limit.
+        for start in range(0, len(filenames), 500):
+            chunk = filenames[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT * FROM previews WHERE filename IN ({marks})", chunk
+            ):
+                found[row["filename"]] = EntryPreview(
+                    row["mtime_ns"],
+                    row["size"],
+                    row["preview"],
+                    row["excerpt"],
+                    row["word_count"],
+                    tuple((name, offset) for name, offset in json.loads(row["sections_json"])),
+                )
+    return found
+
+
+def store_previews(journal_dir: Path, previews: dict[str, EntryPreview]) -> None:
+    """Save previews computed outside a sync (listings, append and edit)."""
+    with _connection(journal_dir) as conn:
+        conn.executemany(
+            _UPSERT_PREVIEW, [_preview_row(name, p) for name, p in previews.items()]
+        )
         conn.commit()
-    finally:
-        conn.close()
 
 
 def update_entry(journal_dir: Path, entry: dict) -> None:
     """Upsert one entry after create/append without rebuilding everything."""
-    conn = connect(journal_dir)
-    try:
-        initialize(conn)
-        filename = str(entry["filename"])
-        path = journal_dir / filename
-        try:
-            body = path.read_text(encoding="utf-8")
-        except OSError:
-            body = ""
-        tags = entry.get("tags") or []
-        entry_id = int(entry["id"])
-        topic = str(entry.get("topic") or "Untitled")
-        tags_json = json.dumps(tags)
-        conn.execute(
-            """
-            INSERT INTO entries(id, topic, filename, created, tags_json, body)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                topic=excluded.topic,
-                filename=excluded.filename,
-                created=excluded.created,
-                tags_json=excluded.tags_json,
-                body=excluded.body
-            """,
-            (
-                entry_id,
-                topic,
-                filename,
-                str(entry.get("created") or ""),
-                tags_json,
-                body,
-            ),
-        )
-        conn.execute("DELETE FROM entries_fts WHERE entry_id = ?", (entry_id,))
-        conn.execute(
-            "INSERT INTO entries_fts(entry_id, topic, tags, body) VALUES (?, ?, ?, ?)",
-            (entry_id, topic, " ".join(str(tag) for tag in tags), body),
-        )
+    update_entries(journal_dir, [entry])
+
+
+def update_entries(journal_dir: Path, entries: list[dict]) -> None:
+    """Upsert several entries in a single transaction (bulk imports)."""
+    with _connection(journal_dir) as conn:
+        for entry in entries:
+            fields = _entry_fields(entry)
+            if fields is not None:
+                _upsert(conn, journal_dir, fields)
         conn.commit()
-    finally:
-        conn.close()
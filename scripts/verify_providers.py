@@ -51,7 +51,7 @@ def main() -> int:
             continue
         try:
             answer = live_answer(
-                "Reply with the single word: OK", pid, keys[pid], timeout=20
+                "Reply with the single word: OK", pid, keys[pid], timeout=20, use_cache=False
             )
             verdict = "PASS " if "OK" in answer.upper() else "PASS?"
             print(f"  {label:9} {verdict} ({model})  ->  {answer.strip()[:40]}")
@@ -19,12 +19,18 @@ Run it:  python3 scripts/web_server.py
 from __future__ import annotations
 
 import getpass
+import gzip
+import hashlib
 import json
 import os
 import re
+import selectors
+import socket
 import sys
 import threading
+import time
 import webbrowser
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
@@ -38,23 +44,42 @@ if str(SCRIPTS_DIR) not in sys.path:
 
 from ai_integration import (  # noqa: E402
     PROVIDERS,
+    answer_cache_stats,
     answer_offline,
+    connection_stats,
     get_active_provider,
     live_answer,
     load_config,
     save_config,
     save_live_answer,
 )
+from answer_cache import normalize_question  # noqa: E402
+from ask_jobs import AskQueue  # noqa: E402
 from auto_append import (  # noqa: E402
     append_to_entry,
     find_entry,
+    find_entry_by_id,
     get_latest_entry,
     update_entry_content,
 )
 from entry_delete import delete_entry  # noqa: E402
+from entry_previews import EMPTY as EMPTY_PREVIEW  # noqa: E402
+from entry_previews import previews  # noqa: E402
 from entry_saver import create_entry, get_journal_dir  # noqa: E402
 from entry_saver import load_index as ensure_index  # noqa: E402
 from journal_cli import search_entries, start_today_entry  # noqa: E402
+from journal_events import ChangeFeed  # noqa: E402
+from journal_index import (  # noqa: E402
+    PageKey,
+    daily_rollup,
+    decode_cursor,
+    encode_cursor,
+    entry_lookup,
+    generation,
+)
+from journal_search import SearchFilters, search_page, tag_facets  # noqa: E402
+from journal_search import cache_stats as search_cache_stats  # noqa: E402
+from worker_pool import Latency, WorkerPool  # noqa: E402
 
 
 def _resolve_web_dir() -> Path:
@@ -95,6 +120,37 @@ CONTENT_TYPES = {
 HEAT_DAYS = 91
 HEAT_LEVELS = 5  # 0..4
 
+# Results per page when /api/search is paged with a cursor but no limit.
+SEARCH_PAGE = 50
+
+# Largest POST body read; bigger ones get 413 and the connection is closed.
+MAX_BODY_BYTES = 1024 * 1024
+
+# How long an idle keep-alive connection is kept open between requests.
+KEEPALIVE_SECONDS = 5
+
+# Pooled server (the default): fixed worker threads and bounded queues, so a
+# burst of requests gets a quick "busy, retry" instead of piling up threads.
+HTTP_WORKERS = 8
+HTTP_QUEUE = 32
+AI_WORKERS = 2  # /api/ask jobs run here, in the background
+AI_QUEUE = 8
+EVENT_STREAMS = 16  # open /api/events streams, each holds a thread
+RETRY_AFTER_SECONDS = 2
+
+# An idle /api/events stream sends a comment this often, so proxies and
+# the browser keep it open and a closed tab is noticed.
+EVENTS_PING_SECONDS = 15
+
+# Static files worth gzipping, and the smallest size where it pays off.
+COMPRESSIBLE = {".html", ".js", ".css", ".svg", ".json"}
+GZIP_MIN_BYTES = 1024
+
+# Files named like "app.3f9c2a1b.js" change name when their content changes,
+# so browsers may keep them for a year without asking again.
+FINGERPRINTED = re.compile(r"\.[0-9a-f]{8,}\.[a-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
 
 # ---------------------------------------------------------------------------
 # Read helpers (presentation only; all journal logic lives in the CLI modules)
@@ -131,32 +187,17 @@ def _entry_preview(entry: dict) -> str:
     Empty template entries (only HTML-comment hints) return "" so the UI can
     show a gentle placeholder instead of markup.
     """
-    try:
-        text = (get_journal_dir() / entry["filename"]).read_text(encoding="utf-8")
-    except OSError:
-        return ""
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
-        # Drop a leading bullet so we can detect placeholders and show clean text.
-        core = line[2:].strip() if line.startswith(("- ", "* ")) else line
-        if not core:
-            continue
-        # Skip headings, metadata, rules, and comment hints.
-        if core.startswith(("#", "<!--", "---", "**", ">")):
-            continue
-        # Skip legacy bracket-style template placeholders, e.g.
-        # "[Add your key insights here]" or task hints like "[ ] Your next step".
-        if core.startswith("[") and core.endswith("]"):
-            continue
-        if core.startswith(("[ ]", "[]")):
-            continue
-        return core if len(core) <= 140 else core[:137] + "..."
-    return ""
+    return _previews([entry]).get(entry.get("filename"), EMPTY_PREVIEW).preview
 
 
-def _entry_summary(entry: dict, today: date | None = None) -> dict:
+def _previews(entries: list[dict]) -> dict:
+    """Cached previews by filename; only changed files are opened."""
+    return previews(get_journal_dir(), entries)
+
+
+def _entry_summary(
+    entry: dict, today: date | None = None, preview: str | None = None
+) -> dict:
     """Shape an index entry for the front-end."""
     created = _parse_created(entry)
     return {
@@ -165,7 +206,7 @@ def _entry_summary(entry: dict, today: date | None = None) -> dict:
         "tags": entry.get("tags", []) or [],
         "created": entry.get("created", ""),
         "when": _relative_when(created, today),
-        "preview": _entry_preview(entry),
+        "preview": _entry_preview(entry) if preview is None else preview,
         "ai_sources": entry.get("ai_sources", []),
     }
 
@@ -176,46 +217,31 @@ def _entry_detail(entry_id: int) -> dict:
     The entries list only carries a one-line preview; this lets the web UI
     open an entry and read everything that was saved (e.g. a full AI answer).
     """
-    today = date.today()
-    for entry in _all_entries_sorted():
-        if entry.get("id") == entry_id:
-            detail = _entry_summary(entry, today)
-            try:
-                detail["body"] = (get_journal_dir() / entry["filename"]).read_text(
-                    encoding="utf-8"
-                )
-            except OSError:
-                detail["body"] = ""
-            return detail
-    raise LookupError("Entry not found")
-
-
-def _entry_excerpt(entry: dict, limit: int = 300) -> str:
-    """A short plain-text excerpt of an entry's real content (no metadata)."""
+    ensure_index()
+    entry = find_entry_by_id(entry_id)
+    if entry is None:
+        raise LookupError("Entry not found")
+    detail = _entry_summary(entry, date.today())
     try:
-        text = (get_journal_dir() / entry["filename"]).read_text(encoding="utf-8")
+        detail["body"] = (get_journal_dir() / entry["filename"]).read_text(
+            encoding="utf-8"
+        )
     except OSError:
-        return ""
-    parts: list[str] = []
-    total = 0
-    for raw in text.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
-        core = line[2:].strip() if line.startswith(("- ", "* ")) else line
-        if not core:
-            continue
-        # Skip headings, metadata, rules, blockquotes, and template placeholders.
-        if core.startswith(("#", "<!--", "---", "**", ">")):
-            continue
-        if core.startswith("[") and core.endswith("]"):
-            continue
-        parts.append(core)
-        total += len(core)
-        if total >= limit:
-            break
-    out = " ".join(parts)
-    return out if len(out) <= limit else out[:limit].rstrip() + "…"
+        detail["body"] = ""
+    return detail
+
+
+def _entry_summaries(entries: list, today: date) -> list[dict]:
+    """Summaries for a page of entries, with their previews looked up at once."""
+    cached = _previews(entries)
+    return [
+        _entry_summary(e, today, cached.get(e.get("filename"), EMPTY_PREVIEW).preview)
+        for e in entries
+    ]
+
+
+# " (2)" added by entry_saver when a topic is reused on the same day.
+_SAME_DAY_SUFFIX = re.compile(r"\s*\(\d+\)$")
 
 
 def _journal_context(
@@ -226,17 +252,28 @@ def _journal_context(
     Combines keyword-relevant entries (via search_entries) with the most recent
     ones, trims each to a short excerpt, and caps the total size so free/low-cost
     providers stay fast. Everything stays local. Returns "" when nothing useful.
+
+    Entries that saved earlier answers to this same question are left out:
+    they are not notes to build on, and since every answer is saved, keeping
+    them would change the context (and miss the answer cache) on each ask.
     """
     chosen: list[dict] = []
     seen: set = set()
+    asked = normalize_question(question)
+
+    def _skip(entry: dict) -> bool:
+        eid = entry.get("id")
+        if eid in seen:
+            return True
+        seen.add(eid)
+        topic = _SAME_DAY_SUFFIX.sub("", entry.get("topic") or "")
+        return normalize_question(topic) == asked
 
     # 1) Relevance: entries that match words in the question.
     try:
         for entry, _snippet in search_entries(question):
-            eid = entry.get("id")
-            if eid in seen:
+            if _skip(entry):
                 continue
-            seen.add(eid)
             chosen.append(entry)
             if len(chosen) >= max_entries:
                 break
@@ -246,17 +283,16 @@ def _journal_context(
     # 2) Recency: fill any remaining slots with the newest entries.
     if len(chosen) < max_entries:
         for entry in _all_entries_sorted():
-            eid = entry.get("id")
-            if eid in seen:
+            if _skip(entry):
                 continue
-            seen.add(eid)
             chosen.append(entry)
             if len(chosen) >= max_entries:
                 break
 
     blocks: list[str] = []
+    cached = _previews(chosen)
     for entry in chosen:
-        excerpt = _entry_excerpt(entry)
+        excerpt = cached.get(entry.get("filename"), EMPTY_PREVIEW).excerpt
         if not excerpt:
             continue
         topic = (entry.get("topic") or "").strip()
@@ -308,48 +344,48 @@ def _display_name() -> tuple[str, bool]:
 
 
 def _all_entries_sorted() -> list[dict]:
-    """All index entries, newest first."""
-    index = ensure_index()
-    return sorted(
-        index.get("entries", []), key=lambda e: e.get("created", ""), reverse=True
-    )
+    """All index entries, newest first (sorted once per index version)."""
+    ensure_index()
+    return entry_lookup(get_journal_dir()).by_created[::-1]
 
 
 def _compute_stats() -> dict:
-    """Streak, activity, heatmap and badges derived from the index."""
+    """Streak, activity, heatmap and badges derived from the index.
+
+    Works from the index's per-day rollup, so the cost depends on the number
+    of days shown (and the streak length), not on the number of entries.
+    """
     index = ensure_index()
-    entries = index.get("entries", [])
+    rollup = daily_rollup(get_journal_dir())
     today = date.today()
 
-    active_days = {_parse_created(e) for e in entries}
+    def count(day: date) -> int:
+        # Entries with an unreadable timestamp count as today's.
+        return rollup.count(day)[0] + (rollup.count(None)[0] if day == today else 0)
 
     # Streak: consecutive days ending today (or yesterday, so you don't lose a
     # streak until a full day is missed).
     cursor = today
-    if cursor not in active_days:
+    if not count(cursor):
         cursor = today - timedelta(days=1)
     streak = 0
-    while cursor in active_days:
+    while count(cursor):
         streak += 1
         cursor -= timedelta(days=1)
 
     # Heatmap counts per day for the last HEAT_DAYS days, oldest -> newest.
-    counts: dict[date, int] = {}
-    for e in entries:
-        d = _parse_created(e)
-        counts[d] = counts.get(d, 0) + 1
-    heat = []
-    start = today - timedelta(days=HEAT_DAYS - 1)
-    for i in range(HEAT_DAYS):
-        d = start + timedelta(days=i)
-        c = counts.get(d, 0)
-        heat.append(min(c, HEAT_LEVELS - 1))
-
-    total = len(entries)
-    asked_guide = any(
-        "starter-guide" in (e.get("tags") or []) or "question" in (e.get("tags") or [])
-        for e in entries
-    )
+    heat = [
+        min(count(day), HEAT_LEVELS - 1)
+        for day, _entries, _ai in rollup.window(today, HEAT_DAYS)
+    ]
+
+    active_days = set(rollup.days)
+    if None in active_days:
+        active_days.discard(None)
+        active_days.add(today)
+    total = len(index.get("entries", []))
+    lookup = entry_lookup(get_journal_dir())
+    asked_guide = bool(lookup.count("starter-guide") or lookup.count("question"))
 
     badges = []
     if total >= 1:
@@ -377,6 +413,232 @@ def _compute_stats() -> dict:
     }
 
 
+def _etag(*parts) -> str:
+    """A strong entity tag for a response built from ``parts``."""
+    return '"' + hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def _file_tag(path: Path) -> tuple | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _index_etag(*parts) -> str:
+    """ETag for a response derived from the index (and today's date).
+
+    The index generation changes on every create, append, edit and delete,
+    so this is known without building the response.
+    """
+    ensure_index()
+    return _etag(generation(get_journal_dir()), date.today().isoformat(), *parts)
+
+
+def _stats_etag() -> str:
+    return _index_etag(
+        "stats", _file_tag(_profile_path()), os.getenv("AI_JOURNAL_NAME") or ""
+    )
+
+
+def _entries_etag(query: dict) -> str:
+    """ETag for /api/entries, which also carries previews of the listed files."""
+    page, _next_key, _total = _entries_page(query)
+    journal_dir = get_journal_dir()
+    files = [_file_tag(journal_dir / entry["filename"]) for entry in page]
+    return _index_etag("entries", sorted(query.items()), files)
+
+
+def _entry_etag(entry_id: int) -> str | None:
+    """ETag for /api/entry, which also depends on the entry file itself."""
+    ensure_index()
+    entry = entry_lookup(get_journal_dir()).by_id.get(entry_id)
+    if entry is None:
+        return None
+    return _index_etag("entry", entry_id, _file_tag(get_journal_dir() / entry["filename"]))
+
+
+@dataclass(frozen=True)
+class _StaticAsset:
+    """One web/ file held in memory, with its gzip variant when it helps."""
+
+    state: tuple
+    content_type: str
+    data: bytes
+    gzipped: bytes | None
+    etag: str
+    cache_control: str
+
+
+_static_assets: dict[str, _StaticAsset] = {}
+_static_lock = threading.Lock()
+
+
+def _load_static(rel: str, target: Path, state: tuple) -> _StaticAsset:
+    data = target.read_bytes()
+    suffix = target.suffix.lower()
+    gzipped = None
+    if suffix in COMPRESSIBLE and len(data) >= GZIP_MIN_BYTES:
+        packed = gzip.compress(data, compresslevel=9, mtime=0)
+        gzipped = packed if len(packed) < len(data) else None
+    return _StaticAsset(
+        state,
+        CONTENT_TYPES.get(suffix, "application/octet-stream"),
+        data,
+        gzipped,
+        _etag("static", rel, state),
+        IMMUTABLE if FINGERPRINTED.search(rel) else "no-cache",
+    )
+
+
+def _static_asset(rel: str) -> _StaticAsset | None:
+    """The cached asset for a web/ path, re-read only when its file changes.
+
+    Returns None for anything outside web/ or missing; raises
+    PermissionError for paths that escape the web directory. Assets are
+    cached (and tagged) by their resolved path, so aliases such as
+    "./index.html" share one entry.
+    """
+    root = WEB_DIR.resolve()
+    target = (root / rel).resolve()
+    # Prevent path traversal outside the web directory.
+    if root not in target.parents and target != root:
+        raise PermissionError(rel)
+    state = _file_tag(target) if target.is_file() else None
+    if state is None:
+        return None
+    name = target.relative_to(root).as_posix()
+    with _static_lock:
+        asset = _static_assets.get(name)
+    if asset is None or asset.state != state:
+        asset = _load_static(name, target, state)
+        with _static_lock:
+            _static_assets[name] = asset
+    return asset
+
+
+def _preload_static() -> None:
+    """Read and compress every web/ asset up front (server start)."""
+    for path in WEB_DIR.rglob("*"):
+        if path.is_file() and not path.name.startswith("."):
+            try:
+                _static_asset(path.relative_to(WEB_DIR).as_posix())
+            except OSError:
+                pass
+
+
+def _accepts_gzip(header: str | None) -> bool:
+    """True when an Accept-Encoding header allows gzip (and not with q=0)."""
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            q = params.strip().lower()
+            try:
+                return not (q.startswith("q=") and float(q[2:]) == 0)
+            except ValueError:
+                return False
+    return False
+
+
+def _sse(seq: int, event: str, data: dict) -> str:
+    """One server-sent event."""
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _param(query: dict, name: str) -> str | None:
+    return (query.get(name) or [None])[0]
+
+
+def _limit_param(query: dict) -> int | None:
+    """The ``limit`` query parameter; None when absent or not a number."""
+    try:
+        return max(1, int(_param(query, "limit")))
+    except (TypeError, ValueError):
+        return None
+
+
+def _cursor_param(query: dict):
+    cursor = _param(query, "cursor")
+    return decode_cursor(cursor) if cursor else None
+
+
+def _list_entries(query: dict) -> dict:
+    """/api/entries: newest first; ?limit=N&cursor=...&tag=... pages through.
+
+    The page is cut from the index's (created, id) ordering before anything
+    is summarized, so only the returned entries have their files opened for
+    a preview, however large the journal is. ``total`` counts every entry
+    (with the tag, if one was given).
+    """
+    page, next_key, total = _entries_page(query)
+    return {
+        "entries": _entry_summaries(page, date.today()),
+        "total": total,
+        "next_cursor": encode_cursor(next_key) if next_key else None,
+    }
+
+
+def _entries_page(query: dict) -> tuple[list[dict], PageKey | None, int]:
+    """(entries, next page key, total) for an /api/entries query."""
+    ensure_index()
+    lookup = entry_lookup(get_journal_dir())
+    tag = _param(query, "tag")
+    limit = _limit_param(query) or max(1, lookup.count(tag))
+    page, next_key = lookup.page(_cursor_param(query), limit, tag)
+    return page, next_key, lookup.count(tag)
+
+
+def _search(query: dict) -> dict:
+    """/api/search: ?q=...&tag=...&tag=...&since=YYYY-MM-DD&until=...&source=...
+
+    With ``limit`` (and then ``cursor``) the results come a page at a time;
+    ``total`` counts every match and ``facets`` is sent with the first page.
+    """
+    ensure_index()
+    q = _param(query, "q") or ""
+    filters = SearchFilters.of(
+        tags=query.get("tag"),
+        since=_param(query, "since"),
+        until=_param(query, "until"),
+        ai_source=_param(query, "source"),
+    )
+    after = _cursor_param(query)
+    limit = _limit_param(query)
+    if limit is None and after is None:
+        matches = page = search_entries(q, filters)
+        next_key = None
+    else:
+        page, next_key, matches = search_page(q, filters, after, limit or SEARCH_PAGE)
+    today = date.today()
+    results = []
+    summaries = _entry_summaries([entry for entry, _snippet in page], today)
+    for item, (_entry, snippet) in zip(summaries, page):
+        if snippet:
+            item["snippet"] = snippet
+        results.append(item)
+    body = {
+        "query": q,
+        "entries": results,
+        "total": len(matches),
+        "next_cursor": encode_cursor(next_key) if next_key else None,
+    }
+    if after is None:
+        body["facets"] = [{"tag": t, "count": n} for t, n in tag_facets(matches)]
+    return body
+
+
+def _metrics(server: JournalServer) -> dict:
+    """Process counters for troubleshooting (cache effectiveness, load)."""
+    return {
+        "search_cache": search_cache_stats(),
+        "requests": server.request_latency.stats(),
+        "pools": server.pool_stats(),
+        "provider_connections": connection_stats(),
+        "answer_cache": answer_cache_stats(),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Write helpers (delegate straight to the reused CLI functions)
 # ---------------------------------------------------------------------------
@@ -492,7 +754,9 @@ def _set_ai_key(payload: dict) -> dict:
         raise ValueError("Paste your API key.")
     # Validate the key with a tiny live call so bad keys are caught immediately.
     try:
-        live_answer("Reply with the single word: OK", provider, api_key, timeout=20)
+        live_answer(
+            "Reply with the single word: OK", provider, api_key, timeout=20, use_cache=False
+        )
     except RuntimeError as exc:
         raise ValueError(str(exc))
     cfg = load_config()
@@ -512,7 +776,25 @@ def _disconnect_ai(_payload: dict) -> dict:
     return _ai_status()
 
 
-def _ask(payload: dict) -> dict:
+def _start_ask(queue: AskQueue, payload: dict):
+    """/api/ask: queue the question and return its job (None when busy).
+
+    The answer is fetched from /api/ask/<id>, or streamed from
+    /api/ask/<id>/stream as it is written. The same question asked again
+    while it is still being answered joins the job already running.
+    """
+    if not (payload.get("question") or "").strip():
+        raise ValueError("Type a question first.")
+    return queue.submit(payload)
+
+
+def _ask(payload: dict, on_chunk=None) -> dict:
+    """Answer one question (runs as a background job; see _start_ask).
+
+    A live answer is streamed: ``on_chunk`` gets each piece as it arrives
+    (relayed by /api/ask/<id>/stream), and the whole answer is saved to the
+    journal once the provider has finished.
+    """
     question = (payload.get("question") or "").strip()
     if not question:
         raise ValueError("Type a question first.")
@@ -523,7 +805,7 @@ def _ask(payload: dict) -> dict:
         pid, key, model = prov
         context = _journal_context(question) if use_journal else ""
         try:
-            answer = live_answer(question, pid, key, model, context=context)
+            answer = live_answer(question, pid, key, model, context=context, on_chunk=on_chunk)
             label = save_live_answer(question, answer, pid)
             return {
                 "ok": True,
@@ -570,20 +852,123 @@ def _ask(payload: dict) -> dict:
 
 class JournalHandler(BaseHTTPRequestHandler):
     server_version = "AIJournalWeb/1.0"
+    # Keep connections open between requests; every response sets
+    # Content-Length so the browser knows where each one ends.
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_SECONDS
 
     # --- small helpers -----------------------------------------------------
 
-    def _send_json(self, obj, status=200):
+    def _send_json(self, obj, status=200, etag=None, headers=None):
         body = json.dumps(obj).encode("utf-8")
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
-        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if etag:
+            # Cacheable, but revalidated on every use.
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        else:
+            self.send_header("Cache-Control", "no-store")
         self.end_headers()
         self.wfile.write(body)
 
-    def _read_json(self) -> dict:
-        length = int(self.headers.get("Content-Length") or 0)
+    def _not_modified(self, etag, cache_control="no-cache", headers=None) -> bool:
+        """Answer 304 when the client's copy (If-None-Match) is current."""
+        tags = self.headers.get("If-None-Match")
+        if not etag or not tags:
+            return False
+        if tags.strip() != "*" and etag not in [t.strip() for t in tags.split(",")]:
+            return False
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        return True
+
+    def _send_busy(self):
+        return self._send_json(
+            {"error": "The journal is busy. Please try again in a moment."},
+            503,
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+    def _run_slow(self, kind, work):
+        """Finish this request on the server's ``kind`` pool (see run_slow)."""
+        if not self.server.run_slow(kind, self, work):
+            return self._send_busy()
+        return None
+
+    # --- keep-alive, timing and hand-off hooks -----------------------------
+
+    def parse_request(self):
+        self.started = time.monotonic()
+        return super().parse_request()
+
+    parked = False  # set when an idle connection goes back to the server
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if self.server.parks_idle:
+                try:
+                    waiting = self._request_waiting()
+                except OSError:
+                    return
+                if not waiting:
+                    # Wait for the next request without holding this thread.
+                    self.parked = True
+                    return
+            self.handle_one_request()
+
+    def _request_waiting(self) -> bool:
+        """True when the next request has already arrived (never blocks)."""
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def handle_one_request(self):
+        self.started = None
+        super().handle_one_request()
+        if self.detached:
+            self.released.set()
+        elif self.started is not None:
+            self.server.request_latency.record(time.monotonic() - self.started)
+
+    def end_headers(self):
+        # Let go of kept-alive connections while others wait for a worker.
+        if not self.close_connection and self.server.crowded():
+            self.send_header("Connection", "close")
+        super().end_headers()
+
+    detached = False  # set when another pool's thread finishes the request
+
+    def finish(self):
+        if not self.detached:
+            super().finish()
+
+    def _send_cached(self, etag, build):
+        """Send ``build()`` with an ETag, or 304 without building it."""
+        if self._not_modified(etag):
+            return None
+        return self._send_json(build(), etag=etag)
+
+    def _reject(self, message, status):
+        """Answer an error without reading the request body, then hang up.
+
+        The unread body would otherwise be taken for the next request on a
+        kept-alive connection.
+        """
+        return self._send_json({"error": message}, status, headers={"Connection": "close"})
+
+    def _read_json(self, length: int) -> dict:
         if not length:
             return {}
         raw = self.rfile.read(length)
@@ -612,6 +997,14 @@ class JournalHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         parsed = urlparse(self.path)
         path = parsed.path
+        if path == "/api/events":
+            query = parse_qs(parsed.query)
+            return self._run_slow("events", lambda: self._stream_events(query))
+        if path.startswith("/api/ask/") and path.endswith("/stream"):
+            job = self.server.ask_queue.get(path[len("/api/ask/"):-len("/stream")])
+            if job is None:
+                return self._send_json({"error": "No such question"}, 404)
+            return self._run_slow("events", lambda: self._stream_answer(job))
         if path.startswith("/api/"):
             return self._handle_api_get(path, parse_qs(parsed.query))
         return self._serve_static(path)
@@ -619,10 +1012,18 @@ class JournalHandler(BaseHTTPRequestHandler):
     def do_POST(self):
         parsed = urlparse(self.path)
         if not parsed.path.startswith("/api/"):
-            return self._send_json({"error": "Not found"}, 404)
+            return self._reject("Not found", 404)
         if not self._same_origin():
-            return self._send_json({"error": "Cross-origin request blocked"}, 403)
-        payload = self._read_json()
+            return self._reject("Cross-origin request blocked", 403)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._reject("Bad Content-Length", 400)
+        if length > MAX_BODY_BYTES:
+            return self._reject("Request body too large", 413)
+        payload = self._read_json(length)
         try:
             if parsed.path == "/api/entries":
                 return self._send_json(_create_entry(payload))
@@ -633,7 +1034,10 @@ class JournalHandler(BaseHTTPRequestHandler):
             if parsed.path == "/api/entry/update":
                 return self._send_json(_update_entry(payload))
             if parsed.path == "/api/ask":
-                return self._send_json(_ask(payload))
+                job = _start_ask(self.server.ask_queue, payload)
+                if job is None:
+                    return self._send_busy()
+                return self._send_json(job.to_json(), 202)
             if parsed.path == "/api/profile":
                 return self._send_json(_set_profile(payload))
             if parsed.path == "/api/ai/key":
@@ -653,22 +1057,16 @@ class JournalHandler(BaseHTTPRequestHandler):
             if path == "/api/health":
                 return self._send_json({"ok": True})
             if path == "/api/stats":
-                return self._send_json(_compute_stats())
+                return self._send_cached(_stats_etag(), _compute_stats)
+            if path == "/api/metrics":
+                return self._send_json(_metrics(self.server))
             if path == "/api/profile":
                 name, name_set = _display_name()
                 return self._send_json({"name": name, "name_set": name_set})
             if path == "/api/ai/status":
                 return self._send_json(_ai_status())
             if path == "/api/entries":
-                today = date.today()
-                limit_vals = query.get("limit")
-                entries = [_entry_summary(e, today) for e in _all_entries_sorted()]
-                if limit_vals:
-                    try:
-                        entries = entries[: int(limit_vals[0])]
-                    except ValueError:
-                        pass
-                return self._send_json({"entries": entries})
+                return self._send_cached(_entries_etag(query), lambda: _list_entries(query))
             if path == "/api/entry":
                 id_vals = query.get("id")
                 if not id_vals:
@@ -678,36 +1076,123 @@ class JournalHandler(BaseHTTPRequestHandler):
                 except (TypeError, ValueError):
                     return self._send_json({"error": "Invalid entry id"}, 400)
                 try:
-                    return self._send_json(_entry_detail(entry_id))
+                    return self._send_cached(
+                        _entry_etag(entry_id), lambda: _entry_detail(entry_id)
+                    )
                 except LookupError as exc:
                     return self._send_json({"error": str(exc)}, 404)
             if path == "/api/search":
-                q = (query.get("q") or [""])[0]
-                today = date.today()
-                results = []
-                for entry, snippet in search_entries(q):
-                    item = _entry_summary(entry, today)
-                    if snippet:
-                        item["snippet"] = snippet
-                    results.append(item)
-                return self._send_json({"query": q, "entries": results})
+                return self._send_json(_search(query))
+            if path.startswith("/api/ask/"):
+                job = self.server.ask_queue.get(path[len("/api/ask/"):])
+                if job is None:
+                    return self._send_json({"error": "No such question"}, 404)
+                return self._send_json(job.to_json())
+        except ValueError as exc:
+            return self._send_json({"error": str(exc)}, 400)
         except Exception as exc:  # pragma: no cover - defensive
             return self._send_json({"error": f"Something went wrong: {exc}"}, 500)
         return self._send_json({"error": "Not found"}, 404)
 
+    def _stream_events(self, query):
+        """/api/events: a server-sent event per journal change, until closed.
+
+        Each event names the change (created / updated / deleted /
+        reindexed), the entry ids and the new index generation. A browser
+        that reconnects sends Last-Event-ID and gets what it missed, or a
+        ``reset`` event when that is no longer available.
+        """
+        feed = self.server.change_feed
+        try:
+            after = int(self.headers.get("Last-Event-ID") or _param(query, "after"))
+        except (TypeError, ValueError):
+            after = feed.last_seq
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            self.wfile.flush()
+            while not feed.stopped:
+                events = feed.wait(after, EVENTS_PING_SECONDS)
+                if events is None:
+                    after = feed.last_seq
+                    chunk = _sse(after, "reset", {"type": "reset", "generation": feed.generation})
+                elif events:
+                    after = events[-1].seq
+                    chunk = "".join(_sse(e.seq, e.kind, e.to_json()) for e in events)
+                else:
+                    chunk = ": ping\n\n"
+                self.wfile.write(chunk.encode("utf-8"))
+                self.wfile.flush()
+        except OSError:
+            pass  # the browser went away
+
+    def _stream_answer(self, job):
+        """/api/ask/<id>/stream: the answer as server-sent events while it is written.
+
+        A ``chunk`` event carries each new piece of text (its id is the
+        length of the answer so far, so a reconnect resumes where it left
+        off) and a final ``done`` event carries the finished job.
+        """
+        queue = self.server.ask_queue
+        try:
+            offset = int(self.headers.get("Last-Event-ID") or 0)
+        except ValueError:
+            offset = 0
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            finished = False
+            while not finished:
+                text, finished = queue.wait(job, offset, EVENTS_PING_SECONDS)
+                if text:
+                    offset += len(text)
+                    chunk = _sse(offset, "chunk", {"text": text})
+                elif not finished:
+                    chunk = ": ping\n\n"
+                else:
+                    chunk = ""
+                if finished:
+                    chunk += _sse(offset, "done", job.to_json())
+                self.wfile.write(chunk.encode("utf-8"))
+                self.wfile.flush()
+        except OSError:
+            pass  # the browser went away; the job carries on
+
     def _serve_static(self, path):
         rel = "index.html" if path in ("", "/") else path.lstrip("/")
-        target = (WEB_DIR / rel).resolve()
-        # Prevent path traversal outside the web directory.
-        if WEB_DIR not in target.parents and target != WEB_DIR:
+        try:
+            asset = _static_asset(rel)
+        except PermissionError:
             return self._send_json({"error": "Forbidden"}, 403)
-        if not target.is_file():
+        if asset is None:
             return self._send_json({"error": "Not found"}, 404)
-        data = target.read_bytes()
-        ctype = CONTENT_TYPES.get(target.suffix.lower(), "application/octet-stream")
+        data, etag = asset.data, asset.etag
+        if asset.gzipped is not None and _accepts_gzip(self.headers.get("Accept-Encoding")):
+            # Each encoding is a different representation: give it its own tag.
+            data, etag = asset.gzipped, etag[:-1] + '-gz"'
+        vary = {"Vary": "Accept-Encoding"} if asset.gzipped is not None else {}
+        if self._not_modified(etag, asset.cache_control, vary):
+            return None
         self.send_response(200)
-        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Type", asset.content_type)
         self.send_header("Content-Length", str(len(data)))
+        if data is asset.gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in vary.items():
+            self.send_header(name, value)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", asset.cache_control)
         self.end_headers()
         self.wfile.write(data)
 
@@ -717,10 +1202,244 @@ class JournalHandler(BaseHTTPRequestHandler):
 # ---------------------------------------------------------------------------
 
 
-def make_server(port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
-    """Create (but do not start) the threaded server. port=0 picks a free port."""
+class JournalServer(ThreadingHTTPServer):
+    """The threaded server plus the journal's change feed (for /api/events).
+
+    A thread per connection, with no limit; ``PooledJournalServer`` is the
+    bounded version ``make_server`` uses by default.
+    """
+
+    def __init__(self, address, handler, change_feed: ChangeFeed):
+        self.change_feed = change_feed
+        self.request_latency = Latency()
+        pool = WorkerPool("ai", AI_WORKERS, AI_QUEUE)
+        self.ask_queue = AskQueue(lambda payload, on_chunk: _ask(payload, on_chunk), pool)
+        try:
+            super().__init__(address, handler)
+        except OSError:
+            self.ask_queue.pool.shutdown()
+            raise
+
+    def run_slow(self, kind: str, handler: JournalHandler, work) -> bool:
+        """Run a slow request's ``work``; here simply on the current thread."""
+        work()
+        return True
+
+    parks_idle = False  # idle connections keep their thread between requests
+
+    def crowded(self) -> bool:
+        return False
+
+    def pool_stats(self) -> dict:
+        return {"ai": self.ask_queue.stats()}
+
+    def server_close(self):
+        self.change_feed.stop()
+        self.ask_queue.pool.shutdown()
+        super().server_close()
+
+
+class PooledJournalServer(JournalServer):
+    """Serves connections on a fixed pool of worker threads.
+
+    Accepted connections wait in a bounded queue; when it is full the client
+    gets ``503`` with ``Retry-After`` at once. Between requests, kept-alive
+    connections wait on a selector thread rather than a worker, and go back
+    in the queue when their next request arrives, so an idle browser holds
+    no worker. ``/api/events`` streams are handed to their own pool part-way
+    through the request, and questions run as background jobs on the AI
+    pool, so long-lived streams and slow provider calls never tie up the
+    workers that serve everything else.
+    """
+
+    parks_idle = True
+
+    def __init__(
+        self,
+        address,
+        handler,
+        change_feed: ChangeFeed,
+        workers: int = HTTP_WORKERS,
+        queue_size: int = HTTP_QUEUE,
+    ):
+        self.pools = {
+            "http": WorkerPool("http", workers, queue_size),
+            "events": WorkerPool("events", EVENT_STREAMS, 0),
+        }
+        # Idle kept-alive connections and 503 replies, on one selector thread.
+        self._idle = selectors.DefaultSelector()
+        self._idle_wake, self._idle_waker = socket.socketpair()
+        self._idle_wake.setblocking(False)
+        self._idle_waker.setblocking(False)
+        self._idle.register(self._idle_wake, selectors.EVENT_READ)
+        self._idle_pending: list[tuple] = []
+        self._idle_lock = threading.Lock()
+        self._idle_closed = False
+        self._idle_thread = threading.Thread(
+            target=self._watch_idle, name="http-idle", daemon=True
+        )
+        self._idle_thread.start()
+        try:
+            super().__init__(address, handler, change_feed)
+        except OSError:
+            self._stop_pools()
+            raise
+
+    def process_request(self, request, client_address):
+        if not self.pools["http"].submit(lambda: self._serve(request, client_address)):
+            self._refuse(request, client_address)
+
+    def _serve(self, request, client_address):
+        handler = None
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+        if handler is not None and handler.parked:
+            self._watch(request, client_address, selectors.EVENT_READ, None)
+        elif handler is None or not handler.detached:
+            self.shutdown_request(request)
+
+    def _refuse(self, request, client_address):
+        """Answer 503 from the idle thread, so a slow client cannot stall accept()."""
+        body = json.dumps({"error": "The journal is busy. Please try again in a moment."})
+        head = (
+            "HTTP/1.1 503 Service Unavailable\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Retry-After: {RETRY_AFTER_SECONDS}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        self._watch(request, client_address, selectors.EVENT_WRITE, (head + body).encode("utf-8"))
+
+    def _watch(self, request, client_address, events, reply):
+        """Hand ``request`` to the idle thread: to wait for a request, or to get ``reply``."""
+        with self._idle_lock:
+            if not self._idle_closed:
+                self._idle_pending.append((request, client_address, events, reply))
+                request = None
+        if request is not None:
+            self.shutdown_request(request)
+            return
+        try:
+            self._idle_waker.send(b"\0")
+        except OSError:
+            pass  # already awake: a wake-up byte is waiting
+
+    def _watch_idle(self):
+        while True:
+            ready = self._idle.select(1.0)
+            now = time.monotonic()
+            with self._idle_lock:
+                pending, self._idle_pending = self._idle_pending, []
+                closed = self._idle_closed
+            if closed:
+                break
+            for key, _events in ready:
+                if key.fileobj is self._idle_wake:
+                    try:
+                        self._idle_wake.recv(4096)
+                    except OSError:
+                        pass
+                    continue
+                self._idle.unregister(key.fileobj)
+                client_address, _since, reply = key.data
+                if reply is None:
+                    # The next request has arrived: back in the queue with it.
+                    self.process_request(key.fileobj, client_address)
+                    continue
+                try:
+                    key.fileobj.send(reply)
+                except OSError:
+                    pass
+                self.shutdown_request(key.fileobj)
+            for request, client_address, events, reply in pending:
+                try:
+                    if reply is not None:
+                        request.setblocking(False)
+                    self._idle.register(request, events, (client_address, now, reply))
+                except (OSError, ValueError):  # closed by the client meanwhile
+                    self.shutdown_request(request)
+            for key in list(self._idle.get_map().values()):
+                if key.data is not None and now - key.data[1] > KEEPALIVE_SECONDS:
+                    self._idle.unregister(key.fileobj)
+                    self.shutdown_request(key.fileobj)
+        for key in list(self._idle.get_map().values()):
+            if key.data is not None:
+                self.shutdown_request(key.fileobj)
+        for request, *_rest in pending:
+            self.shutdown_request(request)
+        self._idle.close()
+        self._idle_wake.close()
+        self._idle_waker.close()
+
+    def run_slow(self, kind: str, handler: JournalHandler, work) -> bool:
+        """Hand the rest of a request to the ``kind`` pool; False when it is full.
+
+        The handler is marked detached, so the HTTP worker returns without
+        closing the connection; the pool thread closes it when done.
+        """
+        request = handler.request
+
+        def job():
+            try:
+                work()
+            except Exception:
+                self.handle_error(request, handler.client_address)
+            finally:
+                # Close only once the HTTP worker has let go of the handler.
+                handler.released.wait(KEEPALIVE_SECONDS)
+                try:
+                    super(JournalHandler, handler).finish()
+                except OSError:
+                    pass
+                self.shutdown_request(request)
+
+        handler.released = threading.Event()
+        handler.detached = True
+        handler.close_connection = True
+        if not self.pools[kind].submit(job):
+            handler.detached = False
+            return False
+        return True
+
+    def crowded(self) -> bool:
+        return self.pools["http"].crowded()
+
+    def pool_stats(self) -> dict:
+        stats = {name: pool.stats() for name, pool in self.pools.items()}
+        return {**stats, **super().pool_stats()}
+
+    def _stop_pools(self):
+        with self._idle_lock:
+            self._idle_closed = True
+        try:
+            self._idle_waker.send(b"\0")
+        except OSError:
+            pass
+        self._idle_thread.join(5)
+        for pool in self.pools.values():
+            pool.shutdown()
+
+    def server_close(self):
+        super().server_close()
+        self._stop_pools()
+
+
+def make_server(port: int = DEFAULT_PORT, pooled: bool = True) -> JournalServer:
+    """Create (but do not start) the server. port=0 picks a free port.
+
+    ``pooled=False`` gives the old thread-per-connection server.
+    """
     ensure_index()  # make sure the journal + index exist before serving
-    return ThreadingHTTPServer((HOST, port), JournalHandler)
+    _preload_static()
+    feed = ChangeFeed(get_journal_dir()).start()
+    server_class = PooledJournalServer if pooled else JournalServer
+    try:
+        return server_class((HOST, port), JournalHandler, feed)
+    except OSError:
+        feed.stop()
+        raise
 
 
 def run(port: int = DEFAULT_PORT, open_browser: bool = True) -> None:
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Fixed-size thread pools with a bounded queue, for the local web server.
+
+``ThreadingHTTPServer`` starts a thread per connection with no upper bound,
+so a burst of requests (or a few slow AI calls) can pile up threads on a
+2-core laptop. A ``WorkerPool`` runs jobs on a fixed number of threads and
+queues at most ``queue_size`` more; ``submit`` returns False beyond that, so
+the caller can answer "busy, retry" straight away instead of stalling.
+
+Each pool reports its queue depth, how long jobs waited for a thread and how
+long they ran (``stats``). ``Latency`` is the small rolling summary used for
+those timings and for per-request latency.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+SAMPLES = 512  # recent timings kept for the percentile
+
+
+class Latency:
+    """Count, mean, 95th percentile and max of recent durations (milliseconds)."""
+
+    def __init__(self, samples: int = SAMPLES):
+        self.recent: deque[float] = deque(maxlen=samples)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000
+        with self.lock:
+            self.recent.append(ms)
+            self.count += 1
+            self.total += ms
+            self.max = max(self.max, ms)
+
+    def stats(self) -> dict:
+        with self.lock:
+            recent = sorted(self.recent)
+            count, total, peak = self.count, self.total, self.max
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "count": count,
+            "avg_ms": round(total / count, 2) if count else 0.0,
+            "p95_ms": round(p95, 2),
+            "max_ms": round(peak, 2),
+        }
+
+
+class WorkerPool:
+    """``workers`` threads running submitted jobs, at most ``queue_size`` waiting."""
+
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs: deque[tuple[float, Callable[[], None]]] = deque()
+        self.ready = threading.Condition()
+        self.busy = 0
+        self.rejected = 0
+        self.closed = False
+        self.waited = Latency()
+        self.ran = Latency()
+        self.threads = [
+            threading.Thread(target=self._work, name=f"{name}-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, job: Callable[[], None]) -> bool:
+        """Queue ``job``; False (and nothing queued) when the pool is full."""
+        with self.ready:
+            idle = self.workers - self.busy - len(self.jobs)
+            if self.closed or (idle <= 0 and len(self.jobs) >= self.queue_size):
+                self.rejected += 1
+                return False
+            self.jobs.append((time.monotonic(), job))
+            self.ready.notify()
+            return True
+
+    def crowded(self) -> bool:
+        """True while jobs are waiting for a thread."""
+        return bool(self.jobs)
+
+    def _work(self) -> None:
+        while True:
+            with self.ready:
+                self.ready.wait_for(lambda: self.jobs or self.closed)
+                if not self.jobs:
+                    return
+                queued_at, job = self.jobs.popleft()
+                self.busy += 1
+            started = time.monotonic()
+            self.waited.record(started - queued_at)
+            try:
+                job()
+            except Exception:
+                pass  # a job reports its own errors; keep the thread alive
+            finally:
+                self.ran.record(time.monotonic() - started)
+                with self.ready:
+                    self.busy -= 1
+
+    def stats(self) -> dict:
+        with self.ready:
+            busy, queued, rejected = self.busy, len(self.jobs), self.rejected
+        return {
+            "workers": self.workers,
+            "busy": busy,
+            "queued": queued,
+            "queue_limit": self.queue_size,
+            "rejected": rejected,
+            "wait": self.waited.stats(),
+            "run": self.ran.stats(),
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop taking jobs; threads exit once the queue is drained."""
+        with self.ready:
+            self.closed = True
+            self.ready.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
@@ -0,0 +1,61 @@
+import answer_cache
+from answer_cache import AnswerCache, cache_key, normalize_question
+
+
+def test_key_covers_everything_that_shapes_the_answer():
+    base = ("groq", "m1", "prompt", "What is Git?", "")
+    assert normalize_question("  What   is GIT?? ") == "what is git"
+    assert cache_key(*base) == cache_key("groq", "m1", "prompt", "what is git", "")
+    for changed in (
+        ("gemini", "m1", "prompt", "What is Git?", ""),
+        ("groq", "m2", "prompt", "What is Git?", ""),
+        ("groq", "m1", "new prompt", "What is Git?", ""),
+        ("groq", "m1", "prompt", "What is GitHub?", ""),
+        ("groq", "m1", "prompt", "What is Git?", "my notes"),
+    ):
+        assert cache_key(*changed) != cache_key(*base)
+
+
+def test_hits_misses_and_lru_eviction(tmp_path):
+    cache = AnswerCache(tmp_path / "answers.sqlite3", max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # now more recently used than "b"
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 2, 2)
+    assert stats["hit_rate"] == 0.6
+
+    # Another process (or a restart) sees the same answers.
+    assert AnswerCache(tmp_path / "answers.sqlite3").get("a") == "A"
+
+
+def test_entries_expire(tmp_path, monkeypatch):
+    cache = AnswerCache(tmp_path / "answers.sqlite3", ttl_seconds=60)
+    now = 1_000_000.0
+    monkeypatch.setattr(answer_cache.time, "time", lambda: now)
+    cache.put("a", "A")
+    now += 61
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_unusable_cache_file_is_a_miss(tmp_path):
+    path = tmp_path / "answers.sqlite3"
+    path.write_text("not a database", encoding="utf-8")
+    cache = AnswerCache(path)
+    cache.put("a", "A")
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_mode_from_environment(monkeypatch):
+    monkeypatch.delenv("AI_JOURNAL_ANSWER_CACHE", raising=False)
+    assert answer_cache.mode() == "on"
+    monkeypatch.setenv("AI_JOURNAL_ANSWER_CACHE", "Only")
+    assert answer_cache.mode() == "only"
+    monkeypatch.setenv("AI_JOURNAL_ANSWER_CACHE", "sometimes")
+    assert answer_cache.mode() == "on"
@@ -0,0 +1,84 @@
+import threading
+
+import ask_jobs
+from ask_jobs import AskQueue, question_key
+from worker_pool import WorkerPool
+
+
+def test_question_key_ignores_case_and_spacing():
+    assert question_key({"question": " What  is\tGit? "}) == ("what is git?", True)
+    assert question_key({"question": "what is git?", "use_journal": False}) != question_key(
+        {"question": "what is git?"}
+    )
+
+
+def test_jobs_dedupe_finish_and_report_errors():
+    gate = threading.Event()
+    calls = []
+
+    def answer(payload, on_chunk):
+        calls.append(payload["question"])
+        gate.wait(5)
+        if payload["question"] == "bad":
+            raise ValueError("No answer.")
+        return {"answer": payload["question"]}
+
+    queue = AskQueue(answer, WorkerPool("test-ai", workers=2, queue_size=0))
+    try:
+        job = queue.submit({"question": "What is git?"})
+        assert queue.submit({"question": "what is GIT?"}) is job
+        bad = queue.submit({"question": "bad"})
+        assert queue.submit({"question": "a third one"}) is None  # pool full
+        stats = queue.stats()
+        assert (stats["in_flight"], stats["deduped"], stats["rejected"]) == (2, 1, 1)
+        gate.set()
+    finally:
+        queue.pool.shutdown(wait=True)
+
+    assert calls.count("What is git?") == 1
+    assert queue.get(job.id).to_json() == {
+        "id": job.id,
+        "status": "done",
+        "result": {"answer": "What is git?"},
+    }
+    assert queue.get(bad.id).to_json() == {"id": bad.id, "status": "error", "error": "No answer."}
+    assert queue.stats()["in_flight"] == 0
+
+
+def test_finished_jobs_are_pruned(monkeypatch):
+    monkeypatch.setattr(ask_jobs, "MAX_JOBS", 1)
+    queue = AskQueue(lambda payload, on_chunk: {}, WorkerPool("test-ai", workers=1, queue_size=4))
+    try:
+        first = queue.submit({"question": "one"})
+        second = queue.submit({"question": "two"})
+    finally:
+        queue.pool.shutdown(wait=True)
+    queue.submit({"question": "three"})  # prunes; the closed pool refuses it
+    assert queue.get(first.id) is None
+    assert queue.get(second.id) is not None
+
+
+def test_wait_returns_streamed_text_until_done():
+    gate = threading.Event()
+
+    def answer(payload, on_chunk):
+        on_chunk("Hello")
+        gate.wait(5)
+        on_chunk(" there")
+        return {"answer": "Hello there"}
+
+    queue = AskQueue(answer, WorkerPool("test-ai", workers=1, queue_size=0))
+    try:
+        job = queue.submit({"question": "hi"})
+        assert queue.wait(job, 0, 5) == ("Hello", False)
+        assert job.to_json()["text"] == "Hello"
+        gate.set()
+        text, finished = queue.wait(job, 5, 5)
+        while not finished:
+            more, finished = queue.wait(job, 5 + len(text), 5)
+            text += more
+        assert text == " there"
+        assert "text" not in job.to_json()
+    finally:
+        gate.set()
+        queue.pool.shutdown(wait=True)
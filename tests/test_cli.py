@@ -5,6 +5,8 @@ import sys
 import zipfile
 from pathlib import Path
 
+import journal_index
+
 ROOT = Path(__file__).resolve().parents[1]
 CLI = ROOT / "scripts" / "journal_cli.py"
 AI_INTEGRATION = ROOT / "scripts" / "ai_integration.py"
@@ -42,7 +44,8 @@ def run_cli(tmp_path, *args, check=True, env=None):
 
 
 def read_index(tmp_path):
-    return json.loads((tmp_path / "AI-Journal" / "index.json").read_text())
+    # index.json plus any changes still pending in index.log.
+    return journal_index.read_index(tmp_path / "AI-Journal")
 
 
 def test_new_list_limit_and_search(tmp_path):
@@ -58,6 +61,25 @@ def test_new_list_limit_and_search(tmp_path):
     assert "Second Topic" not in search
 
 
+def test_find_filters_by_tag(tmp_path):
+    run_cli(tmp_path, "new", "First Topic", "one")
+    run_cli(tmp_path, "new", "Second Topic", "two")
+
+    found = run_cli(tmp_path, "find", "topic", "--tag", "two").stdout
+    assert "Second Topic" in found
+    assert "First Topic" not in found
+    assert "two (1)" in found
+
+    first = run_cli(tmp_path, "find", "--since", "2000-01-01", "--limit", "1").stdout
+    assert "Second Topic" in first and "First Topic" not in first
+    cursor = first.split("--after ")[1].strip()
+    rest = run_cli(tmp_path, "find", "--since", "2000-01-01", "--after", cursor).stdout
+    assert "First Topic" in rest and "Second Topic" not in rest
+
+    bad = run_cli(tmp_path, "find", "--since", "soon", check=False)
+    assert bad.returncode == 1
+
+
 def test_append_and_open_print_path(tmp_path):
     run_cli(tmp_path, "new", "Append Target", "notes")
     run_cli(tmp_path, "append", "latest", "A useful addition")
@@ -110,6 +132,23 @@ def test_entry_ids_are_not_reused_after_index_deletion(tmp_path):
     assert index["next_id"] == 3
 
 
+def test_restored_backup_keeps_every_entry(tmp_path):
+    for topic in ("First Topic", "Second Topic", "Third Topic"):
+        run_cli(tmp_path, "new", topic)
+    run_cli(tmp_path, "backup", str(tmp_path / "backup.zip"))
+
+    restored = tmp_path / "restored"
+    with zipfile.ZipFile(tmp_path / "backup.zip") as archive:
+        archive.extractall(restored)
+    for path in (restored / "AI-Journal").iterdir():
+        os.utime(path, (1_600_000_000, 1_600_000_000))
+
+    listing = run_cli(restored, "list").stdout
+    assert all(topic in listing for topic in ("First Topic", "Second Topic", "Third Topic"))
+    run_cli(restored, "new", "Fourth Topic")
+    assert len(read_index(restored)["entries"]) == 4
+
+
 def _run_ai_integration(tmp_path, question):
     env = os.environ.copy()
     env.update(
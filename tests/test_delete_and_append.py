@@ -18,6 +18,8 @@ CLI = SCRIPTS / "journal_cli.py"
 if str(SCRIPTS) not in sys.path:
     sys.path.insert(0, str(SCRIPTS))
 
+import journal_index  # noqa: E402
+
 
 def run_cli(tmp_path, *args, user_input=None, check=True):
     env = os.environ.copy()
@@ -46,9 +48,8 @@ def run_cli(tmp_path, *args, user_input=None, check=True):
 
 
 def read_index(tmp_path):
-    return json.loads(
-        (tmp_path / "AI-Journal" / "index.json").read_text(encoding="utf-8")
-    )
+    # index.json plus any changes still pending in index.log.
+    return journal_index.read_index(tmp_path / "AI-Journal")
 
 
 def journal_files(tmp_path):
@@ -294,9 +295,7 @@ def test_web_edit_updates_body_index_and_search(server, tmp_path):
     assert not any(e["id"] == entry_id for e in res["entries"])
 
     # Index word count refreshed
-    index = json.loads(
-        (tmp_path / "AI-Journal" / "index.json").read_text(encoding="utf-8")
-    )
+    index = read_index(tmp_path)
     entry = [e for e in index["entries"] if e["id"] == entry_id][0]
     assert entry["word_count"] == len(
         "# Editable\n\nPolished thought, fragment removed.".split()
@@ -0,0 +1,130 @@
+import json
+import os
+from pathlib import Path
+
+import entry_previews
+import pytest
+import sqlite_index
+from entry_previews import EMPTY, previews, refresh, summarize
+from sqlite_index import rebuild, remove_entry, sync
+
+
+def make_journal(tmp_path: Path) -> Path:
+    journal = tmp_path / "AI-Journal"
+    entry_dir = journal / "entries" / "2026" / "07"
+    entry_dir.mkdir(parents=True)
+    records = []
+    for n, (name, topic, body) in enumerate(
+        [
+            ("20260711-python-functions.md", "Python Functions", "Functions make code reusable."),
+            ("20260710-docker-basics.md", "Docker Basics", "Containers package applications."),
+        ],
+        start=1,
+    ):
+        (entry_dir / name).write_text(f"# {topic}\n\n{body}\n", encoding="utf-8")
+        records.append(
+            {
+                "id": n,
+                "topic": topic,
+                "filename": f"entries/2026/07/{name}",
+                "created": f"2026-07-{12 - n}T10:00:00",
+                "tags": [],
+            }
+        )
+    (journal / "index.json").write_text(json.dumps({"entries": records}), encoding="utf-8")
+    return journal
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo():
+    entry_previews.clear_cache()
+    yield
+    entry_previews.clear_cache()
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    read = []
+    real_read = entry_previews._read_text
+    monkeypatch.setattr(
+        entry_previews, "_read_text", lambda path: read.append(Path(path).name) or real_read(path)
+    )
+    return read
+
+
+def entries(journal: Path) -> list[dict]:
+    return [
+        {"filename": str(p.relative_to(journal))}
+        for p in sorted((journal / "entries").rglob("*.md"))
+    ]
+
+
+def test_summarize_skips_template_lines():
+    text = (
+        "# Topic\n\n**Date:** x\n\n## Key Points\n\n- [Add your key insights here]\n"
+        "- Loops repeat work.\n\n## Reflection\n\n<!-- hint -->\nI get it now.\n"
+    )
+    p = summarize(text, 1, len(text))
+    assert p.preview == "Loops repeat work."
+    assert p.excerpt == "Loops repeat work. I get it now."
+    assert p.word_count == len(text.split())
+    assert [name for name, _offset in p.sections] == ["## Key Points", "## Reflection"]
+    for name, offset in p.sections:
+        assert text[offset:].startswith(name)
+
+
+def test_unchanged_files_are_not_reread(tmp_path, reads):
+    journal = make_journal(tmp_path)
+    first = previews(journal, entries(journal))
+    assert sorted(p.preview for p in first.values()) == [
+        "Containers package applications.",
+        "Functions make code reusable.",
+    ]
+    assert len(reads) == 2
+
+    assert previews(journal, entries(journal)) == first
+    assert len(reads) == 2
+
+    edited = journal / entries(journal)[0]["filename"]
+    edited.write_text("# Docker Basics\n\nImages and volumes too.\n", encoding="utf-8")
+    again = previews(journal, entries(journal))
+    assert again[entries(journal)[0]["filename"]].preview == "Images and volumes too."
+    assert len(reads) == 3 and reads[-1] == edited.name
+
+
+def test_search_database_keeps_previews_across_restarts(tmp_path, reads):
+    journal = make_journal(tmp_path)
+    rebuild(journal)  # indexing fills the previews table as it reads each file
+    assert len(previews(journal, entries(journal))) == 2
+    assert reads == []
+
+    # A touched but unchanged file keeps its stored preview after a sync.
+    path = journal / entries(journal)[1]["filename"]
+    os.utime(path, ns=(1, 1))
+    sync(journal)
+    entry_previews.clear_cache()
+    previews(journal, entries(journal))
+    assert reads == []
+
+
+def test_refresh_records_written_text(tmp_path, reads):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    entry = entries(journal)[0]
+    text = "# Docker Basics\n\nCompose files.\n"
+    (journal / entry["filename"]).write_text(text, encoding="utf-8")
+    refresh(journal, [(entry, text)])
+    entry_previews.clear_cache()
+
+    assert previews(journal, [entry])[entry["filename"]].preview == "Compose files."
+    assert reads == []
+
+
+def test_missing_and_deleted_entries(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    assert previews(journal, [{"filename": "entries/gone.md"}]) == {"entries/gone.md": EMPTY}
+
+    remove_entry(journal, 1)
+    filename = entries(journal)[1]["filename"]
+    assert filename not in sqlite_index.load_previews(journal, [filename])
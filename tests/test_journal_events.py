@@ -0,0 +1,74 @@
+import json
+import time
+from pathlib import Path
+
+import journal_index
+from journal_events import ChangeFeed, diff
+from journal_index import append_op, write_snapshot
+
+
+def make_journal(tmp_path: Path) -> Path:
+    journal = tmp_path / "AI-Journal"
+    write_snapshot(journal, {"entries": [], "tags": {}, "stats": {"total_entries": 0}})
+    return journal
+
+
+def record(entry_id: int) -> dict:
+    return {
+        "id": entry_id,
+        "topic": f"Topic {entry_id}",
+        "filename": f"entries/topic-{entry_id}.md",
+        "created": f"2026-07-1{entry_id}T10:00:00Z",
+        "tags": [],
+    }
+
+
+def kinds(events) -> list[tuple[str, tuple]]:
+    return [(e.kind, e.ids) for e in events]
+
+
+def test_diff_by_entry_id():
+    old = {1: {"id": 1}, 2: {"id": 2, "word_count": 1}, 3: {"id": 3}}
+    new = {1: old[1], 2: {"id": 2, "word_count": 5}, 4: {"id": 4}}
+    assert diff(old, new) == {"created": [4], "updated": [2], "deleted": [3]}
+
+
+def test_writes_in_this_process_are_pushed_at_once(tmp_path):
+    journal = make_journal(tmp_path)
+    feed = ChangeFeed(journal, interval=60).start()
+    try:
+        append_op(journal, {"op": "create", "entry": record(1)})
+        append_op(journal, {"op": "update", "id": 1, "fields": {"word_count": 9}})
+        append_op(journal, {"op": "delete", "id": 1})
+        events = feed.since(0)
+        assert kinds(events) == [("created", (1,)), ("updated", (1,)), ("deleted", (1,))]
+        assert [e.seq for e in events] == [1, 2, 3]
+        assert events[-1].to_json()["generation"] == feed.generation
+
+        assert feed.since(3) == []
+        assert feed.since(99) is None  # a number from an earlier server run
+        journal_index.compact(journal)
+        assert kinds(feed.since(3)) == [("reindexed", ())]
+    finally:
+        feed.stop()
+    assert feed._on_write not in journal_index._listeners
+
+
+def test_watcher_sees_other_processes(tmp_path):
+    journal = make_journal(tmp_path)
+    feed = ChangeFeed(journal, interval=0.05, backlog=2).start()
+    try:
+        # Written the way another process would: straight to disk.
+        index = {"entries": [record(1), record(2)], "tags": {}, "stats": {}}
+        (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+        assert kinds(feed.wait(0, timeout=5)) == [("created", (1, 2))]
+
+        index["entries"] = [record(2)]
+        time.sleep(0.01)
+        (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+        assert kinds(feed.wait(1, timeout=5)) == [("deleted", (1,))]
+        for n in (3, 4):
+            append_op(journal, {"op": "create", "entry": record(n)})
+        assert feed.since(0) is None  # fell out of the two-event backlog
+    finally:
+        feed.stop()
@@ -0,0 +1,236 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import journal_index
+import pytest
+from journal_index import append_op, compact, read_index, write_snapshot
+
+
+def make_journal(tmp_path: Path) -> Path:
+    journal = tmp_path / "AI-Journal"
+    write_snapshot(
+        journal,
+        {
+            "entries": [],
+            "tags": {},
+            "stats": {"total_entries": 0},
+        },
+    )
+    return journal
+
+
+def record(entry_id: int, *tags: str) -> dict:
+    return {
+        "id": entry_id,
+        "topic": f"Topic {entry_id}",
+        "slug": f"topic-{entry_id}",
+        "filename": f"entries/2026/07/topic-{entry_id}.md",
+        "created": f"2026-07-1{entry_id}T10:00:00Z",
+        "tags": list(tags),
+        "word_count": 3,
+    }
+
+
+def test_writes_append_to_log_without_touching_snapshot(tmp_path):
+    journal = make_journal(tmp_path)
+    snapshot = (journal / "index.json").read_bytes()
+
+    append_op(journal, {"op": "create", "entry": record(1, "python")})
+    append_op(journal, {"op": "update", "id": 1, "fields": {"word_count": 9}})
+
+    assert (journal / "index.json").read_bytes() == snapshot
+    index = read_index(journal)
+    assert [e["word_count"] for e in index["entries"]] == [9]
+    assert index["next_id"] == 2
+    assert index["tags"] == {"python": 1}
+    assert index["stats"]["total_entries"] == 1
+
+
+def test_delete_fixes_counters_and_ai_stats_replay(tmp_path):
+    journal = make_journal(tmp_path)
+    append_op(
+        journal,
+        {"op": "create", "entry": record(1, "a"), "ai": {"source": "Groq", "rating": 8}},
+    )
+    append_op(journal, {"op": "create", "entry": record(2, "a", "b")})
+    append_op(journal, {"op": "delete", "id": 2})
+
+    index = read_index(journal)
+    assert [e["id"] for e in index["entries"]] == [1]
+    assert index["tags"] == {"a": 1}
+    assert index["stats"]["total_entries"] == 1
+    assert index["ai_stats"]["sources_used"] == {"Groq": 1}
+    assert index["ai_stats"]["avg_quality_rating"] == 8
+
+
+def test_compact_folds_log_into_snapshot(tmp_path):
+    journal = make_journal(tmp_path)
+    append_op(journal, {"op": "create", "entry": record(1)})
+    append_op(journal, {"op": "create", "entry": record(2)})
+
+    assert compact(journal) == 2
+    assert not (journal / "index.log").exists()
+    on_disk = json.loads((journal / "index.json").read_text(encoding="utf-8"))
+    assert [e["id"] for e in on_disk["entries"]] == [1, 2]
+    assert compact(journal) == 0
+
+
+def test_log_compacts_itself_when_it_grows(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    monkeypatch.setattr(journal_index, "COMPACT_BYTES", 1)
+    append_op(journal, {"op": "create", "entry": record(1)})
+    assert not (journal / "index.log").exists()
+    on_disk = json.loads((journal / "index.json").read_text(encoding="utf-8"))
+    assert on_disk["entries"][0]["id"] == 1
+
+
+def test_hand_edited_snapshot_wins_over_stale_log(tmp_path):
+    journal = make_journal(tmp_path)
+    append_op(journal, {"op": "create", "entry": record(1)})
+
+    index = read_index(journal)
+    index["entries"] = []
+    (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+
+    assert read_index(journal)["entries"] == []
+    append_op(journal, {"op": "create", "entry": record(2)})
+    assert [e["id"] for e in read_index(journal)["entries"]] == [2]
+
+    # The stale log is kept aside rather than overwritten.
+    (stale,) = journal.glob("index.log.*.stale")
+    assert '"id": 1' in stale.read_text(encoding="utf-8")
+
+
+def test_pending_changes_survive_a_copy_with_new_file_times(tmp_path):
+    journal = make_journal(tmp_path)
+    for entry_id in (1, 2, 3):
+        append_op(journal, {"op": "create", "entry": record(entry_id)})
+
+    # A restored backup or synced folder: same contents, different mtimes.
+    copy = tmp_path / "restored"
+    shutil.copytree(journal, copy)
+    for path in copy.iterdir():
+        os.utime(path, (1_600_000_000, 1_600_000_000))
+
+    assert [e["id"] for e in read_index(copy)["entries"]] == [1, 2, 3]
+    append_op(copy, {"op": "create", "entry": record(4)})
+    assert [e["id"] for e in read_index(copy)["entries"]] == [1, 2, 3, 4]
+    assert not list(copy.glob("index.log.*.stale"))
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = make_journal(tmp_path)
+    append_op(journal, {"op": "create", "entry": record(1)})
+    with open(journal / "index.log", "a", encoding="utf-8") as f:
+        f.write('{"op": "create", "entry": {"id"')
+    assert [e["id"] for e in read_index(journal)["entries"]] == [1]
+
+
+def test_load_index_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    parses = []
+    real_read = journal_index.read_index
+    monkeypatch.setattr(
+        journal_index,
+        "read_index",
+        lambda d: parses.append(d) or real_read(d),
+    )
+
+    first = journal_index.load_index(journal)
+    assert journal_index.load_index(journal) is first
+    assert len(parses) <= 1
+
+    # Writes through this module update the cache without a re-parse.
+    append_op(journal, {"op": "create", "entry": record(1)})
+    parsed_before = len(parses)
+    assert [e["id"] for e in journal_index.load_index(journal)["entries"]] == [1]
+    assert len(parses) == parsed_before
+    assert first["entries"] == []  # earlier readers keep their own view
+
+    # An edit from another process is picked up.
+    index = read_index(journal)
+    index["entries"] = []
+    (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+    assert journal_index.load_index(journal)["entries"] == []
+    assert len(parses) == parsed_before + 1
+
+
+def test_entry_lookup_finds_by_id_slug_topic_and_day(tmp_path):
+    journal = make_journal(tmp_path)
+    for entry_id in (1, 2, 3):
+        append_op(journal, {"op": "create", "entry": record(entry_id)})
+    same_day = {**record(4), "created": "2026-07-12T18:00:00Z"}
+    append_op(journal, {"op": "create", "entry": same_day})
+
+    lookup = journal_index.entry_lookup(journal)
+    assert journal_index.entry_lookup(journal) is lookup
+    assert lookup.by_id[2]["topic"] == "Topic 2"
+    assert lookup.by_slug["topic-3"]["id"] == 3
+    assert lookup.by_topic["topic 1"]["id"] == 1
+    assert lookup.latest()["id"] == 3
+    assert lookup.latest_on("2026-07-12")["id"] == 4
+    assert lookup.latest_on("2026-07-20") is None
+    assert [e["id"] for e in lookup.topics_containing("TOPIC")] == [1, 2, 3, 4]
+
+    append_op(journal, {"op": "delete", "id": 3})
+    assert journal_index.entry_lookup(journal).latest()["id"] == 4
+
+
+def test_pages_walk_newest_first_with_keyset_cursors(tmp_path):
+    journal = make_journal(tmp_path)
+    for entry_id in (1, 2, 3, 4, 5):
+        tags = ("even",) if entry_id % 2 == 0 else ()
+        append_op(journal, {"op": "create", "entry": record(entry_id, *tags)})
+
+    lookup = journal_index.entry_lookup(journal)
+    seen, after = [], None
+    while True:
+        page, after = lookup.page(after, limit=2)
+        seen.append([e["id"] for e in page])
+        if after is None:
+            break
+    assert seen == [[5, 4], [3, 2], [1]]
+
+    assert [e["id"] for e in lookup.page(tag="EVEN")[0]] == [4, 2]
+    assert lookup.count("even") == 2 and lookup.count() == 5
+    assert lookup.page(tag="missing") == ([], None)
+
+    cursor = journal_index.encode_cursor(lookup.page(limit=1)[1])
+    assert journal_index.decode_cursor(cursor) == ("2026-07-15T10:00:00Z", 5)
+    with pytest.raises(ValueError):
+        journal_index.decode_cursor("not a cursor")
+
+
+def test_daily_rollup_follows_writes_without_rebuilding(tmp_path, monkeypatch):
+    from datetime import date
+
+    journal = make_journal(tmp_path)
+    append_op(journal, {"op": "create", "entry": record(1)})
+    journal_index.load_index(journal)
+    assert journal_index.daily_rollup(journal).count(date(2026, 7, 11)) == (1, 0)
+
+    built = []
+    real_init = journal_index.DailyRollup.__init__
+    monkeypatch.setattr(
+        journal_index.DailyRollup,
+        "__init__",
+        lambda self, entries=(): built.append(len(entries)) or real_init(self, entries),
+    )
+    second = {**record(2), "ai_sources": ["Groq"]}
+    append_op(journal, {"op": "create", "entry": second})
+    append_op(journal, {"op": "create", "entry": {**record(3), "created": second["created"]}})
+    append_op(journal, {"op": "update", "id": 3, "fields": {"created": "2026-07-20T09:00:00Z"}})
+    append_op(journal, {"op": "delete", "id": 1})
+
+    rollup = journal_index.daily_rollup(journal)
+    assert built == [0] * len(built)  # only empty copies, never a rescan
+    assert rollup.count(date(2026, 7, 11)) == (0, 0)
+    assert rollup.count(date(2026, 7, 12)) == (1, 1)
+    assert rollup.count(date(2026, 7, 20)) == (1, 0)
+    assert [n for _day, n, _ai in rollup.window(date(2026, 7, 20), 9)] == [
+        1, 0, 0, 0, 0, 0, 0, 0, 1
+    ]
+    assert rollup.days == journal_index.DailyRollup(read_index(journal)["entries"]).days
+    assert rollup.counted[3]["created"] == "2026-07-20T09:00:00Z" and 1 not in rollup.counted
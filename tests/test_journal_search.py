@@ -0,0 +1,113 @@
+import sqlite3
+
+import entry_saver
+import journal_search
+import pytest
+
+
+@pytest.fixture()
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setenv("AI_JOURNAL_DIR", str(tmp_path / "AI-Journal"))
+    entry_saver.create_entry("CLI design", "argparse subparsers keep commands tidy.", ["python"])
+    entry_saver.create_entry("Café notes", "Ordered an ÉCLAIR today.", ["français"])
+    entry_saver.create_entry("Empty template")
+    return tmp_path / "AI-Journal"
+
+
+def results(query):
+    return [(e["topic"], snippet) for e, snippet in journal_search.search_entries(query)]
+
+
+def test_search_keeps_substring_semantics(journal):
+    assert results("pars") == [
+        ("CLI design", "argparse subparsers keep commands tidy.")
+    ]
+    assert results("PYTHON") == [("CLI design", "**Tags:** python")]
+    assert results("éclair") == [("Café notes", "Ordered an ÉCLAIR today.")]
+    assert results("key points") == []  # only in a heading: no match
+
+
+def test_search_matches_file_scan(journal):
+    for query in ("pars", "python", "an", "français", "", "missing"):
+        assert journal_search.search_entries(query) == journal_search.scan_entries(query)
+
+
+def test_search_falls_back_to_file_scan_without_sqlite(journal, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(journal_search, "substring_candidates", unavailable)
+    assert results("pars") == [
+        ("CLI design", "argparse subparsers keep commands tidy.")
+    ]
+
+
+def test_search_sees_external_edits(journal, monkeypatch):
+    monkeypatch.setattr(journal_search, "FILE_CHECK_SECONDS", 0)
+    entry = journal_search.search_entries("subparsers")[0][0]
+    (journal / entry["filename"]).write_text("# CLI design\n\nclick groups now.\n")
+    assert results("subparsers") == []
+    assert results("click") == [("CLI design", "click groups now.")]
+
+
+def test_repeat_queries_come_from_cache_until_something_changes(journal, monkeypatch):
+    journal_search.clear_cache()
+    calls = []
+    real = journal_search.substring_candidates
+    monkeypatch.setattr(
+        journal_search,
+        "substring_candidates",
+        lambda d, q, f, check=True: calls.append(q) or real(d, q, f, check=check),
+    )
+
+    first = results("pars")
+    assert results("PARS") == first
+    assert len(calls) == 1
+    assert journal_search.cache_stats()["hits"] == 1
+
+    # A write through the app bumps the generation immediately.
+    entry_saver.create_entry("Parsing logs", "regex groups", ["ops"])
+    assert [topic for topic, _ in results("pars")] == ["Parsing logs", "CLI design"]
+    assert len(calls) == 2
+
+    # An outside edit is noticed at the next file check.
+    entry = journal_search.search_entries("subparsers")[0][0]
+    (journal / entry["filename"]).write_text("# CLI design\n\nclick groups now.\n")
+    monkeypatch.setattr(journal_search, "FILE_CHECK_SECONDS", 0)
+    assert results("subparsers") == []
+    stats = journal_search.cache_stats()
+    assert stats["hits"] == 1 and 0 < stats["hit_rate"] < 1
+
+
+def test_a_cache_miss_syncs_the_database_at_most_once(journal, monkeypatch):
+    import sqlite_index
+
+    journal_search.clear_cache()
+    results("warm up")  # builds the search database
+    synced = []
+    real = sqlite_index.sync
+
+    def counting_sync(journal_dir):
+        synced.append(journal_dir)
+        return real(journal_dir)
+
+    monkeypatch.setattr(sqlite_index, "sync", counting_sync)
+    monkeypatch.setattr(journal_search, "sync", counting_sync)
+    monkeypatch.setattr(journal_search, "FILE_CHECK_SECONDS", 0)
+    assert results("pars")
+    assert len(synced) == 1
+    monkeypatch.setattr(journal_search, "FILE_CHECK_SECONDS", 60)
+    assert results("éclair")  # another miss inside the check interval
+    assert len(synced) == 1
+
+
+def test_search_pages_follow_the_full_result_order(journal):
+    everything = journal_search.search_entries("")
+    pages, after = [], None
+    while True:
+        page, after, matches = journal_search.search_page("", after=after, limit=2)
+        pages.extend(page)
+        assert matches == everything
+        if after is None:
+            break
+    assert pages == everything
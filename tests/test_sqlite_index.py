@@ -1,7 +1,18 @@
 import json
 from pathlib import Path
 
-from sqlite_index import rebuild, search, update_entry
+import pytest
+import sqlite_index
+from sqlite_index import (
+    SearchFilters,
+    database_path,
+    faceted_search,
+    plan_query,
+    rebuild,
+    search,
+    substring_candidates,
+    update_entry,
+)
 
 
 def make_journal(tmp_path: Path) -> Path:
@@ -26,6 +37,7 @@ def make_journal(tmp_path: Path) -> Path:
                         "filename": str(first.relative_to(journal)),
                         "created": "2026-07-11T10:00:00",
                         "tags": ["python", "beginner"],
+                        "ai_sources": ["Groq"],
                     },
                     {
                         "id": 2,
@@ -65,3 +77,281 @@ def test_update_entry_refreshes_body(tmp_path):
     )
     update_entry(journal, entry)
     assert search(journal, "decorators")[0].id == 1
+
+
+def test_sync_reindexes_only_changed_entries(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    entry = json.loads((journal / "index.json").read_text())["entries"][1]
+    (journal / entry["filename"]).write_text(
+        "# Docker Basics\n\nImages are layered.\n", encoding="utf-8"
+    )
+
+    upserted = []
+    real_upsert = sqlite_index._upsert
+    monkeypatch.setattr(
+        sqlite_index,
+        "_upsert",
+        lambda conn, d, fields: upserted.append(fields[0]) or real_upsert(conn, d, fields),
+    )
+    result = sqlite_index.sync(journal)
+    assert (result.added, result.changed, result.removed) == (0, 1, 0)
+    assert upserted == [2]
+    assert search(journal, "layered")[0].id == 2
+    assert not search(journal, "containers")
+
+    # Nothing changed since: the next sync touches no entries.
+    upserted.clear()
+    assert sqlite_index.sync(journal).changed == 0
+    assert upserted == []
+
+
+def test_sync_drops_entries_removed_from_index(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    index = json.loads((journal / "index.json").read_text())
+    index["entries"] = index["entries"][:1]
+    (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+
+    result = sqlite_index.sync(journal)
+    assert (result.removed, result.total) == (1, 1)
+    assert search(journal, "docker") == []
+
+
+def test_connections_are_pooled_and_schema_set_up_once(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    sqlite_index.close_connections()
+    opened, initialized = [], []
+    real_connect, real_initialize = sqlite_index.connect, sqlite_index.initialize
+    monkeypatch.setattr(
+        sqlite_index, "connect", lambda d: opened.append(d) or real_connect(d)
+    )
+    monkeypatch.setattr(
+        sqlite_index, "initialize", lambda c: initialized.append(c) or real_initialize(c)
+    )
+
+    for _ in range(5):
+        assert [r.id for r in search(journal, "reusable")] == [1]
+
+    assert len(opened) == 1
+    assert len(initialized) == 1
+    sqlite_index.close_connections()
+
+
+def test_pool_notices_database_file_replaced(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    assert search(journal, "containers")
+
+    # Deleting the file (as a fresh USB copy would) must not leave the pool
+    # talking to the unlinked database.
+    database_path(journal).unlink()
+    for suffix in ("-wal", "-shm"):
+        database_path(journal).with_name(database_path(journal).name + suffix).unlink(missing_ok=True)
+    assert [r.id for r in search(journal, "containers")] == [2]
+    sqlite_index.close_connections()
+
+
+def test_fts_index_does_not_store_a_second_copy_of_bodies(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    conn = sqlite_index.connect(journal)
+    try:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    finally:
+        conn.close()
+    assert "entries_fts_content" not in names
+    assert [r.id for r in search(journal, "containers")] == [2]
+
+
+def test_version_1_database_is_migrated_in_place(tmp_path):
+    journal = make_journal(tmp_path)
+    sqlite_index.close_connections()
+    conn = sqlite_index.connect(journal)
+    conn.executescript(
+        """
+        CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE entries (
+            id INTEGER PRIMARY KEY, topic TEXT NOT NULL,
+            filename TEXT NOT NULL UNIQUE, created TEXT NOT NULL,
+            tags_json TEXT NOT NULL, body TEXT NOT NULL
+        );
+        CREATE VIRTUAL TABLE entries_fts USING fts5(
+            entry_id UNINDEXED, topic, tags, body
+        );
+        INSERT INTO metadata VALUES ('schema_version', '1');
+        INSERT INTO entries VALUES (
+            1, 'Python Functions', 'entries/2026/07/20260711-python-functions.md',
+            '2026-07-11T10:00:00', '["python", "beginner"]',
+            '# Python Functions
+
+Functions make code reusable.
+'
+        );
+        """
+    )
+    conn.close()
+
+    conn = sqlite_index.connect(journal)
+    try:
+        sqlite_index.initialize(conn)
+        version = conn.execute(
+            "SELECT value FROM metadata WHERE key = 'schema_version'"
+        ).fetchone()[0]
+        fts_columns = [row[1] for row in conn.execute("PRAGMA table_info(entries_fts)")]
+        # The new index was filled from the rows already in the database.
+        matched = conn.execute(
+            "SELECT rowid FROM entries_fts WHERE entries_fts MATCH 'beginner'"
+        ).fetchall()
+    finally:
+        conn.close()
+    assert [row[0] for row in matched] == [1]
+    assert version == str(sqlite_index.SCHEMA_VERSION)
+    assert fts_columns == ["topic", "tags", "body"]
+    assert [r.id for r in search(journal, "reusable")] == [1]
+    sqlite_index.close_connections()
+
+
+def test_rebuild_in_batches_indexes_every_entry(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    monkeypatch.setattr(sqlite_index, "REBUILD_BATCH", 1)
+    monkeypatch.setattr(sqlite_index, "REBUILD_WORKERS", 2)
+
+    assert rebuild(journal) == 2
+    assert [r.id for r in search(journal, "reusable")] == [1]
+    assert [r.id for r in search(journal, "docker")] == [2]
+    conn = sqlite_index.connect(journal)
+    try:
+        triggers = conn.execute(
+            "SELECT count(*) FROM sqlite_master"
+            " WHERE type = 'trigger' AND name LIKE 'entries%'"
+        ).fetchone()[0]
+        indexes = 2 if sqlite_index.has_trigram(conn) else 1
+    finally:
+        conn.close()
+    assert triggers == 3 * indexes  # back in place for incremental updates
+
+
+def test_rebuild_reads_at_most_two_batches_ahead(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    index = json.loads((journal / "index.json").read_text(encoding="utf-8"))
+    for n in range(3, 13):
+        name = f"entries/2026/07/20260712-note-{n}.md"
+        (journal / name).write_text(f"# Note {n}\n\nBody {n}.\n", encoding="utf-8")
+        index["entries"].append(
+            {"id": n, "topic": f"Note {n}", "filename": name, "created": "2026-07-12T10:00:00"}
+        )
+    (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+    monkeypatch.setattr(sqlite_index, "REBUILD_BATCH", 2)
+    reads, inserted, ahead = [], [], []
+    real_rows, real_insert = sqlite_index._entry_rows, sqlite_index._insert_batch
+
+    def insert(conn, batch):
+        # Entries read beyond those inserted so far and this batch.
+        ahead.append(len(reads) - len(inserted) - len(batch))
+        inserted.extend(batch)
+        real_insert(conn, batch)
+
+    monkeypatch.setattr(
+        sqlite_index, "_entry_rows", lambda *args: reads.append(1) or real_rows(*args)
+    )
+    monkeypatch.setattr(sqlite_index, "_insert_batch", insert)
+
+    assert rebuild(journal) == 12
+    assert max(ahead) <= 2  # only the next batch is read while one is inserted
+
+
+def test_rebuild_swaps_in_while_readers_keep_their_snapshot(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    index = json.loads((journal / "index.json").read_text(encoding="utf-8"))
+    index["entries"] = index["entries"][:1]
+    (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+
+    reader = sqlite_index.connect(journal)
+    try:
+        reader.execute("BEGIN")
+        assert reader.execute("SELECT count(*) FROM entries").fetchone()[0] == 2
+        assert rebuild(journal) == 1
+        # The open read transaction still sees the old, complete index.
+        assert reader.execute("SELECT count(*) FROM entries").fetchone()[0] == 2
+        reader.commit()
+        assert reader.execute("SELECT count(*) FROM entries").fetchone()[0] == 1
+    finally:
+        reader.close()
+    assert not list(journal.glob(".journal-search-*"))
+    assert [r.id for r in search(journal, "reusable")] == [1]
+
+
+def test_plan_sends_long_tokens_to_trigram_index():
+    plan = plan_query("go pars", trigram=True)
+    assert plan.words == ("go",)
+    assert plan.substrings == ("pars",)
+    assert plan_query("go pars", trigram=False).words == ("go", "pars")
+
+
+def test_substrings_inside_words_are_found_by_index(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    conn = sqlite_index.connect(journal)
+    try:
+        if not sqlite_index.has_trigram(conn):
+            pytest.skip("SQLite without the trigram tokenizer")
+    finally:
+        conn.close()
+
+    # "ontainer" is only inside a word; "contain" is also a word prefix.
+    assert [r.id for r in search(journal, "ontainer")] == [2]
+    assert [r.id for r in search(journal, "CONTAIN")] == [2]
+    assert [r.id for r in search(journal, "eusab unctions")] == [1]
+    assert [r.id for r in search(journal, "eusab docker")] == []
+    assert [row[0] for row in substring_candidates(journal, "ginne")] == [1]
+
+
+def test_filters_and_facets_are_applied_in_sql(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+
+    page = faceted_search(journal, "", filters=SearchFilters.of(since="2026-07-01"))
+    assert [r.id for r in page.results] == [1, 2]  # newest first
+    assert page.total == 2
+    assert page.facets == (("beginner", 1), ("docker", 1), ("python", 1))
+
+    def ids(query="", **filters):
+        return [r.id for r in search(journal, query, filters=SearchFilters.of(**filters))]
+
+    assert ids(tags=["Python"]) == [1]
+    assert ids(tags=["python", "docker"]) == []
+    assert ids(until="2026-07-10") == [2]  # the whole day is included
+    assert ids(since="2026-07-11") == [1]
+    assert ids(ai_source="groq") == [1]
+    assert ids("containers", tags=["docker"]) == [2]
+    assert ids("containers", tags=["python"]) == []
+    with pytest.raises(ValueError):
+        SearchFilters.of(since="last tuesday")
+
+
+def test_tag_table_follows_tag_edits(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    index = json.loads((journal / "index.json").read_text(encoding="utf-8"))
+    index["entries"][1]["tags"] = ["devops"]
+    (journal / "index.json").write_text(json.dumps(index), encoding="utf-8")
+
+    page = faceted_search(journal, "", filters=SearchFilters.of(tags=["devops"]))
+    assert [r.id for r in page.results] == [2]
+    assert page.facets == (("devops", 1),)
+
+
+def test_filtered_listing_pages_with_keyset_cursor(tmp_path):
+    journal = make_journal(tmp_path)
+    rebuild(journal)
+    since = SearchFilters.of(since="2026-07-01")
+
+    first = faceted_search(journal, "", limit=1, filters=since)
+    assert [r.id for r in first.results] == [1]
+    assert first.total == 2
+    second = faceted_search(journal, "", limit=1, filters=since, after=first.next_after)
+    assert [r.id for r in second.results] == [2]
+    assert second.next_after is None
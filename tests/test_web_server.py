@@ -5,9 +5,12 @@ a temporary AI_JOURNAL_DIR, and exercises the JSON API over HTTP. This proves
 the web layer and the CLI share the same storage and reuse the same logic.
 """
 
+import http.client
 import json
+import socket
 import sys
 import threading
+import time
 import urllib.error
 import urllib.request
 from pathlib import Path
@@ -20,11 +23,17 @@ if str(SCRIPTS) not in sys.path:
     sys.path.insert(0, str(SCRIPTS))
 
 
+@pytest.fixture(autouse=True)
+def private_ai_config(tmp_path, monkeypatch):
+    """Keep the AI config and answer cache of every test in its temp dir."""
+    monkeypatch.setenv("AI_JOURNAL_CONFIG", str(tmp_path / "ai-config.json"))
+    monkeypatch.delenv("AI_JOURNAL_ANSWER_CACHE", raising=False)
+
+
 @pytest.fixture()
 def server(tmp_path, monkeypatch):
     """Start the web server on a free port against a temp journal dir."""
     monkeypatch.setenv("AI_JOURNAL_DIR", str(tmp_path / "AI-Journal"))
-    monkeypatch.setenv("AI_JOURNAL_CONFIG", str(tmp_path / "ai-config.json"))
     for key in (
         "OPENAI_API_KEY",
         "ANTHROPIC_API_KEY",
@@ -64,6 +73,20 @@ def post(base, path, payload, headers=None):
         return exc.code, json.loads(exc.read().decode("utf-8"))
 
 
+def ask_and_wait(base, payload, timeout=5):
+    """Post a question and poll its job until it is answered."""
+    status, job = post(base, "/api/ask", payload)
+    if status != 202:
+        return status, job
+    deadline = time.monotonic() + timeout
+    while job["status"] in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.02)
+        _, job = get(base, "/api/ask/" + job["id"])
+    if job["status"] == "error":
+        return 400, {"error": job["error"]}
+    return 200, job["result"]
+
+
 def test_health(server):
     status, body = get(server, "/api/health")
     assert status == 200
@@ -158,7 +181,7 @@ def test_append_requires_content(server):
 
 
 def test_ask_known_question_saves_starter_guide(server):
-    status, body = post(server, "/api/ask", {"question": "What is an API?"})
+    status, body = ask_and_wait(server, {"question": "What is an API?"})
     assert status == 200
     assert body["matched"] is True
     assert "waiter" in body["answer"].lower()
@@ -169,9 +192,7 @@ def test_ask_known_question_saves_starter_guide(server):
 
 
 def test_ask_unknown_question_is_saved_pending(server):
-    status, body = post(
-        server, "/api/ask", {"question": "Explain monad transformers in Haskell"}
-    )
+    status, body = ask_and_wait(server, {"question": "Explain monad transformers in Haskell"})
     assert status == 200
     assert body["matched"] is False
     assert body["answer"] is None
@@ -194,6 +215,342 @@ def test_search_matches_topic(server):
     assert "CSS colors" not in topics
 
 
+def test_search_filters_by_tag_and_reports_facets(server):
+    post(server, "/api/entries", {"topic": "Loops in Python", "tags": ["python"]})
+    post(server, "/api/entries", {"topic": "Loops in Bash", "tags": ["shell"]})
+    status, res = get(server, "/api/search?q=loops&tag=shell")
+    assert status == 200
+    assert [e["topic"] for e in res["entries"]] == ["Loops in Bash"]
+    assert res["facets"] == [{"tag": "shell", "count": 1}]
+
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        get(server, "/api/search?q=loops&since=not-a-date")
+    assert exc.value.code == 400
+
+
+def test_entries_and_search_page_with_cursors(server):
+    for n in range(5):
+        post(server, "/api/entries", {"topic": f"Loops part {n}", "tags": ["loops"]})
+
+    topics, cursor = [], None
+    while True:
+        path = "/api/entries?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        _, page = get(server, path)
+        topics += [e["topic"] for e in page["entries"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    _, everything = get(server, "/api/entries")
+    assert topics == [e["topic"] for e in everything["entries"]]
+    assert len(topics) == 5
+
+    _, first = get(server, "/api/search?q=loops&limit=3")
+    assert first["total"] == 5 and len(first["entries"]) == 3
+    _, rest = get(server, f"/api/search?q=loops&limit=3&cursor={first['next_cursor']}")
+    assert len(rest["entries"]) == 2 and rest["next_cursor"] is None
+    assert "facets" not in rest
+
+    _, tagged = get(server, "/api/entries?tag=loops&limit=10")
+    assert len(tagged["entries"]) == 5
+
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        get(server, "/api/entries?cursor=bogus")
+    assert exc.value.code == 400
+
+
+def test_entries_page_only_previews_what_it_returns(server, monkeypatch):
+    import entry_previews
+
+    for n in range(6):
+        post(server, "/api/entries", {"topic": f"Note {n}", "body": f"body {n}"})
+    entry_previews.clear_cache()
+    read = []
+    real_read = entry_previews._read_text
+    monkeypatch.setattr(
+        entry_previews, "_read_text", lambda path: read.append(path) or real_read(path)
+    )
+
+    _, page = get(server, "/api/entries?limit=2")
+    assert [e["topic"] for e in page["entries"]] == ["Note 5", "Note 4"]
+    assert page["entries"][0]["preview"] == "body 5"
+    assert page["total"] == 6
+    assert page["next_cursor"]
+    assert len(read) == 2
+
+
+def test_listing_reuses_cached_previews(server, monkeypatch):
+    import entry_previews
+
+    for n in range(3):
+        post(server, "/api/entries", {"topic": f"Note {n}", "body": f"body {n}"})
+    read = []
+    monkeypatch.setattr(entry_previews, "_read_text", lambda path: read.append(path) or "")
+
+    # Created, appended to and edited through the API: nothing to re-read.
+    post(server, "/api/append", {"target": "latest", "content": "More on loops."})
+    _, listing = get(server, "/api/entries")
+    entry = listing["entries"][1]
+    post(server, "/api/entry/update", {"id": entry["id"], "body": "# T\n\nRewritten."})
+    _, listing = get(server, "/api/entries")
+    assert [e["preview"] for e in listing["entries"]] == ["body 2", "Rewritten.", "body 0"]
+    assert read == []
+
+def test_metrics_report_search_cache_hits(server):
+    post(server, "/api/entries", {"topic": "Loops in Python", "body": "for loops"})
+    get(server, "/api/search?q=loops")
+    _, before = get(server, "/api/metrics")
+    get(server, "/api/search?q=loops")
+    status, after = get(server, "/api/metrics")
+    assert status == 200
+    assert after["search_cache"]["hits"] == before["search_cache"]["hits"] + 1
+    assert 0 < after["search_cache"]["hit_rate"] <= 1
+    assert set(after["provider_connections"]) == {"opened", "reused", "retried", "idle"}
+    assert after["answer_cache"]["mode"] == "on"
+
+
+def test_keep_alive_and_conditional_gets(server):
+    post(server, "/api/entries", {"topic": "Loops", "body": "for loops"})
+    host, port = server.rsplit("/", 1)[1].split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        tags = {}
+        for path in ("/api/stats", "/api/entries?limit=5", "/api/entry?id=1", "/"):
+            conn.request("GET", path)
+            r = conn.getresponse()
+            r.read()
+            assert r.status == 200 and r.getheader("Cache-Control") == "no-cache"
+            tags[path] = r.getheader("ETag")
+        sock = conn.sock
+
+        # Same connection; unchanged resources cost only headers.
+        for path, etag in tags.items():
+            conn.request("GET", path, headers={"If-None-Match": etag})
+            r = conn.getresponse()
+            assert r.status == 304 and r.read() == b""
+        assert conn.sock is sock
+
+        # A POST rejected before its body is read closes the connection, so
+        # the unread body cannot leak into the next request.
+        for path, length in (("/nowhere", 8), ("/api/entries", 2 * 1024 * 1024)):
+            conn.putrequest("POST", path)
+            conn.putheader("Content-Type", "application/json")
+            conn.putheader("Content-Length", str(length))
+            conn.endheaders(b'{"x": 1}')
+            r = conn.getresponse()
+            assert r.status in (404, 413) and r.getheader("Connection") == "close"
+            assert r.read() and conn.sock is None
+        assert r.status == 413
+        conn.request("GET", "/api/health")
+        assert json.loads(conn.getresponse().read()) == {"ok": True}
+    finally:
+        conn.close()
+
+    post(server, "/api/append", {"target": "latest", "content": "while loops too"})
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        for path in ("/api/stats", "/api/entries?limit=5", "/api/entry?id=1"):
+            conn.request("GET", path, headers={"If-None-Match": tags[path]})
+            r = conn.getresponse()
+            r.read()
+            assert r.status == 200 and r.getheader("ETag") != tags[path]
+    finally:
+        conn.close()
+
+
+def test_entries_etag_follows_edits_outside_the_app(server, tmp_path):
+    post(server, "/api/entries", {"topic": "Loops", "body": "for loops"})
+    with urllib.request.urlopen(server + "/api/entries", timeout=5) as r:
+        etag, before = r.headers["ETag"], json.loads(r.read())
+
+    (path,) = (tmp_path / "AI-Journal" / "entries").rglob("*.md")
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text.replace("for loops", "while loops, edited by hand"), encoding="utf-8")
+
+    req = urllib.request.Request(server + "/api/entries", headers={"If-None-Match": etag})
+    with urllib.request.urlopen(req, timeout=5) as r:
+        assert r.status == 200 and r.headers["ETag"] != etag
+        after = json.loads(r.read())
+    assert after["entries"][0]["preview"] != before["entries"][0]["preview"]
+
+
+def test_static_assets_cached_compressed_and_fingerprinted(server, tmp_path, monkeypatch):
+    import gzip
+
+    import web_server
+
+    web = tmp_path / "web"
+    web.mkdir()
+    (web / "index.html").write_text("<p>hello</p>" * 200, encoding="utf-8")
+    (web / "app.3f9c2a1b.js").write_text("let x = 1;\n" * 200, encoding="utf-8")
+    monkeypatch.setattr(web_server, "WEB_DIR", web.resolve())
+    monkeypatch.setattr(web_server, "_static_assets", {})
+
+    def fetch(path, **headers):
+        req = urllib.request.Request(server + path, headers=headers)
+        with urllib.request.urlopen(req, timeout=5) as r:
+            return r.headers, r.read()
+
+    headers, raw = fetch("/")
+    assert raw.decode() == "<p>hello</p>" * 200 and "Content-Encoding" not in headers
+    headers, packed = fetch("/", **{"Accept-Encoding": "gzip, br"})
+    assert headers["Content-Encoding"] == "gzip" and headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(packed) == raw and len(packed) < len(raw)
+    assert headers["Cache-Control"] == "no-cache"
+
+    headers, _ = fetch("/app.3f9c2a1b.js", **{"Accept-Encoding": "gzip"})
+    assert headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+    # Aliases of one file share its cache entry and its tag.
+    etag = fetch("/index.html", **{"Accept-Encoding": "gzip"})[0]["ETag"]
+    assert fetch("/./index.html", **{"Accept-Encoding": "gzip"})[0]["ETag"] == etag
+    assert sorted(web_server._static_assets) == ["app.3f9c2a1b.js", "index.html"]
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        fetch("/index.html", **{"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert exc.value.code == 304 and exc.value.headers["Vary"] == "Accept-Encoding"
+
+    # An edited file is picked up on the next request.
+    (web / "index.html").write_text("<p>changed</p>", encoding="utf-8")
+    assert fetch("/")[1] == b"<p>changed</p>"
+
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        fetch("/../secret.txt")
+    assert exc.value.code in (403, 404)
+
+
+def test_events_stream_pushes_changes(server):
+    host, port = server.rsplit("/", 1)[1].split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        conn.request("GET", "/api/events")
+        r = conn.getresponse()
+        assert r.status == 200
+        assert r.getheader("Content-Type").startswith("text/event-stream")
+        assert r.readline() == b"retry: 3000\n" and r.readline() == b"\n"
+
+        post(server, "/api/entries", {"topic": "Loops", "body": "for loops"})
+        lines = [r.readline() for _ in range(4)]
+        assert lines[0].startswith(b"id: ") and lines[1] == b"event: created\n"
+        data = json.loads(lines[2][len(b"data: "):])
+        assert data["type"] == "created" and data["ids"] == [1] and data["generation"]
+    finally:
+        conn.close()
+
+
+def test_ask_runs_as_a_deduplicated_background_job(server, monkeypatch):
+    import web_server
+
+    gate = threading.Event()
+    calls = []
+    monkeypatch.setattr(
+        web_server,
+        "_ask",
+        lambda payload, on_chunk: calls.append(payload) or gate.wait(5) and {"ok": 1},
+    )
+    try:
+        status, job = post(server, "/api/ask", {"question": "What is git?"})
+        assert status == 202 and job["status"] in ("queued", "running")
+        # The same question (give or take case and spacing) joins the job.
+        _, again = post(server, "/api/ask", {"question": "  what is   GIT? "})
+        assert again["id"] == job["id"]
+        # Other requests are served while the question is being answered.
+        assert get(server, "/api/health") == (200, {"ok": True})
+        _, polled = get(server, "/api/ask/" + job["id"])
+        assert polled["status"] in ("queued", "running") and "result" not in polled
+        gate.set()
+        deadline = time.monotonic() + 5
+        while polled["status"] != "done" and time.monotonic() < deadline:
+            time.sleep(0.02)
+            _, polled = get(server, "/api/ask/" + job["id"])
+        assert polled == {"id": job["id"], "status": "done", "result": {"ok": 1}}
+        assert len(calls) == 1
+    finally:
+        gate.set()
+
+    _, metrics = get(server, "/api/metrics")
+    assert metrics["pools"]["ai"]["deduped"] == 1
+    assert set(metrics["pools"]) == {"http", "ai", "events"}
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        get(server, "/api/ask/nope")
+    assert exc.value.code == 404
+    assert post(server, "/api/ask", {"question": " "})[0] == 400
+
+
+def test_full_ai_queue_answers_503(server, monkeypatch):
+    import web_server
+
+    gate = threading.Event()
+    monkeypatch.setattr(web_server, "_ask", lambda payload, on_chunk: gate.wait(5) and {"ok": 1})
+    monkeypatch.setattr(web_server, "AI_WORKERS", 1)
+    monkeypatch.setattr(web_server, "AI_QUEUE", 0)
+    srv = web_server.make_server(port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    try:
+        assert post(base, "/api/ask", {"question": "git?"})[0] == 202
+        req = urllib.request.Request(
+            base + "/api/ask", data=b'{"question": "api?"}', method="POST"
+        )
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(req, timeout=5)
+        assert exc.value.code == 503 and exc.value.headers["Retry-After"] == "2"
+        _, metrics = get(base, "/api/metrics")
+        assert metrics["pools"]["ai"]["rejected"] == 1
+        assert metrics["requests"]["count"] >= 1
+    finally:
+        gate.set()
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_full_accept_queue_answers_503(tmp_path, monkeypatch):
+    monkeypatch.setenv("AI_JOURNAL_DIR", str(tmp_path / "AI-Journal"))
+    import web_server
+    from journal_events import ChangeFeed
+
+    web_server.ensure_index()
+    feed = ChangeFeed(web_server.get_journal_dir()).start()
+    srv = web_server.PooledJournalServer(
+        ("127.0.0.1", 0), web_server.JournalHandler, feed, workers=1, queue_size=0
+    )
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    port = srv.server_address[1]
+    http_pool = srv.pools["http"]
+
+    def settle(busy):
+        deadline = time.monotonic() + 5
+        while http_pool.stats()["busy"] != busy and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    idle = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    stalled = None
+    try:
+        # A kept-alive connection waiting for its next request holds no worker...
+        idle.request("GET", "/api/health")
+        assert idle.getresponse().read() == b'{"ok": true}'
+        settle(0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=5) as r:
+            assert r.status == 200
+        settle(0)
+        sock = idle.sock
+        idle.request("GET", "/api/health")
+        assert idle.getresponse().read() == b'{"ok": true}' and idle.sock is sock
+
+        # ...but one part way through a request does, so the next is turned away.
+        stalled = socket.create_connection(("127.0.0.1", port), timeout=5)
+        stalled.sendall(b"GET /api/health HTTP/1.1\r\n")
+        settle(1)
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=5)
+        assert exc.value.code == 503 and exc.value.headers["Retry-After"] == "2"
+        assert http_pool.stats()["rejected"] == 1
+    finally:
+        if stalled is not None:
+            stalled.close()
+        idle.close()
+        srv.shutdown()
+        srv.server_close()
+
+
 def test_cross_origin_post_blocked(server):
     status, body = post(
         server,
@@ -292,6 +649,115 @@ def test_live_answer_parsers(monkeypatch):
     assert ai.live_answer("q", "anthropic", "k") == "claude!"
 
 
+def test_stream_answer_parsers(monkeypatch):
+    """Each provider style parses its own streamed events."""
+    import ai_integration as ai
+
+    sent = {}
+
+    def events(*items):
+        def fake(url, body, headers, timeout):
+            sent.update(url=url, body=body)
+            return iter(items)
+
+        return fake
+
+    monkeypatch.setattr(
+        ai,
+        "_http_post_events",
+        events(
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+            {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+        ),
+    )
+    assert list(ai.stream_answer("q", "groq", "k")) == ["Hel", "lo"]
+    assert sent["body"]["stream"] is True
+
+    monkeypatch.setattr(
+        ai,
+        "_http_post_events",
+        events(
+            {"type": "message_start", "message": {}},
+            {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Cl"}},
+            {"type": "ping"},
+            {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "aude"}},
+            {"type": "message_stop"},
+        ),
+    )
+    chunks = []
+    assert ai.live_answer("q", "anthropic", "k", on_chunk=chunks.append) == "Claude"
+    assert chunks == ["Cl", "aude"]
+
+    monkeypatch.setattr(
+        ai,
+        "_http_post_events",
+        events(
+            {"candidates": [{"content": {"parts": [{"text": "G"}]}}]},
+            {"candidates": [{"content": {"parts": [{"text": "em"}]}, "finishReason": "STOP"}]},
+        ),
+    )
+    assert list(ai.stream_answer("q", "gemini", "k")) == ["G", "em"]
+    assert ":streamGenerateContent?alt=sse&key=k" in sent["url"]
+
+    monkeypatch.setattr(
+        ai,
+        "_http_post_events",
+        events({"type": "error", "error": {"type": "overloaded_error", "message": "Busy"}}),
+    )
+    with pytest.raises(RuntimeError, match="Busy"):
+        list(ai.stream_answer("q", "anthropic", "k"))
+
+
+def test_ask_streams_the_live_answer(server, monkeypatch):
+    import ai_integration
+    import web_server
+
+    ai_integration.save_config({"provider": "groq", "api_keys": {"groq": "k"}})
+    gate = threading.Event()
+
+    def fake_live(question, *a, on_chunk=None, **k):
+        on_chunk("A folder ")
+        gate.wait(5)
+        on_chunk("holds files.")
+        return "A folder holds files."
+
+    monkeypatch.setattr(web_server, "live_answer", fake_live)
+    _, job = post(server, "/api/ask", {"question": "what is a folder?"})
+    host, port = server.rsplit("/", 1)[1].split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        conn.request("GET", "/api/ask/" + job["id"] + "/stream")
+        r = conn.getresponse()
+        assert r.status == 200
+        assert r.getheader("Content-Type").startswith("text/event-stream")
+        assert r.readline() == b"retry: 1000\n" and r.readline() == b"\n"
+        assert [r.readline() for _ in range(4)] == [
+            b"id: 9\n",
+            b"event: chunk\n",
+            b'data: {"text": "A folder "}\n',
+            b"\n",
+        ]
+        _, polled = get(server, "/api/ask/" + job["id"])
+        assert polled["text"] == "A folder "  # pollers see the partial answer too
+        gate.set()
+        rest = r.read().decode("utf-8")  # the server closes after "done"
+    finally:
+        gate.set()
+        conn.close()
+    assert 'data: {"text": "holds files."}' in rest
+    done = json.loads(rest.split("event: done\ndata: ", 1)[1])
+    assert done["status"] == "done" and done["result"]["answer"] == "A folder holds files."
+
+    # The finished answer was saved once the stream completed.
+    _, listing = get(server, "/api/entries")
+    assert "ai-assisted" in listing["entries"][0]["tags"]
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        get(server, "/api/ask/nope/stream")
+    assert exc.value.code == 404
+
+
 def test_set_ai_key_then_ask_live(server, monkeypatch):
     import web_server
 
@@ -304,7 +770,7 @@ def test_set_ai_key_then_ask_live(server, monkeypatch):
     assert status == 200 and body["enabled"] is True
     assert body["label"] == "Groq" and body["masked"].endswith("1234")
 
-    status, ask = post(server, "/api/ask", {"question": "what is a folder?"})
+    status, ask = ask_and_wait(server, {"question": "what is a folder?"})
     assert ask["source"] == "Groq"
     assert ask["answer"].startswith("LIVE:")
 
@@ -340,7 +806,7 @@ def test_ask_falls_back_to_offline_when_live_fails(server, monkeypatch):
         lambda *a, **k: (_ for _ in ()).throw(RuntimeError("network down")),
     )
 
-    status, body = post(server, "/api/ask", {"question": "what is an API?"})
+    status, body = ask_and_wait(server, {"question": "what is an API?"})
     assert status == 200
     assert body["source"] == "Starter Guide"  # offline fallback kicked in
     assert "waiter" in body["answer"].lower()
@@ -357,6 +823,63 @@ def test_disconnect_ai(server, monkeypatch):
     assert status == 200 and body["enabled"] is False
 
 
+def test_live_answer_caches_repeated_questions(monkeypatch):
+    import ai_integration as ai
+
+    calls = []
+
+    def fake_post(url, body, headers, timeout):
+        calls.append(body)
+        return {"choices": [{"message": {"content": f"answer {len(calls)}"}}]}
+
+    monkeypatch.setattr(ai, "_http_post_json", fake_post)
+    assert ai.live_answer("What is git?", "groq", "k") == "answer 1"
+    assert ai.live_answer("what is  git", "groq", "k") == "answer 1"  # from the cache
+    chunks = []
+    assert ai.live_answer("What is git?", "groq", "k", on_chunk=chunks.append) == "answer 1"
+    assert chunks == ["answer 1"]
+    assert len(calls) == 1
+
+    # Other context, or a key check, goes to the provider.
+    assert ai.live_answer("What is git?", "groq", "k", context="notes") == "answer 2"
+    assert ai.live_answer("What is git?", "groq", "k", use_cache=False) == "answer 3"
+
+    monkeypatch.setenv("AI_JOURNAL_ANSWER_CACHE", "only")
+    assert ai.live_answer("What is git?", "groq", "k") == "answer 1"
+    with pytest.raises(RuntimeError, match="offline"):
+        ai.live_answer("What is a branch?", "groq", "k")
+    assert len(calls) == 3
+
+    monkeypatch.setenv("AI_JOURNAL_ANSWER_CACHE", "off")
+    assert ai.live_answer("What is git?", "groq", "k") == "answer 4"
+    stats = ai.answer_cache_stats()
+    assert (stats["mode"], stats["entries"]) == ("off", 2)
+    assert (stats["hits"], stats["misses"]) == (3, 3)
+
+
+def test_repeated_asks_hit_the_answer_cache(server, monkeypatch):
+    import ai_integration as ai
+
+    ai.save_config({"provider": "groq", "api_keys": {"groq": "k"}})
+    post(server, "/api/entries", {"topic": "Git basics", "body": "git tracks changes"})
+    post(server, "/api/entries", {"topic": "Loops", "body": "for loops repeat"})
+    sent = []
+
+    def fake_events(url, body, headers, timeout):
+        sent.append(body["messages"][1]["content"])
+        return iter([{"choices": [{"delta": {"content": "Git saves snapshots."}}]}])
+
+    monkeypatch.setattr(ai, "_http_post_events", fake_events)
+    for question in ("What is git?", "What is git?", "what is GIT"):
+        status, body = ask_and_wait(server, {"question": question})
+        assert status == 200 and body["answer"] == "Git saves snapshots."
+    # Each ask saved an entry, but the journal context (and so the cache key)
+    # leaves out earlier answers to the same question.
+    assert len(sent) == 1 and "Git basics" in sent[0]
+    _, metrics = get(server, "/api/metrics")
+    assert (metrics["answer_cache"]["hits"], metrics["answer_cache"]["misses"]) == (2, 1)
+
+
 def test_live_answer_includes_journal_context(monkeypatch):
     """When context is supplied, live_answer sends it in the user message."""
     import ai_integration as ai
@@ -402,10 +925,8 @@ def test_ask_passes_journal_context_to_live_answer(server, monkeypatch):
         lambda *a, **k: captured.update(context=k.get("context", "")) or "LIVE answer",
     )
 
-    status, body = post(
-        server,
-        "/api/ask",
-        {"question": "How are while loops different from for loops?"},
+    status, body = ask_and_wait(
+        server, {"question": "How are while loops different from for loops?"}
     )
     assert status == 200
     assert "For loops" in captured["context"]
@@ -430,9 +951,7 @@ def test_ask_respects_use_journal_false(server, monkeypatch):
         lambda *a, **k: captured.update(context=k.get("context", "")) or "LIVE answer",
     )
 
-    status, body = post(
-        server, "/api/ask", {"question": "What is a variable?", "use_journal": False}
-    )
+    status, body = ask_and_wait(server, {"question": "What is a variable?", "use_journal": False})
     assert status == 200
     assert captured["context"] == ""
     assert body.get("used_journal") is False
@@ -0,0 +1,35 @@
+import threading
+
+from worker_pool import Latency, WorkerPool
+
+
+def test_pool_runs_jobs_and_refuses_beyond_its_queue():
+    pool = WorkerPool("test", workers=1, queue_size=1)
+    gate = threading.Event()
+    started = threading.Event()
+    done = []
+    try:
+        assert pool.submit(lambda: (started.set(), gate.wait(5)))
+        assert started.wait(5)
+        assert pool.submit(lambda: done.append(1))  # waits in the queue
+        assert pool.crowded()
+        assert not pool.submit(lambda: done.append(2))  # queue full
+        stats = pool.stats()
+        assert (stats["busy"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+        gate.set()
+    finally:
+        pool.shutdown(wait=True)
+    assert done == [1]
+    assert pool.stats()["run"]["count"] == 2
+    assert not pool.submit(lambda: None)  # closed
+
+
+def test_latency_summary():
+    latency = Latency(samples=100)
+    for ms in range(1, 101):
+        latency.record(ms / 1000)
+    stats = latency.stats()
+    assert stats["count"] == 100
+    assert stats["avg_ms"] == 50.5
+    assert stats["p95_ms"] == 96.0
+    assert stats["max_ms"] == 100.0